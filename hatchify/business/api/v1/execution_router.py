@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Any
 
 from fastapi import APIRouter, Depends, Path
 from fastapi_pagination import Page
@@ -14,6 +14,8 @@ from hatchify.common.domain.requests.execution import PageExecutionRequest
 from hatchify.common.domain.responses.execution_response import ExecutionResponse
 from hatchify.common.domain.responses.pagination import PaginationInfo
 from hatchify.common.domain.result.result import Result
+from hatchify.core.manager.execution_recovery_manager import ExecutionRecoveryManager
+from hatchify.core.manager.stream_manager import StreamManager
 
 executions_router = APIRouter(prefix="/executions")
 
@@ -58,4 +60,36 @@ async def page(
     except Exception as e:
         msg = f"{type(e).__name__}: {str(e)}"
         logger.error(msg)
-        return Result.error(code=500, message=msg)
\ No newline at end of file
+        return Result.error(code=500, message=msg)
+
+
+@executions_router.post("/resume/{id}", response_model=Result[Dict[str, Any]])
+async def resume(
+        _id: str = Path(default=..., alias="id"),
+        session: AsyncSession = Depends(get_db),
+        service: ExecutionService = Depends(ServiceManager.get_service_dependency(ExecutionService)),
+):
+    """从检查点恢复中断的 Webhook 执行，恢复后通过原 execution_id 的 SSE 流获取事件"""
+    try:
+        execution: ExecutionTable = await service.get_by_id(session, _id)
+        if not execution:
+            return Result.error(code=404, message="Execution Not Found")
+        frontier = await ExecutionRecoveryManager.resume(_id)
+        return Result.ok(data={"execution_id": _id, "frontier": frontier})
+    except ValueError as e:
+        return Result.error(code=400, message=str(e))
+    except Exception as e:
+        msg = f"{type(e).__name__}: {str(e)}"
+        logger.error(msg)
+        return Result.error(code=500, message=msg)
+
+
+@executions_router.get("/stream-stats", response_model=Result[Dict[str, Any]])
+async def stream_stats():
+    """常驻流式 handler 与事件存储的内存统计"""
+    try:
+        return Result.ok(data=await StreamManager.stats())
+    except Exception as e:
+        msg = f"{type(e).__name__}: {str(e)}"
+        logger.error(msg)
+        return Result.error(code=500, message=msg)
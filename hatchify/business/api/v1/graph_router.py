@@ -27,6 +27,8 @@ from hatchify.common.domain.responses.graph_version_response import GraphVersion
 from hatchify.common.domain.responses.pagination import PaginationInfo
 from hatchify.common.domain.responses.web_hook import ExecutionResponse
 from hatchify.common.domain.result.result import Result
+from hatchify.core.manager.blob_store import BlobStore
+from hatchify.core.manager.checkpoint_manager import CheckpointManager
 from hatchify.core.manager.function_manager import function_router
 from hatchify.core.manager.model_card_manager import model_card_manager
 from hatchify.core.manager.stream_manager import StreamManager
@@ -86,6 +88,10 @@ async def delete_by_id(
         is_deleted: bool = await service.delete_by_id(session, _id)
         if not is_deleted:
             return Result.error(code=500, message="Delete Source Failed")
+        # 释放该 Graph 下执行与会话持有的二进制引用，对象由 BlobStore GC 回收
+        await BlobStore.release(graph_id=_id)
+        # 输入文件已释放，该 Graph 下执行的检查点无法再恢复
+        await CheckpointManager.delete_by_graph(_id)
         return Result.ok(data=is_deleted)
     except Exception as e:
         msg = f"{type(e).__name__}: {str(e)}"
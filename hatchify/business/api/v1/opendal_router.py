@@ -1,52 +1,115 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-from typing import cast
+from typing import cast, AsyncIterator, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from loguru import logger
 from opendal import AsyncOperator
-from starlette.responses import StreamingResponse
+from starlette.responses import StreamingResponse, Response
 
+from hatchify.business.utils.file_response_helper import (
+    RangeNotSatisfiable,
+    format_http_date,
+    if_range_matches,
+    is_not_modified,
+    make_etag,
+    multipart_length,
+    multipart_stream,
+    new_boundary,
+    parse_range,
+)
 from hatchify.common.domain.enums.storage_type import StorageType
 from hatchify.common.extensions.ext_storage import storage_client
+from hatchify.common.extensions.storage.opendal import not_found_as_file_error
 from hatchify.common.settings.settings import get_hatchify_settings
 
 opendal_router = APIRouter(prefix="/opendal")
 settings = get_hatchify_settings()
 
 
-@opendal_router.get("/{file_path:path}")
-async def get_opendal_file(file_path: str):
+@opendal_router.api_route("/{file_path:path}", methods=["GET", "HEAD"])
+async def get_opendal_file(file_path: str, request: Request):
     """
     通过 OpenDAL 获取文件
 
     注意：file_path 已经是完整的存储路径（wrapped），直接使用底层 client 访问
+
+    - ETag / Last-Modified 来自 OpenDAL 元数据，If-None-Match / If-Modified-Since 命中时返回 304
+    - 支持单个与多个字节范围（206，多个范围为 multipart/byteranges），If-Range 不匹配时返回完整内容
     """
     try:
         if settings.storage.platform != StorageType.LOCAL:
             raise HTTPException(status_code=404, detail=f"File '{file_path}' not found")
 
         client = cast(AsyncOperator, storage_client.client)
+        serving_settings = settings.file_serving
 
-        metadata = await client.stat(path=file_path)
+        with not_found_as_file_error(file_path):
+            metadata = await client.stat(path=file_path)
         if not metadata.mode.is_file():
             raise HTTPException(status_code=404, detail=f"File '{file_path}' not found")
 
         content_type = metadata.content_type or "application/octet-stream"
+        size: int = metadata.content_length
+        last_modified = getattr(metadata, "last_modified", None)
+        etag = make_etag(metadata.etag, size, last_modified)
+
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Cache-Control": serving_settings.cache_control,
+            "ETag": etag,
+        }
+        if last_modified is not None:
+            headers["Last-Modified"] = format_http_date(last_modified)
+
+        if is_not_modified(
+                etag, last_modified, request.headers.get("if-none-match"), request.headers.get("if-modified-since")
+        ):
+            return Response(status_code=304, headers=headers)
+
+        ranges = None
+        if if_range_matches(request.headers.get("if-range"), etag, last_modified):
+            try:
+                ranges = parse_range(request.headers.get("range"), size, serving_settings.max_ranges)
+            except RangeNotSatisfiable:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
 
-        async def file_stream():
+        async def read_range(offset: int, length: int) -> AsyncIterator[bytes]:
             async with await client.open(path=file_path, mode="rb") as file:
-                while chunk := await file.read(40960):
+                if offset:
+                    await file.seek(offset)
+                remaining = length
+                while remaining > 0:
+                    chunk = await file.read(min(serving_settings.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
                     yield chunk
 
-        return StreamingResponse(
-            file_stream(),
-            media_type=content_type,
-            headers={
-                "Cache-Control": "public, max-age=3600",
-            }
-        )
+        def respond(body: Optional[AsyncIterator[bytes]], status_code: int, media_type: str) -> Response:
+            if request.method == "HEAD":
+                return Response(status_code=status_code, headers=headers, media_type=media_type)
+            return StreamingResponse(body, status_code=status_code, headers=headers, media_type=media_type)
+
+        if ranges is None:
+            headers["Content-Length"] = str(size)
+            body = read_range(0, size) if request.method != "HEAD" else None
+            return respond(body, 200, content_type)
+
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            body = read_range(start, end - start + 1) if request.method != "HEAD" else None
+            return respond(body, 206, content_type)
+
+        boundary = new_boundary()
+        headers["Content-Length"] = str(multipart_length(ranges, size, content_type, boundary))
+        body = multipart_stream(ranges, size, content_type, boundary, read_range) if request.method != "HEAD" else None
+        return respond(body, 206, f"multipart/byteranges; boundary={boundary}")
 
+    except HTTPException:
+        raise
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"File '{file_path}' not found")
     except Exception as e:
@@ -1,5 +1,5 @@
-import uuid
-from typing import Any, Optional, List, Dict
+import asyncio
+from typing import Any, Optional, List, Dict, Tuple, AsyncIterator
 
 from fastapi import APIRouter, Request, HTTPException, UploadFile, Header, Query, Depends
 from loguru import logger
@@ -18,11 +18,13 @@ from hatchify.common.domain.entity.graph_spec import GraphSpec
 from hatchify.common.domain.enums.execution_type import ExecutionType
 from hatchify.common.domain.responses.web_hook import WebHookInfoResponse, ExecutionResponse
 from hatchify.common.domain.result.result import Result
-from hatchify.common.extensions.ext_storage import storage_client
 from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.factory.session_manager_factory import create_session_manager
 from hatchify.core.graph.dynamic_graph_builder import DynamicGraphBuilder
 from hatchify.core.graph.hooks.graph_state_hook import GraphStateHook
+from hatchify.core.manager.blob_store import BlobStore
+from hatchify.core.manager.checkpoint_manager import CheckpointManager
+from hatchify.core.manager.compiled_graph_manager import CompiledGraphManager
 from hatchify.core.manager.function_manager import function_router
 from hatchify.core.manager.stream_manager import StreamManager
 from hatchify.core.manager.tool_manager import tool_factory
@@ -34,25 +36,62 @@ settings = get_hatchify_settings()
 web_hook_router = APIRouter(prefix="/web-hooks")
 
 
-async def prepare_data(graph_id: str, graph_spec: GraphSpec, request: Request):
+async def prepare_data(graph_id: str, graph_spec: GraphSpec, request: Request, owner: str):
     files: Dict[str, List[FileData]] = {}
     json_data: Dict[str, Any] = {}
     webhook_spec = infer_webhook_spec_from_schema(graph_spec.input_schema)
     if webhook_spec.input_type == "multipart/form-data":
 
         form: FormData = await request.form()
+        upload_settings = settings.webhook_upload
+        request_bytes = 0
+
+        async def upload(field_name: str, uploaded_file: UploadFile) -> Tuple[str, List[FileData]]:
+            """按分块将上传文件写入内容寻址存储（内容已存在时跳过上传），超出字节上限时中止"""
+            mime = uploaded_file.content_type or "application/octet-stream"
+            size = 0
+
+            async def chunks() -> AsyncIterator[bytes]:
+                nonlocal size, request_bytes
+                while chunk := await uploaded_file.read(upload_settings.chunk_size):
+                    size += len(chunk)
+                    request_bytes += len(chunk)
+                    if size > upload_settings.max_file_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"File '{uploaded_file.filename}' exceeds {upload_settings.max_file_bytes} bytes"
+                        )
+                    if request_bytes > upload_settings.max_request_bytes:
+                        raise HTTPException(
+                            status_code=413,
+                            detail=f"Uploaded files exceed {upload_settings.max_request_bytes} bytes per request"
+                        )
+                    yield chunk
+
+            blob = await BlobStore.put_stream(
+                chunks(), mime, owner=owner, graph_id=graph_id, chunk_size=upload_settings.chunk_size
+            )
+            return field_name, [FileData(
+                key=blob.key,
+                mime=mime,
+                name=uploaded_file.filename,
+                source=settings.storage.platform,
+                size=blob.size,
+                sha256=blob.sha256,
+            )]
+
+        # 所有文件字段并发上传，任一失败时取消其余上传
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(upload(field_name, form[field_name]))
+                    for field_name in webhook_spec.file_fields
+                    if field_name in form
+                ]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        files.update(task.result() for task in tasks)
 
-        for field_name in webhook_spec.file_fields:
-            if field_name in form:
-                uploaded_file: UploadFile = form[field_name]
-                key = f"{graph_id}/hatchify__{uploaded_file.filename}"
-                await storage_client.save(key=key, data=await uploaded_file.read(), mimetype=uploaded_file.content_type)
-                files[field_name] = [FileData(
-                    key=key,
-                    mime=uploaded_file.content_type or "application/octet-stream",
-                    name=uploaded_file.filename,
-                    source=settings.storage.platform
-                )]
         for field_name in webhook_spec.data_fields:
             if field_name in form:
                 json_data[field_name] = form[field_name]
@@ -103,7 +142,7 @@ async def invoke(
         return Result.error(code=404, message=f"Graph '{graph_id}' not found")
 
     output_required = graph_spec.output_schema.get("required", [])
-    execute_data = await prepare_data(graph_id, graph_spec, request)
+    execute_data = await prepare_data(graph_id, graph_spec, request, owner=graph_id)
 
     builder = DynamicGraphBuilder(
         tool_router=tool_factory,
@@ -112,7 +151,7 @@ async def invoke(
         session_manager=create_session_manager(graph_id=graph_id, session_id=graph_id)
     )
 
-    graph = builder.build_graph(graph_spec)
+    graph = CompiledGraphManager.build_graph(builder, graph_spec)
 
     executor = GraphExecutor(
         graph_id=graph_id,
@@ -157,7 +196,10 @@ async def submit(
     )
 
     try:
-        execute_data = await prepare_data(graph_id, graph_spec, request)
+        execute_data = await prepare_data(graph_id, graph_spec, request, owner=execution_obj.id)
+        checkpoint = settings.execution_recovery.checkpoint
+        if checkpoint:
+            await CheckpointManager.save_snapshot(execution_obj.id, graph_id, graph_spec, execute_data)
 
         builder = DynamicGraphBuilder(
             tool_router=tool_factory,
@@ -165,13 +207,14 @@ async def submit(
             hooks=[GraphStateHook()],
             session_manager=create_session_manager(graph_id=graph_id, session_id=execution_obj.id),
         )
-        graph = builder.build_graph(graph_spec)
+        graph = CompiledGraphManager.build_graph(builder, graph_spec)
 
         executor = GraphExecutor(
             graph_id=execution_obj.id,
             graph=graph,
             graph_spec=graph_spec,
-            listeners=[ExecutionTrackerListener()]
+            listeners=[ExecutionTrackerListener()],
+            checkpoint=checkpoint,
         )
 
         await StreamManager.create(execution_obj.id, executor)
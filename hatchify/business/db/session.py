@@ -38,6 +38,10 @@ async def init_db():
     from hatchify.business.models.session import SessionTable
     from hatchify.business.models.messages import MessageTable
     from hatchify.business.models.execution import ExecutionTable
+    from hatchify.business.models.stream_event import StreamEventTable
+    from hatchify.business.models.blob import BlobTable, BlobRefTable
+    from hatchify.business.models.function_result import FunctionResultTable
+    from hatchify.business.models.checkpoint import ExecutionSnapshotTable, NodeCheckpointTable
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
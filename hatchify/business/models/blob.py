@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    BigInteger,
+    Index,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hatchify.business.db.base import Base
+
+
+class BlobTable(Base):
+    """内容寻址的二进制对象表 - 以 SHA-256 为主键，同一内容在存储中只保存一份"""
+    __tablename__ = "blob"
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+    )
+
+    # 存储中的 key
+    key: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+
+    size: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+    )
+
+    mime: Mapped[str] = mapped_column(
+        String(128),
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    # 最近一次写入或命中的时间，GC 只回收超过宽限期的对象
+    touched_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
+
+
+class BlobRefTable(Base):
+    """二进制对象引用表 - 每个 (blob, owner) 一行，引用计数即行数"""
+    __tablename__ = "blob_ref"
+    __table_args__ = (
+        Index("ix_blob_ref_sha256_owner", "sha256", "owner", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+    )
+
+    # 引用方：执行 ID 或 strands 会话 ID
+    owner: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        index=True,
+    )
+
+    graph_id: Mapped[str] = mapped_column(
+        String(36),
+        nullable=False,
+        index=True,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
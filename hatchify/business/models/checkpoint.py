@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Text,
+    Integer,
+    func,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hatchify.business.db.base import Base
+
+
+class ExecutionSnapshotTable(Base):
+    """执行快照表 - 保存恢复执行所需的 GraphSpec 与输入"""
+    __tablename__ = "execution_snapshot"
+
+    execution_id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+    )
+
+    graph_id: Mapped[str] = mapped_column(
+        String(36),
+        nullable=False,
+        index=True,
+    )
+
+    # 提交时的 GraphSpec JSON（之后 Graph 被修改也按原定义恢复）
+    graph_spec: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+    # GraphExecuteData JSON（文件只保存存储 key）
+    input: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+
+
+class NodeCheckpointTable(Base):
+    """节点检查点表 - 每个已完成节点的输出"""
+    __tablename__ = "node_checkpoint"
+    __table_args__ = (
+        UniqueConstraint("execution_id", "node_id", name="uq_node_checkpoint_execution_node"),
+    )
+
+    # 自增 ID 即节点完成顺序
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    execution_id: Mapped[str] = mapped_column(
+        String(36),
+        nullable=False,
+        index=True,
+    )
+
+    node_id: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+    )
+
+    # structured_output 的 JSON，节点没有结构化输出时为空
+    structured_output: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+    )
+
+    # 节点最终的文本输出
+    text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        default="",
+    )
+
+    execution_time: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    String,
+    DateTime,
+    Integer,
+    Text,
+    Index,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hatchify.business.db.base import Base
+
+
+class StreamEventTable(Base):
+    """SSE 事件追加日志表 - 持久化 EventStore，支持重启/多 worker 后的断线重连"""
+    __tablename__ = "stream_event"
+    __table_args__ = (
+        Index("ix_stream_event_source_seq", "source_id", "seq", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+    )
+
+    # 执行 ID（EventStore.source_id）
+    source_id: Mapped[str] = mapped_column(
+        String(36),
+        nullable=False,
+    )
+
+    # 事件在该执行内的序号（单调递增）
+    seq: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+
+    event_id: Mapped[str] = mapped_column(
+        String(36),
+        nullable=False,
+    )
+
+    type: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+    )
+
+    # 已编码的 SSE 帧
+    frame: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
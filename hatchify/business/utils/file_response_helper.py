@@ -0,0 +1,172 @@
+"""
+文件响应辅助：HTTP 校验器（ETag / Last-Modified）、条件请求（304）与字节范围（206 / 416）
+"""
+import secrets
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+# [start, end] 闭区间
+ByteRange = Tuple[int, int]
+# (offset, length) -> 按块产出内容
+RangeReader = Callable[[int, int], AsyncIterator[bytes]]
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def make_etag(etag: Optional[str], content_length: int, last_modified: Optional[datetime]) -> str:
+    """优先使用后端 etag，没有时由大小与修改时间生成弱校验器"""
+    if etag:
+        return etag if etag.startswith(('"', 'W/"')) else f'"{etag}"'
+    mtime = int(last_modified.timestamp() * 1_000_000) if last_modified else 0
+    return f'W/"{content_length:x}-{mtime:x}"'
+
+
+def format_http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(
+        etag: str,
+        last_modified: Optional[datetime],
+        if_none_match: Optional[str],
+        if_modified_since: Optional[str],
+) -> bool:
+    """If-None-Match 存在时忽略 If-Modified-Since（RFC 9110 13.2.2），ETag 使用弱比较"""
+    if if_none_match:
+        candidates = [item.strip() for item in if_none_match.split(",")]
+        return "*" in candidates or _opaque(etag) in {_opaque(item) for item in candidates}
+
+    since = _parse_http_date(if_modified_since)
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP 日期只精确到秒
+    return int(last_modified.timestamp()) <= int(since.timestamp())
+
+
+def if_range_matches(if_range: Optional[str], etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-Range 只接受强校验器：不匹配时忽略 Range，返回完整内容"""
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith(('"', 'W/"')):
+        return not if_range.startswith("W/") and not etag.startswith("W/") and if_range == etag
+    since = _parse_http_date(if_range)
+    if since is None or last_modified is None:
+        return False
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return int(last_modified.timestamp()) == int(since.timestamp())
+
+
+def parse_range(header: Optional[str], size: int, max_ranges: int) -> Optional[List[ByteRange]]:
+    """
+    解析 Range 头
+
+    Returns:
+        None 表示忽略 Range（不存在、语法错误或范围数量过多），按 200 返回完整内容
+
+    Raises:
+        RangeNotSatisfiable: 所有范围都不可满足（416）
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+
+    ranges: List[ByteRange] = []
+    for part in spec.split(","):
+        start_text, sep, end_text = part.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else size - 1
+                if end_text and end < start:
+                    return None
+            else:
+                suffix = int(end_text)
+                if suffix < 0:
+                    return None
+                if suffix == 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+    if len(ranges) > max_ranges:
+        return None
+    return _coalesce(ranges)
+
+
+def _coalesce(ranges: List[ByteRange]) -> List[ByteRange]:
+    """合并重叠或相邻的范围，避免同一段内容被重复发送"""
+    merged: List[ByteRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def new_boundary() -> str:
+    return secrets.token_hex(16)
+
+
+def multipart_length(ranges: List[ByteRange], size: int, content_type: str, boundary: str) -> int:
+    length = 0
+    for start, end in ranges:
+        length += len(_part_header(start, end, size, content_type, boundary)) + (end - start + 1) + 2
+    return length + len(f"--{boundary}--\r\n")
+
+
+def _part_header(start: int, end: int, size: int, content_type: str, boundary: str) -> bytes:
+    return (
+        f"--{boundary}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+    ).encode("latin-1")
+
+
+async def multipart_stream(
+        ranges: List[ByteRange],
+        size: int,
+        content_type: str,
+        boundary: str,
+        read_range: RangeReader,
+) -> AsyncIterator[bytes]:
+    """multipart/byteranges 响应体"""
+    for start, end in ranges:
+        yield _part_header(start, end, size, content_type, boundary)
+        async for chunk in read_range(start, end - start + 1):
+            yield chunk
+        yield b"\r\n"
+    yield f"--{boundary}--\r\n".encode("latin-1")
@@ -1,10 +1,26 @@
-from typing import Optional
+from typing import Optional, AsyncIterator
 
 from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from loguru import logger
 
+from hatchify.core.manager.event_manager import EventStore
 from hatchify.core.manager.stream_manager import StreamManager
+from hatchify.core.stream_handler.stream_handler import BaseStreamHandler
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-transform",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+    "Access-Control-Allow-Origin": "*"
+}
+
+
+async def replay_event_store(store: EventStore, last_event_id: Optional[str]) -> AsyncIterator[bytes]:
+    """重放已完成执行的持久化事件（handler 不在当前进程，如服务重启或由其他 worker 执行）"""
+    events = store.get_after(last_event_id) or store.get_all()
+    for event in events:
+        yield BaseStreamHandler.format_sse(event)
 
 
 async def create_sse_response(
@@ -28,28 +44,31 @@ async def create_sse_response(
     Raises:
         HTTPException: 如果 execution 不存在或流式处理出错
     """
+    # 确定有效的 last_event_id（如果 replay=True，强制为 None 以重播所有事件）
+    effective_last_id = None if replay else (latest_event_id or last_event_id)
+
     # 获取 executor
     executor = await StreamManager.get(execution_id)
     if not executor:
+        # 当前进程中没有 handler 时，尝试从持久化的事件存储重放
+        store = await EventStore.get(execution_id)
+        if store and store.is_completed():
+            return StreamingResponse(
+                replay_event_store(store, effective_last_id),
+                media_type="text/event-stream",
+                headers=SSE_HEADERS,
+            )
         raise HTTPException(
             status_code=404,
             detail=f"Execution '{execution_id}' not found. It may have expired or been cleaned up."
         )
 
-    # 确定有效的 last_event_id（如果 replay=True，强制为 None 以重播所有事件）
-    effective_last_id = None if replay else (latest_event_id or last_event_id)
-
     # 创建 SSE 响应
     try:
         return StreamingResponse(
             executor.worker(last_event_id=effective_last_id),
             media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache, no-transform",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-                "Access-Control-Allow-Origin": "*"
-            }
+            headers=SSE_HEADERS,
         )
     except Exception as e:
         msg = f"{type(e).__name__}: {e}"
@@ -0,0 +1,22 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class FunctionCachePolicy(BaseModel):
+    """Function 结果缓存策略（在 function_router 注册时声明）"""
+    model_config = ConfigDict(frozen=True)
+
+    version: str = Field(
+        default="1",
+        description="函数逻辑或输出结构变化时递增，旧结果自动失效"
+    )
+    ttl: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="结果有效期（秒），None 表示永不过期"
+    )
+    persistent: bool = Field(
+        default=False,
+        description="是否写入数据库持久层（跨进程、重启后仍可命中）"
+    )
@@ -1,4 +1,4 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from pydantic import BaseModel
 
@@ -10,6 +10,8 @@ class FileData(BaseModel):
     mime: str
     name: str
     source: StorageType
+    size: Optional[int] = None
+    sha256: Optional[str] = None
 
 
 class GraphExecuteData(BaseModel):
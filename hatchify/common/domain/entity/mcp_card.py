@@ -57,6 +57,15 @@ class MCPServerCard(BaseModel):
         default=None, description="关闭时终止连接 (streamablehttp)"
     )
 
+    # 连接池参数
+    pool_size: int = Field(default=1, ge=1, description="每个服务器的最大常驻连接数")
+    pool_idle_timeout: float = Field(
+        default=300.0, description="空闲连接回收秒数 (<=0 表示不回收)"
+    )
+    pool_health_check_interval: float = Field(
+        default=30.0, description="连接空闲超过该秒数后, 复用前进行健康检查"
+    )
+
     # 工具过滤器
     tool_filters: Optional[ToolFilterConfig] = Field(
         default=None, description="工具过滤配置"
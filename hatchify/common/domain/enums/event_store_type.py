@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class EventStoreBackendType(str, Enum):
+    MEMORY = "memory"
+    SQL = "sql"
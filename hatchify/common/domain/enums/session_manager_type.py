@@ -3,3 +3,4 @@ from enum import Enum
 
 class SessionManagerType(str, Enum):
     LOCAL = "file"
+    ASYNC_FILE = "async_file"
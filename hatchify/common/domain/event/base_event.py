@@ -1,7 +1,7 @@
 import uuid
-from typing import Literal, Any
+from typing import Literal, Any, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class StartEvent(BaseModel):
@@ -39,3 +39,6 @@ class StreamEvent[T, D](BaseModel):
     id: str = Field(default_factory=lambda: uuid.uuid4().hex)
     type: T
     data: D
+
+    # 已编码的 SSE 帧，由 BaseStreamHandler.format_sse 首次编码时写入，实时推送与历史重放共用
+    _sse_frame: Optional[bytes] = PrivateAttr(default=None)
@@ -19,6 +19,13 @@ class NodeStopEvent(BaseModel):
     type: Literal["node_stop"] = Field(default="node_stop", exclude=True)
 
 
+class NodeCacheHitEvent(BaseModel):
+    node_id: str
+    tool_name: str
+    cache_key: str
+    type: Literal["node_cache_hit"] = Field(default="node_cache_hit", exclude=True)
+
+
 class NodeHandoffEvent(BaseModel):
     from_node_ids: List[str]
     to_node_ids: List[str]
@@ -34,6 +41,7 @@ ExecuteEventData: TypeAlias = Union[
     DoneEvent,
     NodeStartEvent,
     NodeStopEvent,
+    NodeCacheHitEvent,
     NodeHandoffEvent
 ]
 ExecuteEventType: TypeAlias = Literal[
@@ -45,5 +53,6 @@ ExecuteEventType: TypeAlias = Literal[
     "done",
     "node_start",
     "node_stop",
+    "node_cache_hit",
     "node_handoff"
 ]
@@ -5,27 +5,310 @@
 # @Email   : amashiro2233@gmail.com
 # @File    : ext_storage
 # @Software: PyCharm
-from collections.abc import Generator
-from typing import Union, Type
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Generator, AsyncIterable, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Union, Type, Optional, Tuple, Dict, Any
 
+import aiofiles
+import aiofiles.os
 from loguru import logger
 
 from hatchify.common.domain.enums.storage_type import StorageType
-from hatchify.common.extensions.storage.base_storage import BaseStorage
+from hatchify.common.extensions.storage.base_storage import BaseStorage, SaveItem, gather_bounded
 from hatchify.common.extensions.storage.opendal import OpenDalStorage
 from hatchify.common.settings.settings import get_hatchify_settings
 
 settings = get_hatchify_settings()
 
+# (etag, last_modified, content_length)
+ObjectVersion = Tuple[Optional[str], Optional[str], Optional[int]]
+
+
+@dataclass
+class _CacheEntry:
+    data: bytes
+    version: ObjectVersion
+    validated_at: float
+
+
+class TieredReadCache:
+    """
+    load 的读穿缓存：内存 LRU（按字节限制）-> 本地磁盘目录 -> 存储后端
+
+    - 命中后超过 revalidate_interval 才 stat 一次，etag / last-modified / 大小一致即视为有效
+    - immutable_prefixes 下的 key（如内容寻址的 blobs/）内容不可变，命中后不再校验
+    - 同一 key 的并发 miss 只向后端读取一次
+    - 写入、删除时由 Storage 主动失效
+    - 只在一个事件循环上使用：_inflight 中的 Future 绑定事件循环，各索引也不是线程安全的。
+      缓存绑定创建它（或首次使用它）的事件循环，其他事件循环（BinaryLoadLoop、线程池中的 asyncio.run）
+      上的读取由 Storage 直接访问后端，失效操作转交给所属事件循环
+    """
+
+    def __init__(self):
+        cache_settings = settings.storage_cache
+        self.memory_max_bytes = cache_settings.memory_max_bytes
+        self.memory_max_item_bytes = cache_settings.memory_max_item_bytes
+        self.disk_dir = cache_settings.disk_dir
+        self.disk_max_bytes = cache_settings.disk_max_bytes
+        self.revalidate_interval = cache_settings.revalidate_interval
+        self.immutable_prefixes = tuple(cache_settings.immutable_prefixes)
+
+        self._memory: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        # 磁盘文件名 -> 大小，按最近使用排序
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+        self._counters: Dict[str, int] = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "revalidated": 0, "stale": 0, "evictions": 0,
+        }
+
+        if self.disk_max_bytes:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and entry.name.endswith(".bin"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, name, size in sorted(files):
+            self._disk[name] = size
+            self._disk_bytes += size
+
+    @staticmethod
+    def version_of(metadata: Any) -> ObjectVersion:
+        last_modified = getattr(metadata, "last_modified", None)
+        return (
+            getattr(metadata, "etag", None),
+            last_modified.isoformat() if last_modified is not None else None,
+            getattr(metadata, "content_length", None),
+        )
+
+    def owns_running_loop(self) -> bool:
+        """当前事件循环是否为缓存所属的事件循环，尚未绑定时绑定到当前事件循环"""
+        loop = asyncio.get_running_loop()
+        if self.loop is None or self.loop.is_closed():
+            self.loop = loop
+        return loop is self.loop
+
+    def _is_fresh(self, key: str, entry: _CacheEntry) -> bool:
+        return key.startswith(self.immutable_prefixes) or time.monotonic() - entry.validated_at < self.revalidate_interval
+
+    async def load(
+            self,
+            key: str,
+            fetch: Callable[[], Awaitable[bytes]],
+            stat: Callable[[], Awaitable[Any]],
+    ) -> bytes:
+        if not self.owns_running_loop():
+            raise RuntimeError("TieredReadCache is bound to a different event loop")
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._is_fresh(key, entry) or await self._revalidate(entry, stat):
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return entry.data
+            self._drop_memory(key)
+
+        if (inflight := self._inflight.get(key)) is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self._load_slow(key, fetch, stat)
+            future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _load_slow(
+            self,
+            key: str,
+            fetch: Callable[[], Awaitable[bytes]],
+            stat: Callable[[], Awaitable[Any]],
+    ) -> bytes:
+        entry = await self._read_disk(key)
+        if entry is not None:
+            if self._is_fresh(key, entry) or await self._revalidate(entry, stat):
+                self._counters["disk_hits"] += 1
+                self._put_memory(key, entry)
+                return entry.data
+            await self._drop_disk(key)
+
+        self._counters["misses"] += 1
+        # 先取版本再读取：两者之间对象被修改时，下一次校验会发现版本不一致
+        version = self.version_of(await stat())
+        data = await fetch()
+        entry = _CacheEntry(data=data, version=version, validated_at=time.monotonic())
+        self._put_memory(key, entry)
+        await self._write_disk(key, entry)
+        return data
+
+    async def _revalidate(self, entry: _CacheEntry, stat: Callable[[], Awaitable[Any]]) -> bool:
+        try:
+            version = self.version_of(await stat())
+        except FileNotFoundError:
+            self._counters["stale"] += 1
+            return False
+        if version != entry.version or version == (None, None, None):
+            self._counters["stale"] += 1
+            return False
+        entry.validated_at = time.monotonic()
+        self._counters["revalidated"] += 1
+        return True
+
+    # ---------------- 内存层 ----------------
+
+    def _put_memory(self, key: str, entry: _CacheEntry) -> None:
+        size = len(entry.data)
+        if size > self.memory_max_item_bytes or size > self.memory_max_bytes:
+            return
+        self._drop_memory(key)
+        self._memory[key] = entry
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.data)
+            self._counters["evictions"] += 1
+
+    def _drop_memory(self, key: str) -> None:
+        if (entry := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(entry.data)
+
+    # ---------------- 磁盘层 ----------------
+
+    def _disk_path(self, name: str, suffix: str) -> str:
+        return os.path.join(self.disk_dir, f"{name}.{suffix}")
+
+    @staticmethod
+    def _disk_name(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    async def _read_disk(self, key: str) -> Optional[_CacheEntry]:
+        name = self._disk_name(key)
+        if not self.disk_max_bytes or name not in self._disk:
+            return None
+        try:
+            async with aiofiles.open(self._disk_path(name, "meta"), "r", encoding="utf-8") as f:
+                meta = json.loads(await f.read())
+            async with aiofiles.open(self._disk_path(name, "bin"), "rb") as f:
+                data = await f.read()
+        except (OSError, ValueError):
+            await self._drop_disk(key)
+            return None
+        if meta.get("key") != key or len(data) != meta.get("size"):
+            await self._drop_disk(key)
+            return None
+        self._disk.move_to_end(name)
+        # 磁盘条目不记录校验时间，命中后按需重新校验
+        return _CacheEntry(data=data, version=tuple(meta["version"]), validated_at=0.0)
+
+    async def _write_disk(self, key: str, entry: _CacheEntry) -> None:
+        size = len(entry.data)
+        if not self.disk_max_bytes or size > self.disk_max_bytes:
+            return
+        name = self._disk_name(key)
+        try:
+            await self._drop_disk(key)
+            # 先写数据再写元数据，元数据存在即表示数据完整
+            tmp = self._disk_path(name, "tmp")
+            async with aiofiles.open(tmp, "wb") as f:
+                await f.write(entry.data)
+            await aiofiles.os.replace(tmp, self._disk_path(name, "bin"))
+            async with aiofiles.open(self._disk_path(name, "meta"), "w", encoding="utf-8") as f:
+                await f.write(json.dumps({"key": key, "size": size, "version": list(entry.version)}))
+        except OSError as e:
+            logger.warning(f"Failed to write storage cache for {key}: {type(e).__name__}: {e}")
+            return
+
+        self._disk[name] = size
+        self._disk_bytes += size
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            evicted, evicted_size = self._disk.popitem(last=False)
+            self._disk_bytes -= evicted_size
+            self._counters["evictions"] += 1
+            await self._remove_disk_files(evicted)
+
+    async def _drop_disk(self, key: str) -> None:
+        name = self._disk_name(key)
+        if (size := self._disk.pop(name, None)) is not None:
+            self._disk_bytes -= size
+            await self._remove_disk_files(name)
+
+    async def _remove_disk_files(self, name: str) -> None:
+        for suffix in ("meta", "bin"):
+            try:
+                await aiofiles.os.remove(self._disk_path(name, suffix))
+            except FileNotFoundError:
+                pass
+
+    # ---------------- 失效与统计 ----------------
+
+    async def invalidate(self, key: str) -> None:
+        if not self.owns_running_loop():
+            raise RuntimeError("TieredReadCache is bound to a different event loop")
+        self._drop_memory(key)
+        await self._drop_disk(key)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+        total = hits + self._counters["misses"]
+        return {
+            **self._counters,
+            "hit_ratio": hits / total if total else 0.0,
+            "memory_hit_ratio": self._counters["memory_hits"] / total if total else 0.0,
+            "memory_bytes": self._memory_bytes,
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+            "disk_items": len(self._disk),
+        }
+
 
 class Storage:
 
     def __init__(self):
         self.storage_runner = None
+        self.cache: Optional[TieredReadCache] = None
 
     async def init_app(self) -> None:
         storage_constructor = self.get_storage_factory(settings.storage.platform)
         self.storage_runner = storage_constructor()
+        if settings.storage_cache.enabled:
+            self.cache = TieredReadCache()
+            logger.info(f"Storage read cache enabled: {settings.storage_cache.disk_dir}")
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        return self.cache.stats() if self.cache is not None else None
+
+    async def _invalidate(self, key: str) -> None:
+        if self.cache is None:
+            return
+        if self.cache.owns_running_loop():
+            await self.cache.invalidate(key)
+        else:
+            # 所属事件循环可能正阻塞等待当前线程，不等待失效完成；在此之前的读取最迟在下一次校验时发现变更
+            asyncio.run_coroutine_threadsafe(self.cache.invalidate(key), self.cache.loop)
 
     @staticmethod
     def get_storage_factory(storage_type: StorageType) -> Type[BaseStorage]:
@@ -36,6 +319,15 @@ class Storage:
     async def save(self, key, data, mimetype='application/octet-stream'):
         try:
             await self.storage_runner.save(key, data, mimetype)
+            await self._invalidate(key)
+        except Exception as e:
+            logger.error(f"Failed to save file: {e}")
+            raise e
+
+    async def save_stream(self, key, chunks: AsyncIterable[bytes], mimetype='application/octet-stream'):
+        try:
+            await self.storage_runner.save_stream(key, chunks, mimetype)
+            await self._invalidate(key)
         except Exception as e:
             logger.error(f"Failed to save file: {e}")
             raise e
@@ -43,6 +335,7 @@ class Storage:
     async def upload_file(self, key, path, mimetype='application/octet-stream'):
         try:
             await self.storage_runner.upload_file(key, path, mimetype)
+            await self._invalidate(key)
         except Exception as e:
             logger.error(f"Failed to save file: {e}")
             raise e
@@ -66,6 +359,12 @@ class Storage:
 
     async def load_once(self, key: str) -> bytes:
         try:
+            if self.cache is not None and self.cache.owns_running_loop():
+                return await self.cache.load(
+                    key,
+                    fetch=lambda: self.storage_runner.load_once(key),
+                    stat=lambda: self.storage_runner.stat(key),
+                )
             return await self.storage_runner.load_once(key)
         except Exception as e:
             logger.error(f"Failed to load_once file: {e}")
@@ -94,11 +393,27 @@ class Storage:
 
     async def delete(self, key):
         try:
-            return await self.storage_runner.delete(key)
+            deleted = await self.storage_runner.delete(key)
+            await self._invalidate(key)
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete file: {e}")
             raise e
 
+    async def load_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """并发读取多个文件（经过读缓存），相同 key 只读取一次"""
+        unique_keys = list(dict.fromkeys(keys))
+        contents = await gather_bounded(self.load_once, unique_keys, self.storage_runner.batch_concurrency)
+        return dict(zip(unique_keys, contents))
+
+    async def save_many(self, items: Iterable[SaveItem]) -> None:
+        await gather_bounded(lambda item: self.save(*item), list(items), self.storage_runner.batch_concurrency)
+
+    async def delete_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        unique_keys = list(dict.fromkeys(keys))
+        results = await gather_bounded(self.delete, unique_keys, self.storage_runner.batch_concurrency)
+        return dict(zip(unique_keys, results))
+
     async def get_pre_signed_url(self, key: str, expires_in: int = 3600) -> str:
         try:
             return await self.storage_runner.get_pre_signed_url(key, expires_in=expires_in)
@@ -5,11 +5,35 @@
 # @Email   : amashiro2233@gmail.com
 # @File    : base_storage
 # @Software: PyCharm
+import asyncio
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Tuple, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# (key, data, mimetype)
+SaveItem = Tuple[str, bytes, str]
+
+
+async def gather_bounded(func: Callable[[K], Awaitable[V]], args: Iterable[K], concurrency: int) -> List[V]:
+    """以 concurrency 为上限并发执行，结果按参数顺序返回，任一失败时取消其余任务"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(arg: K) -> V:
+        async with semaphore:
+            return await func(arg)
+
+    try:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [task_group.create_task(run(arg)) for arg in args]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0]
+    return [task.result() for task in tasks]
 
 
 class BaseStorage(ABC):
+    batch_concurrency: int = 16
 
     @staticmethod
     @abstractmethod
@@ -20,6 +44,10 @@ class BaseStorage(ABC):
     async def save(self, key, data, mimetype='application/octet-stream'):
         raise NotImplementedError
 
+    @abstractmethod
+    async def save_stream(self, key, chunks: AsyncIterable[bytes], mimetype='application/octet-stream'):
+        raise NotImplementedError
+
     @abstractmethod
     async def upload_file(self, key, path, mimetype='application/octet-stream'):
         raise NotImplementedError
@@ -47,3 +75,19 @@ class BaseStorage(ABC):
     @abstractmethod
     async def get_pre_signed_url(self, key: str, expires_in: int = 3600) -> str:
         raise NotImplementedError
+
+    async def load_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """并发读取多个文件，相同 key 只读取一次"""
+        unique_keys = list(dict.fromkeys(keys))
+        contents = await gather_bounded(self.load_once, unique_keys, self.batch_concurrency)
+        return dict(zip(unique_keys, contents))
+
+    async def save_many(self, items: Iterable[SaveItem]) -> None:
+        """并发写入多个文件"""
+        await gather_bounded(lambda item: self.save(*item), list(items), self.batch_concurrency)
+
+    async def delete_many(self, keys: Iterable[str]) -> Dict[str, bool]:
+        """并发删除多个文件"""
+        unique_keys = list(dict.fromkeys(keys))
+        results = await gather_bounded(self.delete, unique_keys, self.batch_concurrency)
+        return dict(zip(unique_keys, results))
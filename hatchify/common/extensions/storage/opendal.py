@@ -5,12 +5,14 @@
 # @Email   : amashiro2233@gmail.com
 # @File    : opendal_storage
 # @Software: PyCharm
+from contextlib import contextmanager
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterable, Iterator
 
 import aiofiles
 import opendal
 from loguru import logger
+from opendal.exceptions import NotFound
 
 from hatchify.common.extensions.storage.base_storage import BaseStorage
 from hatchify.common.settings.settings import get_hatchify_settings
@@ -18,11 +20,31 @@ from hatchify.common.settings.settings import get_hatchify_settings
 settings = get_hatchify_settings()
 
 
+@contextmanager
+def not_found_as_file_error(key: str) -> Iterator[None]:
+    """将后端的 NotFound 转换为 FileNotFoundError"""
+    try:
+        yield
+    except NotFound as e:
+        raise FileNotFoundError(f"File not found: {key}") from e
+    except OSError as e:
+        # AsyncFile 的读取错误以 OSError 抛出，错误类型只体现在消息中
+        if isinstance(e, FileNotFoundError) or not str(e).startswith("NotFound"):
+            raise
+        raise FileNotFoundError(f"File not found: {key}") from e
+
+
 class OpenDalStorage(BaseStorage):
+    """
+    默认直接执行读取/删除/下载，由后端的 NotFound 得到 FileNotFoundError，不再先 stat 一次；
+    opendal.check_exists 为 True 时保留操作前先检查是否存在的行为
+    """
 
     def __init__(self):
         self.bucket_name = settings.storage.opendal.bucket
         self.folder = settings.storage.opendal.folder
+        self.check_exists = settings.storage.opendal.check_exists
+        self.batch_concurrency = settings.storage.opendal.batch_concurrency
         self.client = self.get_client()
 
     def get_client(self, **kwargs):
@@ -43,52 +65,74 @@ class OpenDalStorage(BaseStorage):
         async with await self.client.open(path=oss_key, mode="wb", content_type=mimetype) as file:
             await file.write(data)
 
+    async def save_stream(self, key, chunks: AsyncIterable[bytes], mimetype='application/octet-stream'):
+        """边读边写，内存中只保留当前分块"""
+        oss_key = self.__wrapper_folder_key(key)
+        async with await self.client.open(path=oss_key, mode="wb", content_type=mimetype) as file:
+            async for chunk in chunks:
+                await file.write(chunk)
+
     async def upload_file(self, key, path, mimetype='application/octet-stream'):
         async with aiofiles.open(path, mode='rb') as f:
             await self.save(key, await f.read(), mimetype=mimetype)
 
     async def load_once(self, key: str) -> bytes:
         oss_key = self.__wrapper_folder_key(key)
-        if not await self.exists(key):
+        if self.check_exists and not await self.exists(key):
             raise FileNotFoundError("File not found")
-        content: bytes = await self.client.read(path=oss_key)
+        with not_found_as_file_error(key):
+            content: bytes = await self.client.read(path=oss_key)
         return content
 
     async def load_stream(self, key: str, chunk_size: int = 40960) -> AsyncGenerator[bytes, None]:
         oss_key = self.__wrapper_folder_key(key)
-        if not await self.exists(key):
+        if self.check_exists and not await self.exists(key):
             raise FileNotFoundError("File not found")
+        # 打开是惰性的，在返回生成器之前先读取第一块，文件不存在时立即抛出而不是在首次迭代时
+        file = await self.client.open(path=oss_key, mode="rb")
+        try:
+            with not_found_as_file_error(key):
+                first = await file.read(chunk_size)
+        except BaseException:
+            await file.close()
+            raise
 
         async def generate() -> AsyncGenerator[bytes, None]:
-            async with await self.client.open(path=oss_key, mode="rb") as file:
-                while chunk := await file.read(chunk_size):
+            async with file:
+                chunk = first
+                while chunk:
                     yield chunk
+                    chunk = await file.read(chunk_size)
 
         return generate()
 
     async def download(self, key, target_filepath):
         oss_key = self.__wrapper_folder_key(key)
-        if not await self.exists(key):
+        if self.check_exists and not await self.exists(key):
             raise FileNotFoundError("File not found")
+        with not_found_as_file_error(key):
+            content: bytes = await self.client.read(path=oss_key)
         async with aiofiles.open(target_filepath, 'wb') as f:
-            await f.write(await self.client.read(path=oss_key))
+            await f.write(content)
 
     async def exists(self, key):
         oss_key = self.__wrapper_folder_key(key)
         try:
             metadata = await self.client.stat(path=oss_key)
             return metadata.mode.is_file()
+        except NotFound:
+            return False
         except Exception as e:
             logger.error(e)
             return False
 
     async def delete(self, key):
+        """后端删除是幂等的；直接删除时不存在的 key 同样返回 True"""
         oss_key = self.__wrapper_folder_key(key)
-        if await self.exists(key):
-            await self.client.delete(path=oss_key)
-            return True
-        else:
+        if self.check_exists and not await self.exists(key):
             return False
+        await self.client.delete(path=oss_key)
+        return True
 
     async def get_pre_signed_url(self, key: str, expires_in: int = 3600) -> str:
         oss_key = self.__wrapper_folder_key(key)
@@ -103,6 +147,8 @@ class OpenDalStorage(BaseStorage):
         oss_key = self.__wrapper_folder_key(key)
         try:
             return await self.client.stat(path=oss_key)
+        except NotFound:
+            raise FileNotFoundError("File not found")
         except Exception as e:
             logger.error(e)
             raise FileNotFoundError("File not found")
@@ -13,6 +13,7 @@ from pydantic_settings import (
 
 from hatchify.common.constants.constants import Constants
 from hatchify.common.domain.enums.db_type import DatabasePlatform
+from hatchify.common.domain.enums.event_store_type import EventStoreBackendType
 from hatchify.common.domain.enums.session_manager_type import SessionManagerType
 from hatchify.common.domain.enums.storage_type import StorageType
 
@@ -78,6 +79,8 @@ class OpenDal(BaseModel):
     bucket: str
     folder: str | None
     root: ResolvablePath = None
+    check_exists: bool = Field(default=False, description="读取/删除/下载前先 stat 检查是否存在（多一次请求）")
+    batch_concurrency: int = Field(default=16, ge=1, description="load_many/save_many/delete_many 的并发上限")
 
 
 class StorageSettings(BaseModel):
@@ -164,6 +167,153 @@ class WebAppBuilderSettings(BaseSettings):
     init_steps: List[Union[EnvStep | WriteInputSchemaStep | WriteOutputSchemaStep]] | None = Field(default=None)
     security: SecuritySettings | None = Field(default=None)
 
+
+class GraphCacheSettings(BaseModel):
+    """编译后 Graph 模板的 LRU 缓存配置"""
+    enabled: bool = Field(default=True)
+    max_size: int = Field(default=64, ge=1, description="最多缓存的 CompiledGraph 数量")
+
+
+class EventStoreSettings(BaseModel):
+    """SSE 事件存储配置"""
+    backend: EventStoreBackendType = Field(default=EventStoreBackendType.MEMORY)
+    ttl_seconds: int = Field(default=3600, ge=60, description="已完成执行的事件保留时间")
+    compaction_interval: int = Field(default=300, ge=10, description="TTL 压缩任务的执行间隔（秒）")
+    flush_interval: float = Field(default=0.2, gt=0, description="批量写入的最长等待时间（秒）")
+    flush_batch_size: int = Field(default=256, ge=1, description="缓冲事件达到该数量时立即写入")
+    max_buffer_events: int = Field(default=50_000, ge=1, description="写入缓冲区上限，数据库不可用时超出部分丢弃最旧的事件")
+    max_memory_events: int = Field(default=100_000, ge=1000, description="内存中常驻事件上限，超出后已完成的执行溢出到后端")
+
+
+class StreamReaperSettings(BaseModel):
+    """已完成的流式 handler 回收配置"""
+    enabled: bool = Field(default=True)
+    interval: int = Field(default=60, ge=1, description="回收任务的执行间隔（秒）")
+    completed_ttl: int = Field(default=900, ge=0, description="handler 完成后在内存中保留的时间（秒）")
+    idle_ttl: int = Field(default=3600, ge=60, description="从未开始执行的 handler 的保留时间（秒）")
+    max_resident: int = Field(default=500, ge=1, description="内存中常驻 handler 上限，超出时优先回收最早完成的")
+
+
+class ExecutionTrackerSettings(BaseModel):
+    """执行状态 write-behind 写入配置"""
+    flush_interval: float = Field(default=0.5, gt=0, description="批量写入的最长等待时间（秒）")
+    flush_batch_size: int = Field(default=200, ge=1, description="待写入的执行数达到该数量时立即写入")
+
+
+class ListenerDispatchSettings(BaseModel):
+    """事件监听器分发配置"""
+    mode: Literal["inline", "queued"] = Field(default="queued", description="inline: 在 emit_event 中依次等待; queued: 每个监听器独立队列")
+    queue_size: int = Field(default=1024, ge=1, description="每个监听器的队列容量")
+    backpressure: Literal["block", "drop_oldest", "drop_newest"] = Field(default="block", description="队列满时的处理策略")
+
+
+class FilePrefetchSettings(BaseModel):
+    """Graph 输入文件预加载配置"""
+    concurrency: int = Field(default=8, ge=1, description="并发读取的文件数")
+    max_bytes_per_execution: int = Field(default=1024 * 1024 * 1024, ge=1, description="单次执行允许加载的输入文件总字节数")
+
+
+class WebhookUploadSettings(BaseModel):
+    """Webhook multipart 文件上传配置"""
+    chunk_size: int = Field(default=1024 * 1024, ge=4096, description="从上传文件读取并写入存储的分块大小")
+    max_file_bytes: int = Field(default=1024 * 1024 * 1024, ge=1, description="单个文件的字节上限")
+    max_request_bytes: int = Field(default=2 * 1024 * 1024 * 1024, ge=1, description="单个请求所有文件的字节上限")
+
+
+class BlobStoreSettings(BaseModel):
+    """内容寻址二进制存储配置"""
+    gc_interval: int = Field(default=3600, ge=60, description="回收无引用对象的执行间隔（秒）")
+    gc_grace_seconds: int = Field(default=86400, ge=60, description="对象失去全部引用后保留的时间（秒）")
+    spool_max_memory: int = Field(default=8 * 1024 * 1024, ge=0, description="流式写入计算哈希时内存缓冲上限，超出后落盘")
+    known_cache_size: int = Field(default=100_000, ge=0, description="进程内记录已确认存在的对象/引用数量上限")
+
+
+class StorageCacheSettings(BaseModel):
+    """storage_client.load 读穿缓存配置（内存 LRU + 本地磁盘）"""
+    enabled: bool = Field(default=False)
+    memory_max_bytes: int = Field(default=256 * 1024 * 1024, ge=0, description="内存层字节上限")
+    memory_max_item_bytes: int = Field(default=16 * 1024 * 1024, ge=0, description="超过该大小的对象只进入磁盘层")
+    disk_dir: ResolvablePath = Field(default="./data/storage_cache", description="磁盘层目录")
+    disk_max_bytes: int = Field(default=2 * 1024 * 1024 * 1024, ge=0, description="磁盘层字节上限，0 表示不启用磁盘层")
+    revalidate_interval: float = Field(default=30, ge=0, description="命中后超过该时间（秒）才通过 etag/last-modified 重新校验")
+    immutable_prefixes: List[str] = Field(default_factory=lambda: ["blobs/"], description="内容不可变的 key 前缀，命中后无需校验")
+
+
+class FileServingSettings(BaseModel):
+    """/opendal 文件下载配置"""
+    chunk_size: int = Field(default=256 * 1024, ge=4096, description="流式返回文件时每次读取的字节数")
+    cache_control: str = Field(default="public, max-age=3600")
+    max_ranges: int = Field(default=16, ge=1, description="单个请求允许的字节范围数量，超出时返回完整内容")
+
+
+class LLMClientPoolSettings(BaseModel):
+    """LLM 客户端共享连接池配置"""
+    enabled: bool = Field(default=True, description="关闭时每个 Model 按 client_args 自行创建客户端")
+    max_connections: int = Field(default=100, ge=1, description="每个客户端的最大连接数")
+    max_keepalive_connections: int = Field(default=20, ge=0, description="每个客户端保持的空闲长连接数")
+    keepalive_expiry: float = Field(default=60.0, ge=0, description="空闲长连接的保留时间（秒）")
+    http2: bool = Field(default=True, description="安装 h2 时启用 HTTP/2")
+
+
+class TaskPollerSettings(BaseModel):
+    """预定义工具长耗时任务轮询配置"""
+    max_workers: int = Field(default=16, ge=1, description="执行同步 SDK 调用的线程数")
+    initial_interval: float = Field(default=1.0, gt=0, description="首次轮询及状态变化后的轮询间隔（秒）")
+    max_interval: float = Field(default=15.0, gt=0, description="轮询间隔上限（秒）")
+    backoff_factor: float = Field(default=1.5, ge=1, description="状态未变化时轮询间隔的增长倍数")
+    jitter: float = Field(default=0.1, ge=0, lt=1, description="轮询间隔的随机抖动比例")
+    max_consecutive_errors: int = Field(default=5, ge=0, description="查询连续失败超过该次数时判定任务失败")
+    timeout: float = Field(default=1800, gt=0, description="等待任务完成的默认超时时间（秒）")
+
+
+class ToolHttpClientSettings(BaseModel):
+    """预定义工具共享 HTTP 客户端配置"""
+    max_connections: int = Field(default=100, ge=1)
+    max_keepalive_connections: int = Field(default=20, ge=0)
+    keepalive_expiry: float = Field(default=60.0, ge=0, description="空闲长连接的保留时间（秒）")
+    http2: bool = Field(default=True, description="安装 h2 时启用 HTTP/2")
+    retries: int = Field(default=3, ge=0, description="建立连接失败时的重试次数")
+    timeout: float = Field(default=60.0, gt=0, description="默认请求超时（秒），工具可按请求覆盖")
+    connect_timeout: float = Field(default=30.0, gt=0)
+
+
+class TTSStreamSettings(BaseModel):
+    """TTS 音频流式写入存储配置"""
+    write_chunk_size: int = Field(default=256 * 1024, ge=4096, description="音频合并到该大小后写入存储")
+    progressive: bool = Field(default=False, description="收到第一段音频即返回 URL，上传在后台完成")
+
+
+class IntoMdCacheSettings(BaseModel):
+    """into_md 转换结果缓存配置"""
+    enabled: bool = Field(default=True)
+    ttl: float = Field(default=3600, ge=0, description="缓存有效期（秒），过期后通过 ETag / Last-Modified 重新校验")
+    max_entries: int = Field(default=1000, ge=1, description="内存层条目数上限")
+    memory_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0, description="内存层字节上限")
+    disk_dir: ResolvablePath = Field(default="./data/into_md_cache", description="磁盘层目录")
+    disk_max_bytes: int = Field(default=512 * 1024 * 1024, ge=0, description="磁盘层字节上限，0 表示不启用磁盘层")
+    batch_concurrency: int = Field(default=8, ge=1, description="批量转换的并发数")
+
+
+class FunctionCacheSettings(BaseModel):
+    """Function 节点结果缓存配置（缓存策略由各 Function 在注册时声明）"""
+    max_entries: int = Field(default=1024, ge=1, description="内存层条目数上限")
+    memory_max_bytes: int = Field(default=64 * 1024 * 1024, ge=0, description="内存层字节上限")
+    persistent: bool = Field(default=True, description="关闭时忽略策略中的 persistent，只使用内存层")
+
+
+class ExecutionRecoverySettings(BaseModel):
+    """
+    Graph 执行检查点与恢复配置
+
+    多 worker 部署时启动扫描无法区分其他 worker 仍在执行的任务，应只在单 worker 或专用实例上开启 sweep_on_startup
+    """
+    checkpoint: bool = Field(default=True, description="Webhook 执行在每个节点完成后写入检查点")
+    sweep_on_startup: bool = Field(default=True, description="启动时处理上次进程遗留的 RUNNING / PENDING 执行")
+    auto_resume: bool = Field(default=False, description="启动扫描时自动从检查点恢复，关闭时只标记为 FAILED")
+    retention_seconds: int = Field(default=7 * 24 * 3600, ge=0, description="未成功执行的检查点保留时间（秒），到期后不可再恢复")
+    purge_interval: int = Field(default=3600, ge=60, description="回收过期检查点的执行间隔（秒）")
+
+
 class HatchifySettings(BaseModel):
     application: str
     server: ServerSettings | None = Field(default=None)
@@ -172,6 +322,23 @@ class HatchifySettings(BaseModel):
     session_manager: SessionManagerSettings | None = Field(default=None)
     db: DbSettings | None = Field(default=None)
     web_app_builder: WebAppBuilderSettings | None = Field(default=None)
+    graph_cache: GraphCacheSettings = Field(default_factory=GraphCacheSettings)
+    event_store: EventStoreSettings = Field(default_factory=EventStoreSettings)
+    stream_reaper: StreamReaperSettings = Field(default_factory=StreamReaperSettings)
+    execution_tracker: ExecutionTrackerSettings = Field(default_factory=ExecutionTrackerSettings)
+    listener_dispatch: ListenerDispatchSettings = Field(default_factory=ListenerDispatchSettings)
+    file_prefetch: FilePrefetchSettings = Field(default_factory=FilePrefetchSettings)
+    webhook_upload: WebhookUploadSettings = Field(default_factory=WebhookUploadSettings)
+    blob_store: BlobStoreSettings = Field(default_factory=BlobStoreSettings)
+    storage_cache: StorageCacheSettings = Field(default_factory=StorageCacheSettings)
+    file_serving: FileServingSettings = Field(default_factory=FileServingSettings)
+    llm_client_pool: LLMClientPoolSettings = Field(default_factory=LLMClientPoolSettings)
+    task_poller: TaskPollerSettings = Field(default_factory=TaskPollerSettings)
+    tool_http_client: ToolHttpClientSettings = Field(default_factory=ToolHttpClientSettings)
+    tts_stream: TTSStreamSettings = Field(default_factory=TTSStreamSettings)
+    into_md_cache: IntoMdCacheSettings = Field(default_factory=IntoMdCacheSettings)
+    function_cache: FunctionCacheSettings = Field(default_factory=FunctionCacheSettings)
+    execution_recovery: ExecutionRecoverySettings = Field(default_factory=ExecutionRecoverySettings)
 
 
 class AppSettings(BaseSettings):
@@ -4,6 +4,7 @@ from openai import BaseModel
 from strands import Agent
 from strands.agent import ConversationManager
 from strands.hooks import HookProvider
+from strands.models import Model
 from strands.session import SessionManager
 
 from hatchify.common.domain.entity.agent_card import AgentCard
@@ -17,8 +18,10 @@ def create_agent_by_agent_card(
         hooks: Optional[list[HookProvider]] = None,
         conversation_manager: Optional[ConversationManager] = None,
         session_manager: Optional[SessionManager] = None,
+        model: Optional[Model] = None,
 ):
-    model = create_llm_by_agent_card(agent_card)
+    if model is None:
+        model = create_llm_by_agent_card(agent_card)
     tools = [tool_factory.get_tool(tool) for tool in agent_card.tools]
     return Agent(
         agent_id=agent_card.name,
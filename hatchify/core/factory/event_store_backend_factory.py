@@ -0,0 +1,19 @@
+from hatchify.common.domain.enums.event_store_type import EventStoreBackendType
+from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.manager.event_store_backend import EventStoreBackend, MemoryEventStoreBackend, \
+    SqlEventStoreBackend
+
+settings = get_hatchify_settings()
+
+
+def create_event_store_backend() -> EventStoreBackend:
+    event_store = settings.event_store
+    match event_store.backend:
+        case EventStoreBackendType.SQL:
+            return SqlEventStoreBackend(
+                flush_interval=event_store.flush_interval,
+                flush_batch_size=event_store.flush_batch_size,
+                max_buffer_events=event_store.max_buffer_events,
+            )
+        case EventStoreBackendType.MEMORY | _:
+            return MemoryEventStoreBackend()
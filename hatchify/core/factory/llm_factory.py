@@ -1,5 +1,14 @@
-from typing import Dict, Any
-
+import hashlib
+import importlib.util
+import inspect
+import threading
+from typing import Dict, Any, List, Tuple
+
+import httpx
+import litellm
+import openai
+from google import genai
+from loguru import logger
 from strands.models import Model
 from strands.models.gemini import GeminiModel
 from strands.models.litellm import LiteLLMModel
@@ -7,8 +16,110 @@ from strands.models.openai import OpenAIModel
 
 from hatchify.common.domain.entity.agent_card import AgentCard
 from hatchify.common.domain.entity.model_card import ModelCard, ProviderCard
+from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.manager.model_card_manager import model_card_manager
 
+settings = get_hatchify_settings()
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# strands-agents 1.21.0 起 OpenAIModel / GeminiModel 才支持传入共享的 client，
+# 更早的版本会把 client 当作未知的模型配置，只能退回 client_args
+_OPENAI_ACCEPTS_CLIENT = "client" in inspect.signature(OpenAIModel.__init__).parameters
+_GEMINI_ACCEPTS_CLIENT = "client" in inspect.signature(GeminiModel.__init__).parameters
+
+
+class LLMClientPoolManager:
+    """
+    全局 LLM 客户端注册表（单例模式）
+
+    按 (family, base_url, api_key 哈希) 共享 SDK 客户端及其 httpx 连接池，同一 provider 的所有 agent
+    复用长连接，不再每次构建 Graph（OpenAI 甚至是每次请求）都重新建立连接；
+    max_tokens 等模型参数仍由每个 Model 实例各自设置
+
+    - openai: 共享 AsyncOpenAI，底层 httpx 连接池按配置限制连接数，安装 h2 时启用 HTTP/2
+    - gemini: 共享 genai.Client（其内部维护连接池）
+    - 其他（LiteLLM）: 通过 litellm.aclient_session 共享同一个 httpx 客户端
+
+    客户端绑定创建时的事件循环，只应在服务的主事件循环中使用
+    """
+
+    _clients: Dict[Tuple[str, str, str], Any] = {}
+    _http_clients: List[httpx.AsyncClient] = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(family: str, client_args: Dict[str, Any]) -> Tuple[str, str, str]:
+        api_key = client_args.get("api_key") or ""
+        return family, client_args.get("base_url") or "", hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _create_http_client(cls) -> httpx.AsyncClient:
+        pool_settings = settings.llm_client_pool
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=pool_settings.max_connections,
+                max_keepalive_connections=pool_settings.max_keepalive_connections,
+                keepalive_expiry=pool_settings.keepalive_expiry,
+            ),
+            http2=pool_settings.http2 and _HTTP2_AVAILABLE,
+            follow_redirects=True,
+        )
+        cls._http_clients.append(client)
+        return client
+
+    @classmethod
+    def _get_or_create(cls, family: str, client_args: Dict[str, Any], factory) -> Any:
+        key = cls._key(family, client_args)
+        with cls._lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = factory()
+                cls._clients[key] = client
+                logger.info(f"Created shared {family} client for {client_args.get('base_url') or 'default endpoint'}")
+            return client
+
+    @classmethod
+    def get_openai_client(cls, client_args: Dict[str, Any]) -> openai.AsyncOpenAI:
+        return cls._get_or_create(
+            "openai", client_args, lambda: openai.AsyncOpenAI(**client_args, http_client=cls._create_http_client())
+        )
+
+    @classmethod
+    def get_gemini_client(cls, client_args: Dict[str, Any]) -> genai.Client:
+        return cls._get_or_create("gemini", client_args, lambda: genai.Client(**client_args))
+
+    @classmethod
+    def ensure_litellm_session(cls) -> None:
+        """LiteLLM 的连接池是进程级的，所有 provider 共享一个 httpx 客户端"""
+        with cls._lock:
+            if litellm.aclient_session is None:
+                litellm.aclient_session = cls._create_http_client()
+
+    @classmethod
+    async def async_close_all(cls) -> None:
+        with cls._lock:
+            clients, cls._clients = list(cls._clients.values()), {}
+            http_clients, cls._http_clients = cls._http_clients, []
+            litellm.aclient_session = None
+
+        for client in clients:
+            if isinstance(client, genai.Client) and (aclose := getattr(client.aio, "aclose", None)):
+                try:
+                    await aclose()
+                except Exception as e:
+                    logger.warning(f"Failed to close gemini client: {type(e).__name__}: {e}")
+        for http_client in http_clients:
+            await http_client.aclose()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            counts: Dict[str, int] = {}
+            for family, _, _ in cls._clients:
+                counts[family] = counts.get(family, 0) + 1
+            return counts
+
 
 def get_model_by_family(
         provider_card: ProviderCard,
@@ -21,6 +132,12 @@ def get_model_by_family(
             params = {
                 "max_completion_tokens": max_tokens,
             }
+            if settings.llm_client_pool.enabled and _OPENAI_ACCEPTS_CLIENT:
+                return OpenAIModel(
+                    client=LLMClientPoolManager.get_openai_client(client_args),
+                    model_id=model_card.id,
+                    params=params
+                )
             return OpenAIModel(
                 client_args=client_args,
                 model_id=model_card.id,
@@ -30,6 +147,12 @@ def get_model_by_family(
             params = {
                 "max_output_tokens": max_tokens,
             }
+            if settings.llm_client_pool.enabled and _GEMINI_ACCEPTS_CLIENT:
+                return GeminiModel(
+                    client=LLMClientPoolManager.get_gemini_client(client_args),
+                    model_id=model_card.id,
+                    params=params
+                )
             return GeminiModel(
                 client_args=client_args,
                 model_id=model_card.id,
@@ -40,6 +163,8 @@ def get_model_by_family(
             params = {
                 "max_completion_tokens": max_tokens,
             }
+            if settings.llm_client_pool.enabled:
+                LLMClientPoolManager.ensure_litellm_session()
             return LiteLLMModel(
                 client_args=client_args,
                 model_id=f"{provider_card.family}/{model_card.id}",
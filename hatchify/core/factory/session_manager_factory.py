@@ -1,21 +1,33 @@
 import asyncio
+import base64
 import copy
+import hashlib
 import json
 import mimetypes
 import os.path
+import shutil
 import threading
-import uuid
-from typing import cast, Any, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import cast, Any, Optional, Deque, Dict, Set, Tuple, TYPE_CHECKING
 from typing import get_args
 
+import aiofiles
+import aiofiles.os
+from loguru import logger
 from strands.session import FileSessionManager, SessionManager, RepositorySessionManager
 from strands.types.exceptions import SessionException
+from strands.types.session import Session, SessionAgent, SessionMessage
 from strands.types.media import DocumentFormat, ImageFormat, VideoFormat
 
 from hatchify.common.domain.enums.session_manager_type import SessionManagerType
 from hatchify.common.extensions.ext_storage import storage_client
+from hatchify.core.manager.blob_store import BlobStore
 from hatchify.common.settings.settings import get_hatchify_settings
 
+if TYPE_CHECKING:
+    from strands.multiagent.base import MultiAgentBase
+
 settings = get_hatchify_settings()
 document_formats = get_args(DocumentFormat)
 image_formats = get_args(ImageFormat)
@@ -23,9 +35,18 @@ video_formats = get_args(VideoFormat)
 
 
 class BinarySafeFileSessionManager(FileSessionManager):
+    """
+    二进制内容写入 BlobStore、会话文件只保存 source_key 的文件会话管理器
+
+    BinaryLoadLoop 线程只负责读取存储；BlobStore 会访问主事件循环上的数据库引擎，
+    因此上传与引用登记总是在创建本实例的主事件循环上执行
+    """
+
     _loop: Optional[asyncio.AbstractEventLoop] = None
     _loop_thread: Optional[threading.Thread] = None
     _loop_lock = threading.Lock()
+    # 主事件循环上尚未完成的上传，关闭时统一等待
+    _uploads: Set[asyncio.Task] = set()
 
     @classmethod
     def _ensure_loop(cls) -> asyncio.AbstractEventLoop:
@@ -56,13 +77,23 @@ class BinarySafeFileSessionManager(FileSessionManager):
     ):
         super().__init__(session_id, storage_dir, **kwargs)
         self.graph_id = graph_id
+        try:
+            self._main_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._main_loop = None
+        # source_key -> 尚未上传完成的内容，上传期间的读取直接使用
+        self._pending_blobs: Dict[str, bytes] = {}
         self._ensure_loop()
 
-    @staticmethod
-    async def overload_binary_messages(tasks: list[dict[str, Any]]) -> None:
+    async def overload_binary_messages(self, tasks: list[dict[str, Any]]) -> None:
+        pending = self._pending_blobs.copy()
+        contents = await storage_client.load_many(
+            task["source_key"] for task in tasks if task.get("source_key") and task["source_key"] not in pending
+        )
+        contents.update(pending)
         for task in tasks:
             if source_key := task.get("source_key"):
-                bytes_data: bytes = await storage_client.load(source_key)
+                bytes_data: bytes = contents[source_key]
                 if document := task.get("document"):
                     if source := document.get("source"):
                         source["bytes"] = bytes_data
@@ -73,9 +104,16 @@ class BinarySafeFileSessionManager(FileSessionManager):
                     if source := video.get("source"):
                         source["bytes"] = bytes_data
 
-    async def update_binary_data(self, data: dict[str, Any]) -> dict[str, Any]:
+    def update_binary_data(self, data: dict[str, Any]) -> Tuple[dict[str, Any], Dict[str, Tuple[bytes, str, str]]]:
+        """
+        移除二进制内容并填入 source_key（内容寻址，上传前即可确定）
+
+        Returns:
+            (待写入的数据, {source_key: (内容, mime_type, sha256)})
+        """
         data_to_write = copy.deepcopy(data)
         current_task = data_to_write.get("current_task", [])
+        uploads: Dict[str, Tuple[bytes, str, str]] = {}
 
         for task in current_task:
             # 处理已有 source_key 的任务,只需移除 bytes
@@ -96,12 +134,58 @@ class BinarySafeFileSessionManager(FileSessionManager):
 
                         if source := content.get("source"):
                             if bytes_data := source.pop("bytes", None):
-                                key = f"{self.graph_id}/hatchify__{uuid.uuid4().hex}.{content_format}"
-                                await storage_client.save(key=key, data=bytes_data, mimetype=mime_type)
-                                task["source_key"] = key
+                                sha256 = hashlib.sha256(bytes_data).hexdigest()
+                                task["source_key"] = BlobStore.blob_key(sha256)
+                                uploads[task["source_key"]] = (bytes_data, mime_type, sha256)
                                 break  # 每个 task 只会有一种媒体类型
 
-        return data_to_write
+        return data_to_write, uploads
+
+    async def _put_blobs(self, uploads: Dict[str, Tuple[bytes, str, str]]) -> None:
+        try:
+            for bytes_data, mime_type, sha256 in uploads.values():
+                await BlobStore.put(
+                    bytes_data, mime_type, owner=self.session_id, graph_id=self.graph_id, sha256=sha256
+                )
+        finally:
+            for source_key in uploads:
+                self._pending_blobs.pop(source_key, None)
+
+    def _store_blobs(self, uploads: Dict[str, Tuple[bytes, str, str]]) -> None:
+        """
+        在主事件循环上上传并登记引用
+
+        在主事件循环线程上调用时无法阻塞等待，上传转为后台任务，完成前的读取使用 _pending_blobs；
+        在其他线程上调用时等待上传完成
+        """
+        self._pending_blobs.update((source_key, upload[0]) for source_key, upload in uploads.items())
+        main_loop = self._main_loop
+        if main_loop is None or main_loop.is_closed():
+            # 在事件循环之外构造（例如脚本中直接使用），数据库引擎只会在这里使用
+            main_loop = self._ensure_loop()
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is main_loop:
+            task = main_loop.create_task(self._put_blobs(uploads))
+            self._uploads.add(task)
+            task.add_done_callback(self._upload_done)
+        else:
+            asyncio.run_coroutine_threadsafe(self._put_blobs(uploads), main_loop).result()
+
+    @classmethod
+    def _upload_done(cls, task: asyncio.Task) -> None:
+        cls._uploads.discard(task)
+        if not task.cancelled() and (e := task.exception()) is not None:
+            logger.error(f"Failed to store session binary: {type(e).__name__}: {e}")
+
+    @classmethod
+    async def flush_all(cls) -> None:
+        """等待所有后台上传完成（进程关闭时调用）"""
+        await asyncio.gather(*list(cls._uploads), return_exceptions=True)
 
     def _read_file(self, path: str) -> dict[str, Any]:
         """Read JSON file."""
@@ -129,21 +213,361 @@ class BinarySafeFileSessionManager(FileSessionManager):
         # This automic write ensure the completeness of session files in both single agent/ multi agents
         tmp = f"{path}.tmp"
 
-        loop = self._ensure_loop()
-        future = asyncio.run_coroutine_threadsafe(
-            self.update_binary_data(data),
-            loop
-        )
-        result = future.result()
+        result, uploads = self.update_binary_data(data)
+        if uploads:
+            self._store_blobs(uploads)
 
         with open(tmp, "w", encoding="utf-8", newline="\n") as f:
             json.dump(result, f, indent=2, ensure_ascii=False)
         os.replace(tmp, path)
 
 
+BLOB_REF = "__hatchify_blob__"
+MESSAGES_FILE = "messages.jsonl"
+
+
+class AsyncFileSessionManager(FileSessionManager):
+    """
+    异步写入的文件会话管理器
+
+    strands 的 SessionRepository 接口是同步的，本实现不再把每次读写都转交给 BinaryLoadLoop 线程并阻塞等待：
+    - 写入采用 write-behind：同步方法只更新内存中的最新文档，并把写操作按顺序投递给本会话自己的写入任务，
+      由 aiofiles / OpenDAL 在当前事件循环上完成，不同会话之间互不排队
+    - 消息追加写入 messages.jsonl，update_message 追加新版本，读取时同一 message_id 以最后一行为准
+    - 二进制内容写入 BlobStore 并替换为引用，相同内容只上传一次；带 source_key 的内容直接引用原文件
+    - JSON 紧凑序列化，只复制包含二进制的路径，不再深拷贝整个会话
+
+    本进程写过的文档直接从内存读取；冷读取（首次读取磁盘上的文档）仍是同步的，
+    只有包含二进制引用时才需要借助线程池加载
+    """
+
+    # 有未完成写入的实例，关闭时统一等待
+    _active: Set["AsyncFileSessionManager"] = set()
+    _cold_read_executor: Optional[ThreadPoolExecutor] = None
+
+    def __init__(
+            self,
+            graph_id: str,
+            session_id: str,
+            storage_dir: Optional[str] = None,
+            **kwargs: Any,
+    ):
+        self.graph_id = graph_id
+        # 文件路径 -> 最新文档（二进制为 bytes）
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        # messages.jsonl 路径 -> {message_id: 最新消息}
+        self._messages: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # id(bytes) -> (bytes, sha256)，避免同一对象在每次写入时重复计算哈希
+        self._digests: Dict[int, Tuple[bytes, str]] = {}
+        # 本会话已写入并登记引用的 sha256
+        self._stored_blobs: Set[str] = set()
+        self._ops: Deque[Tuple[str, str, Any]] = deque()
+        self._writer: Optional[asyncio.Task] = None
+        super().__init__(session_id, storage_dir, **kwargs)
+
+    # ---------------- 二进制引用 ----------------
+
+    def _digest(self, data: bytes) -> str:
+        cached = self._digests.get(id(data))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        sha256 = hashlib.sha256(data).hexdigest()
+        self._digests[id(data)] = (data, sha256)
+        return sha256
+
+    def _externalize(self, value: Any, blobs: Dict[str, bytes], source_key: Optional[str] = None) -> Any:
+        """把二进制替换为引用，只复制包含二进制的容器"""
+        if isinstance(value, (bytes, bytearray)):
+            if source_key:
+                return {BLOB_REF: source_key}
+            data = bytes(value) if isinstance(value, bytearray) else value
+            sha256 = self._digest(data)
+            blobs[sha256] = data
+            return {BLOB_REF: BlobStore.blob_key(sha256)}
+
+        if isinstance(value, dict):
+            # SessionMessage.to_dict 会把 bytes 编码为 base64
+            if value.get("__bytes_encoded__") is True and "data" in value:
+                return self._externalize(base64.b64decode(value["data"]), blobs, source_key)
+            source_key = value.get("source_key") or source_key
+            result = value
+            for k, v in value.items():
+                new = self._externalize(v, blobs, source_key)
+                if new is not v:
+                    if result is value:
+                        result = dict(value)
+                    result[k] = new
+            return result
+
+        if isinstance(value, list):
+            result = value
+            for index, item in enumerate(value):
+                new = self._externalize(item, blobs, source_key)
+                if new is not item:
+                    if result is value:
+                        result = list(value)
+                    result[index] = new
+            return result
+
+        return value
+
+    @classmethod
+    def _collect_refs(cls, value: Any, refs: Set[str]) -> None:
+        if isinstance(value, dict):
+            if BLOB_REF in value:
+                refs.add(value[BLOB_REF])
+                return
+            for item in value.values():
+                cls._collect_refs(item, refs)
+        elif isinstance(value, list):
+            for item in value:
+                cls._collect_refs(item, refs)
+
+    @classmethod
+    def _resolve(cls, value: Any, blobs: Dict[str, bytes]) -> Any:
+        if isinstance(value, dict):
+            if BLOB_REF in value:
+                return blobs[value[BLOB_REF]]
+            return {k: cls._resolve(v, blobs) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._resolve(item, blobs) for item in value]
+        return value
+
+    @staticmethod
+    async def _load_blobs(keys: list[str]) -> Dict[str, bytes]:
+        return await storage_client.load_many(keys)
+
+    @classmethod
+    def _hydrate(cls, value: Any) -> Any:
+        """冷读取时把引用还原为 bytes"""
+        refs: Set[str] = set()
+        cls._collect_refs(value, refs)
+        if not refs:
+            return value
+
+        coro = cls._load_blobs(list(refs))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            blobs = asyncio.run(coro)
+        else:
+            # 同步接口运行在事件循环线程上，无法就地等待协程，只在冷读取时借用线程池
+            if cls._cold_read_executor is None:
+                cls._cold_read_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="SessionColdRead")
+            blobs = cls._cold_read_executor.submit(asyncio.run, coro).result()
+        return cls._resolve(value, blobs)
+
+    # ---------------- 写入任务 ----------------
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def _submit(self, kind: str, target: str, payload: Any = None) -> None:
+        self._ops.append((kind, target, payload))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 没有运行中的事件循环（例如在工作线程中调用），就地完成写入
+            asyncio.run(self._drain())
+            return
+        if self._writer is None or self._writer.done():
+            self._active.add(self)
+            self._writer = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        try:
+            while self._ops:
+                kind, target, payload = self._ops[0]
+                try:
+                    await self._apply(kind, target, payload)
+                except Exception as e:
+                    logger.error(f"Session write failed for {target}: {type(e).__name__}: {e}")
+                self._ops.popleft()
+        finally:
+            self._active.discard(self)
+
+    async def _apply(self, kind: str, target: str, payload: Any) -> None:
+        match kind:
+            case "blob":
+                await BlobStore.put(payload, owner=self.session_id, graph_id=self.graph_id, sha256=target)
+                self._stored_blobs.add(target)
+            case "write":
+                await aiofiles.os.makedirs(os.path.dirname(target), exist_ok=True)
+                tmp = f"{target}.tmp"
+                async with aiofiles.open(tmp, "w", encoding="utf-8", newline="\n") as f:
+                    await f.write(payload)
+                await aiofiles.os.replace(tmp, target)
+            case "append":
+                await aiofiles.os.makedirs(os.path.dirname(target), exist_ok=True)
+                async with aiofiles.open(target, "a", encoding="utf-8", newline="\n") as f:
+                    await f.write(payload)
+            case "delete":
+                await asyncio.to_thread(shutil.rmtree, target, True)
+            case "release":
+                await BlobStore.release(owner=target)
+
+    def _persist(self, kind: str, path: str, data: Dict[str, Any]) -> None:
+        """二进制先于引用它的文档写入"""
+        blobs: Dict[str, bytes] = {}
+        stored = self._externalize(data, blobs)
+        for sha256, blob in blobs.items():
+            if sha256 not in self._stored_blobs:
+                self._submit("blob", sha256, blob)
+        text = self._dumps(stored)
+        self._submit(kind, path, text + "\n" if kind == "append" else text)
+
+    async def flush(self) -> None:
+        """等待本会话已投递的写入完成"""
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    @classmethod
+    async def flush_all(cls) -> None:
+        """等待所有会话的写入完成（进程关闭时调用）"""
+        await asyncio.gather(*(manager.flush() for manager in list(cls._active)), return_exceptions=True)
+
+    # ---------------- 文档读写 ----------------
+
+    def _put_document(self, path: str, data: Dict[str, Any]) -> None:
+        self._documents[path] = data
+        self._persist("write", path, data)
+
+    def _get_document(self, path: str) -> Optional[Dict[str, Any]]:
+        if path in self._documents:
+            return self._documents[path]
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = self._hydrate(json.load(f))
+        except json.JSONDecodeError as e:
+            raise SessionException(f"Invalid JSON in file {path}: {str(e)}") from e
+        self._documents[path] = data
+        return data
+
+    def _get_messages_path(self, session_id: str, agent_id: str) -> str:
+        return os.path.join(self._get_agent_path(session_id, agent_id), MESSAGES_FILE)
+
+    def _get_messages(self, session_id: str, agent_id: str) -> Dict[int, Dict[str, Any]]:
+        path = self._get_messages_path(session_id, agent_id)
+        if path in self._messages:
+            return self._messages[path]
+
+        messages: Dict[int, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip():
+                        continue
+                    try:
+                        data = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        # 进程异常退出可能留下不完整的最后一行
+                        logger.warning(f"Skip invalid message line {line_no} in {path}: {e}")
+                        continue
+                    messages[data["message_id"]] = data
+            messages = self._hydrate(messages)
+        self._messages[path] = messages
+        return messages
+
+    def _append_message(self, session_id: str, agent_id: str, data: Dict[str, Any]) -> None:
+        self._get_messages(session_id, agent_id)[data["message_id"]] = data
+        self._persist("append", self._get_messages_path(session_id, agent_id), data)
+
+    # ---------------- SessionRepository ----------------
+
+    def create_session(self, session: Session, **kwargs: Any) -> Session:
+        session_file = os.path.join(self._get_session_path(session.session_id), "session.json")
+        if self._get_document(session_file) is not None:
+            raise SessionException(f"Session {session.session_id} already exists")
+        self._put_document(session_file, session.to_dict())
+        return session
+
+    def read_session(self, session_id: str, **kwargs: Any) -> Optional[Session]:
+        data = self._get_document(os.path.join(self._get_session_path(session_id), "session.json"))
+        return Session.from_dict(data) if data is not None else None
+
+    def delete_session(self, session_id: str, **kwargs: Any) -> None:
+        session_dir = self._get_session_path(session_id)
+        if self.read_session(session_id) is None and not os.path.exists(session_dir):
+            raise SessionException(f"Session {session_id} does not exist")
+
+        prefix = session_dir + os.sep
+        for cache in (self._documents, self._messages):
+            for path in [path for path in cache if path.startswith(prefix)]:
+                del cache[path]
+        self._submit("delete", session_dir)
+        self._submit("release", session_id)
+        self._stored_blobs.clear()
+
+    def create_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        agent_file = os.path.join(self._get_agent_path(session_id, session_agent.agent_id), "agent.json")
+        self._put_document(agent_file, session_agent.to_dict())
+
+    def read_agent(self, session_id: str, agent_id: str, **kwargs: Any) -> Optional[SessionAgent]:
+        data = self._get_document(os.path.join(self._get_agent_path(session_id, agent_id), "agent.json"))
+        return SessionAgent.from_dict(data) if data is not None else None
+
+    def update_agent(self, session_id: str, session_agent: SessionAgent, **kwargs: Any) -> None:
+        agent_id = session_agent.agent_id
+        previous_agent = self.read_agent(session_id=session_id, agent_id=agent_id)
+        if previous_agent is None:
+            raise SessionException(f"Agent {agent_id} in session {session_id} does not exist")
+
+        session_agent.created_at = previous_agent.created_at
+        self.create_agent(session_id, session_agent)
+
+    def create_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        self._append_message(session_id, agent_id, session_message.to_dict())
+
+    def read_message(
+            self, session_id: str, agent_id: str, message_id: int, **kwargs: Any
+    ) -> Optional[SessionMessage]:
+        data = self._get_messages(session_id, agent_id).get(message_id)
+        return SessionMessage.from_dict(data) if data is not None else None
+
+    def update_message(self, session_id: str, agent_id: str, session_message: SessionMessage, **kwargs: Any) -> None:
+        message_id = session_message.message_id
+        previous_message = self.read_message(session_id=session_id, agent_id=agent_id, message_id=message_id)
+        if previous_message is None:
+            raise SessionException(f"Message {message_id} does not exist")
+
+        session_message.created_at = previous_message.created_at
+        self._append_message(session_id, agent_id, session_message.to_dict())
+
+    def list_messages(
+            self, session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0, **kwargs: Any
+    ) -> list[SessionMessage]:
+        if self.read_agent(session_id=session_id, agent_id=agent_id) is None:
+            raise SessionException(f"Agent {agent_id} in session {session_id} does not exist")
+
+        messages = self._get_messages(session_id, agent_id)
+        message_ids = sorted(messages)
+        message_ids = message_ids[offset:offset + limit] if limit is not None else message_ids[offset:]
+        return [SessionMessage.from_dict(messages[message_id]) for message_id in message_ids]
+
+    def create_multi_agent(self, session_id: str, multi_agent: "MultiAgentBase", **kwargs: Any) -> None:
+        multi_agent_file = os.path.join(self._get_multi_agent_path(session_id, multi_agent.id), "multi_agent.json")
+        self._put_document(multi_agent_file, multi_agent.serialize_state())
+
+    def read_multi_agent(self, session_id: str, multi_agent_id: str, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        multi_agent_file = os.path.join(self._get_multi_agent_path(session_id, multi_agent_id), "multi_agent.json")
+        data = self._get_document(multi_agent_file)
+        return dict(data) if data is not None else None
+
+    def update_multi_agent(self, session_id: str, multi_agent: "MultiAgentBase", **kwargs: Any) -> None:
+        if self.read_multi_agent(session_id=session_id, multi_agent_id=multi_agent.id) is None:
+            raise SessionException(f"MultiAgent state {multi_agent.id} in session {session_id} does not exist")
+        self.create_multi_agent(session_id, multi_agent)
+
+
 def create_session_manager(graph_id: str, session_id: str):
     session_manager = settings.session_manager
     match session_manager.manager:
+        case SessionManagerType.ASYNC_FILE:
+            storage_dir = os.path.join(session_manager.file.root, session_manager.file.folder)
+            return AsyncFileSessionManager(graph_id=graph_id, session_id=session_id, storage_dir=storage_dir)
         case SessionManagerType.LOCAL | _:
             base_dir = session_manager.file.root
             folder = session_manager.file.folder
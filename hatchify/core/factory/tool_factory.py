@@ -3,6 +3,8 @@ from copy import deepcopy
 from strands.tools.decorator import DecoratedFunctionTool
 from strands.types.tools import AgentTool
 
+from hatchify.common.domain.entity.function_cache_policy import FunctionCachePolicy
+
 
 class ToolRouter[T: AgentTool = AgentTool]:
     """泛型工具路由器，可以限制接受的工具类型
@@ -22,14 +24,22 @@ class ToolRouter[T: AgentTool = AgentTool]:
 
     def __init__(self) -> None:
         self._tools: dict[str, T] = {}
+        self._cache_policies: dict[str, FunctionCachePolicy] = {}
+        self._version: int = 0
 
-    def register(self, _tool: T) -> None:
+    def register(self, _tool: T, *, cache: FunctionCachePolicy | None = None) -> None:
         """注册工具
 
         Args:
             _tool: 工具实例，类型由泛型参数 T 限制
+            cache: 可选的结果缓存策略，仅对确定性的 Function 声明（FunctionNodeWrapper 据此复用相同输入的结果）
         """
         self._tools[_tool.tool_name] = _tool  # type: ignore
+        if cache is not None:
+            self._cache_policies[_tool.tool_name] = cache
+        else:
+            self._cache_policies.pop(_tool.tool_name, None)
+        self._version += 1
 
     def include_router(
             self,
@@ -54,6 +64,11 @@ class ToolRouter[T: AgentTool = AgentTool]:
             if not overwrite and new_name in self._tools:
                 raise ValueError(f"Tool '{new_name}' already exists in ToolRouter.")
 
+            if (policy := router.get_cache_policy(name)) is not None:
+                self._cache_policies[new_name] = policy
+            else:
+                self._cache_policies.pop(new_name, None)
+
             if new_name == name:
                 self._tools[new_name] = item
             else:
@@ -64,6 +79,12 @@ class ToolRouter[T: AgentTool = AgentTool]:
                 cloned: T = deepcopy(item)
                 cloned._tool_name = new_name
                 self._tools[new_name] = cloned
+        self._version += 1
+
+    @property
+    def version(self) -> int:
+        """注册表版本号，每次注册/包含路由器时递增（用于缓存失效判断）"""
+        return self._version
 
     def get_tool(self, name: str) -> T:
         """获取工具
@@ -76,6 +97,10 @@ class ToolRouter[T: AgentTool = AgentTool]:
         """
         return self._tools[name]
 
+    def get_cache_policy(self, name: str) -> FunctionCachePolicy | None:
+        """获取工具注册时声明的结果缓存策略，未声明时返回 None"""
+        return self._cache_policies.get(name)
+
     def get_all_tools(self) -> dict[str, T]:
         """获取所有工具
 
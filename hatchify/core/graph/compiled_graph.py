@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field
+from typing import Optional, Type, List, Callable, Tuple
+
+from pydantic import BaseModel
+from strands.models import Model
+from strands.multiagent.graph import GraphState
+from strands.tools.decorator import DecoratedFunctionTool
+
+from hatchify.common.domain.entity.agent_card import AgentCard
+from hatchify.common.domain.entity.function_cache_policy import FunctionCachePolicy
+from hatchify.common.domain.entity.graph_spec import GraphSpec
+
+
+@dataclass(frozen=True)
+class CompiledAgentNode:
+    """预编译的 Agent 节点（无状态部分，可在多次执行间共享）"""
+    name: str
+    agent_card: AgentCard
+    model: Model
+    structured_output_model: Optional[Type[BaseModel]] = None
+
+
+@dataclass(frozen=True)
+class CompiledFunctionNode:
+    """预编译的 Function 节点"""
+    name: str
+    tool: DecoratedFunctionTool
+    cache_policy: Optional[FunctionCachePolicy] = None
+
+
+@dataclass(frozen=True)
+class CompiledEdge:
+    """预编译的边，condition 为纯函数闭包，只读取传入的 GraphState"""
+    from_node: str
+    to_node: str
+    condition: Optional[Callable[[GraphState], bool]] = None
+
+
+@dataclass(frozen=True)
+class CompiledGraph:
+    """GraphSpec 的编译产物
+
+    保存构建 Graph 时所有与执行无关的结果（工具校验、LLM Model、structured output model、
+    边条件闭包），每次执行只需通过 DynamicGraphBuilder.instantiate() 生成带有新的
+    GraphState、Agent 会话、SessionManager 与 Hooks 的 Graph 实例。
+    """
+    graph_spec: GraphSpec
+    entry_point: str
+    agents: Tuple[CompiledAgentNode, ...] = field(default_factory=tuple)
+    functions: Tuple[CompiledFunctionNode, ...] = field(default_factory=tuple)
+    edges: Tuple[CompiledEdge, ...] = field(default_factory=tuple)
+
+    @property
+    def node_names(self) -> List[str]:
+        return [node.name for node in self.agents] + [node.name for node in self.functions]
@@ -1,5 +1,4 @@
-import re
-from typing import Optional, Dict, Any, cast, List, Callable
+from typing import Optional, Any, cast, List, Callable
 
 from loguru import logger
 from strands.agent import AgentResult
@@ -12,11 +11,14 @@ from strands.types.tools import AgentTool
 from hatchify.common.domain.entity.agent_card import AgentCard
 from hatchify.common.domain.entity.agent_node_spec import AgentNode
 from hatchify.common.domain.entity.function_node_spec import FunctionNode
-from hatchify.common.domain.entity.graph_spec import GraphSpec, ConditionRule, Edge
+from hatchify.common.domain.entity.graph_spec import GraphSpec, Edge
 from hatchify.common.domain.enums.agent_category import AgentCategory
 from hatchify.core.factory.agent_factory import create_agent_by_agent_card
+from hatchify.core.factory.llm_factory import create_llm_by_agent_card
 from hatchify.core.factory.tool_factory import ToolRouter
-from hatchify.core.graph.graph_wrapper import GraphBuilderAdapter
+from hatchify.core.graph.condition_compiler import compile_json_logic, compile_rules
+from hatchify.core.graph.compiled_graph import CompiledGraph, CompiledAgentNode, CompiledFunctionNode, CompiledEdge
+from hatchify.core.graph.graph_wrapper import GraphBuilderAdapter, GraphWrapper
 from hatchify.core.graph.nodes.function_node import FunctionNodeWrapper
 
 
@@ -74,34 +76,42 @@ class DynamicGraphBuilder:
         Raises:
             ValueError: 节点名称重复、边引用的节点不存在、工具不存在等错误
         """
-        self._validate_unique_node_names(graph_spec)
+        return self.instantiate(self.compile_graph(graph_spec))
 
-        builder = GraphBuilderAdapter()
+    def compile_graph(self, graph_spec: GraphSpec) -> CompiledGraph:
+        """将 GraphSpec 编译为与执行无关的 CompiledGraph
 
-        created_nodes: Dict[str, Any] = {}
+        完成所有校验，并预先创建 LLM Model、structured output model 与边条件闭包。
+        编译结果不持有任何执行状态，可被缓存并在多次执行间共享。
 
-        # 步骤 1: 添加所有 Agent 节点
-        for agent_node in graph_spec.agents:
-            agent = self._create_agent_node(agent_node)
-            builder.add_node(agent, agent_node.name)
-            created_nodes[agent_node.name] = agent
+        Args:
+            graph_spec: Graph 规范对象
 
-        # 步骤 2: 添加所有 Function 节点
-        for function_node_spec in graph_spec.functions:
-            function_node = self._create_function_node(function_node_spec)
-            builder.add_node(function_node, function_node_spec.name)
-            created_nodes[function_node_spec.name] = function_node
+        Returns:
+            CompiledGraph 实例
 
+        Raises:
+            ValueError: 节点名称重复、边引用的节点不存在、工具不存在等错误
+        """
+        self._validate_unique_node_names(graph_spec)
+
+        compiled_agents = [self._compile_agent_node(agent_node) for agent_node in graph_spec.agents]
+        compiled_functions = [
+            self._compile_function_node(function_node_spec) for function_node_spec in graph_spec.functions
+        ]
+        node_names = [node.name for node in compiled_agents] + [node.name for node in compiled_functions]
+
+        compiled_edges: List[CompiledEdge] = []
         for edge in graph_spec.edges:
-            if edge.from_node not in created_nodes:
+            if edge.from_node not in node_names:
                 raise ValueError(
                     f"边的起始节点 '{edge.from_node}' 不存在于 Graph 中。"
-                    f"可用节点: {list(created_nodes.keys())}"
+                    f"可用节点: {node_names}"
                 )
-            if edge.to_node not in created_nodes:
+            if edge.to_node not in node_names:
                 raise ValueError(
                     f"边的目标节点 '{edge.to_node}' 不存在于 Graph 中。"
-                    f"可用节点: {list(created_nodes.keys())}"
+                    f"可用节点: {node_names}"
                 )
 
             from_agent_spec = self._get_agent_spec_by_name(graph_spec, edge.from_node)
@@ -118,18 +128,64 @@ class DynamicGraphBuilder:
             elif from_agent_spec and from_agent_spec.category == AgentCategory.ORCHESTRATOR:
                 condition = self._create_orchestrator_condition(edge.from_node, edge.to_node)
 
-            if condition:
-                builder.add_edge(edge.from_node, edge.to_node, condition=condition)
-            else:
-                builder.add_edge(edge.from_node, edge.to_node)
+            compiled_edges.append(CompiledEdge(from_node=edge.from_node, to_node=edge.to_node, condition=condition))
 
-        if graph_spec.entry_point not in created_nodes:
+        if graph_spec.entry_point not in node_names:
             raise ValueError(
                 f"入口点 '{graph_spec.entry_point}' 不存在于 Graph 中。"
-                f"可用节点: {list(created_nodes.keys())}"
+                f"可用节点: {node_names}"
+            )
+
+        return CompiledGraph(
+            graph_spec=graph_spec,
+            entry_point=graph_spec.entry_point,
+            agents=tuple(compiled_agents),
+            functions=tuple(compiled_functions),
+            edges=tuple(compiled_edges),
+        )
+
+    def instantiate(self, compiled_graph: CompiledGraph) -> GraphWrapper:
+        """基于 CompiledGraph 生成一次执行使用的 Graph 实例
+
+        每次调用都会创建新的 Agent（独立的会话消息）、FunctionNodeWrapper 与 GraphState，
+        并挂载当前 builder 的 hooks / session_manager / execution_timeout。
+
+        Args:
+            compiled_graph: compile_graph() 的编译结果
+
+        Returns:
+            构建好的 Strands Graph 实例
+        """
+        builder = GraphBuilderAdapter()
+
+        # 步骤 1: 添加所有 Agent 节点
+        for compiled_agent in compiled_graph.agents:
+            agent = create_agent_by_agent_card(
+                agent_card=compiled_agent.agent_card,
+                structured_output_model=compiled_agent.structured_output_model,
+                hooks=None,
+                model=compiled_agent.model,
             )
+            builder.add_node(agent, compiled_agent.name)
+
+        # 步骤 2: 添加所有 Function 节点
+        # 注意：不要在节点级别传递 hooks，hooks 应该在 GraphBuilder 级别设置
+        for compiled_function in compiled_graph.functions:
+            function_node = FunctionNodeWrapper(
+                tool=compiled_function.tool,
+                hooks=None,
+                _id=compiled_function.name,  # 使用 function_node_spec.name 作为节点 ID
+                cache_policy=compiled_function.cache_policy,
+            )
+            builder.add_node(function_node, compiled_function.name)
+
+        for compiled_edge in compiled_graph.edges:
+            if compiled_edge.condition:
+                builder.add_edge(compiled_edge.from_node, compiled_edge.to_node, condition=compiled_edge.condition)
+            else:
+                builder.add_edge(compiled_edge.from_node, compiled_edge.to_node)
 
-        builder.set_entry_point(graph_spec.entry_point)
+        builder.set_entry_point(compiled_graph.entry_point)
 
         if self.hooks:
             builder.set_hook_providers(self.hooks)
@@ -143,29 +199,50 @@ class DynamicGraphBuilder:
         graph = builder.build()
         return graph
 
-    def _create_agent_node(self, agent_node: AgentNode) -> Any:
-        """从 AgentNode 创建 Agent 实例
+    def _compile_agent_node(self, agent_node: AgentNode) -> CompiledAgentNode:
+        """从 AgentNode 编译 Agent 节点
 
         Args:
             agent_node: Agent 节点规范
 
         Returns:
-            创建好的 Agent 实例
+            CompiledAgentNode（AgentCard、LLM Model 与 structured_output_model）
 
         Raises:
-            KeyError: 工具不存在
+            ValueError: 工具不存在
         """
-        # 步骤 1: 创建 AgentCard
+        # 步骤 1: 验证工具是否存在
+        for tool_name in agent_node.tools:
+            try:
+                self.tool_router.get_tool(tool_name)
+            except KeyError:
+                available_tools = list(self.tool_router.get_all_tools().keys())
+                raise ValueError(
+                    f"Agent '{agent_node.name}' 引用的工具 '{tool_name}' 不存在。"
+                    f"可用工具: {available_tools}"
+                )
+
+        # 步骤 2: 如果是 Router 或 Orchestrator，注入完成指令
+        instruction = agent_node.instruction
+        if agent_node.category in [AgentCategory.ROUTER, AgentCategory.ORCHESTRATOR]:
+            instruction += (
+                "\n\nIMPORTANT: When you determine that the workflow is complete "
+                "and all necessary agents have been executed, "
+                'output {"next_node": "COMPLETE"} to signal completion. '
+                'Otherwise, continue routing to the appropriate next agent.'
+            )
+
+        # 步骤 3: 创建 AgentCard
         agent_card = AgentCard(
             name=agent_node.name,
             model=agent_node.model,
-            instruction=agent_node.instruction,
+            instruction=instruction,
             description=f"Agent for {agent_node.name}",
             tools=agent_node.tools
         )
 
-        # 步骤 2: 获取 structured_output_model
-        # 这是一个 @computed_field，会自动将 JSON Schema 转换为 BaseModel
+        # 步骤 4: 获取 structured_output_model
+        # 这是一个 property，会自动将 JSON Schema 转换为 BaseModel
         structured_output_model = agent_node.structured_output_model
 
         if structured_output_model:
@@ -174,55 +251,31 @@ class DynamicGraphBuilder:
                 f"{structured_output_model.__name__}"
             )
 
-        # 步骤 3: 验证工具是否存在
-        for tool_name in agent_node.tools:
-            try:
-                self.tool_router.get_tool(tool_name)
-            except KeyError:
-                available_tools = list(self.tool_router.get_all_tools().keys())
-                raise ValueError(
-                    f"Agent '{agent_node.name}' 引用的工具 '{tool_name}' 不存在。"
-                    f"可用工具: {available_tools}"
-                )
-
-        # 步骤 4: 创建 Agent
+        # 步骤 5: 创建 LLM Model（无会话状态，可在多个 Agent 实例间共享）
         # 注意：不再需要 FilterReasoningContentHook，因为：
         # - GeminiModel 原生支持 reasoningContent
         # - OpenAIModel 和其他模型不会产生 reasoningContent
-        agent = create_agent_by_agent_card(
+        model = create_llm_by_agent_card(agent_card)
+
+        return CompiledAgentNode(
+            name=agent_node.name,
             agent_card=agent_card,
+            model=model,
             structured_output_model=structured_output_model,
-            hooks=None
         )
 
-        # 步骤 5: 如果是 Router 或 Orchestrator，注入完成指令
-        if agent_node.category in [AgentCategory.ROUTER, AgentCategory.ORCHESTRATOR]:
-            completion_instruction = (
-                "\n\nIMPORTANT: When you determine that the workflow is complete "
-                "and all necessary agents have been executed, "
-                'output {"next_node": "COMPLETE"} to signal completion. '
-                'Otherwise, continue routing to the appropriate next agent.'
-            )
-
-            # 注入到 Agent 的 system_prompt
-            original_prompt = agent.system_prompt
-            agent.system_prompt = original_prompt + completion_instruction
-
-        return agent
-
-    def _create_function_node(self, function_node_spec: FunctionNode) -> FunctionNodeWrapper:
-        """从 FunctionNodeSpec 创建 FunctionNodeWrapper 实例
+    def _compile_function_node(self, function_node_spec: FunctionNode) -> CompiledFunctionNode:
+        """从 FunctionNodeSpec 编译 Function 节点
 
         Args:
             function_node_spec: Function 节点规范
 
         Returns:
-            创建好的 FunctionNodeWrapper 实例
+            CompiledFunctionNode
 
         Raises:
-            KeyError: Function 类型对应的工具不存在
+            ValueError: Function 类型对应的工具不存在
         """
-        # 步骤 1: 从 function_router 获取 tool
         try:
             tool = self.function_router.get_tool(function_node_spec.function_ref)
         except KeyError:
@@ -232,19 +285,15 @@ class DynamicGraphBuilder:
                 f"可用 Function: {available_functions}"
             )
 
-        # 步骤 2: 创建 FunctionNodeWrapper
-        # 注意：不要在节点级别传递 hooks，hooks 应该在 GraphBuilder 级别设置
-        function_node = FunctionNodeWrapper(
-            tool=cast(DecoratedFunctionTool, tool),
-            hooks=None,
-            _id=function_node_spec.name  # 使用 function_node_spec.name 作为节点 ID
-        )
-
         logger.debug(
             f"Function '{function_node_spec.name}' 使用工具: {function_node_spec.function_ref}"
         )
 
-        return function_node
+        return CompiledFunctionNode(
+            name=function_node_spec.name,
+            tool=cast(DecoratedFunctionTool, tool),
+            cache_policy=self.function_router.get_cache_policy(function_node_spec.function_ref),
+        )
 
     @staticmethod
     def _validate_unique_node_names(graph_spec: GraphSpec) -> None:
@@ -300,103 +349,10 @@ class DynamicGraphBuilder:
                 return agent_node
         return None
 
-    @staticmethod
-    def _apply_json_logic(expr: Any, data: Dict[str, Any]) -> Any:
-        """最小实现的 JSONLogic 解析，覆盖常用运算符"""
-
-        def get_var(path: Any, default: Any = None) -> Any:
-            if path is None:
-                return data
-            if not isinstance(path, str):
-                return data.get(path, default)
-            cur = data
-            for key in path.split("."):
-                if isinstance(cur, dict) and key in cur:
-                    cur = cur[key]
-                else:
-                    return default
-            return cur
-
-        def resolve(val: Any) -> Any:
-            if isinstance(val, dict):
-                return eval_expr(val)
-            if isinstance(val, list):
-                return [resolve(v) for v in val]
-            return val
-
-        def eval_expr(obj: Any) -> Any:
-            if not isinstance(obj, dict) or len(obj) != 1:
-                return obj
-            op, args = next(iter(obj.items()))
-            if not isinstance(args, list):
-                args = [args]
-
-            if op in {"var"}:
-                path = args[0] if args else None
-                default = args[1] if len(args) > 1 else None
-                return get_var(path, default)
-
-            if op in {"==", "eq"}:
-                a, b = resolve(args[0]), resolve(args[1])
-                return a == b
-            if op in {"!=", "neq"}:
-                a, b = resolve(args[0]), resolve(args[1])
-                return a != b
-            if op in {">", "gt"}:
-                a, b = resolve(args[0]), resolve(args[1])
-                return a > b
-            if op in {">=", "gte"}:
-                a, b = resolve(args[0]), resolve(args[1])
-                return a >= b
-            if op in {"<", "lt"}:
-                a, b = resolve(args[0]), resolve(args[1])
-                return a < b
-            if op in {"<=", "lte"}:
-                a, b = resolve(args[0]), resolve(args[1])
-                return a <= b
-            if op in {"!", "not"}:
-                return not bool(resolve(args[0]))
-            if op == "and":
-                return all(bool(resolve(arg)) for arg in args)
-            if op == "or":
-                return any(bool(resolve(arg)) for arg in args)
-            if op == "in":
-                a, b = resolve(args[0]), resolve(args[1])
-                try:
-                    return a in b
-                except Exception as e:
-                    logger.warning(f"{type(e).__name__}: {e}")
-                    return False
-            if op == "if":
-                # args: [cond1, val1, cond2, val2, ..., else]
-                pairs = list(zip(args[0::2], args[1::2]))
-                for cond, val in pairs[:-1]:
-                    if bool(resolve(cond)):
-                        return resolve(val)
-                if len(args) % 2 == 1:
-                    # last default
-                    return resolve(args[-1])
-                # even number: evaluate last pair
-                cond, val = pairs[-1]
-                return resolve(val) if bool(resolve(cond)) else None
-            if op == "regex":
-                pattern = resolve(args[0])
-                target = resolve(args[1])
-                return (
-                        isinstance(pattern, str)
-                        and isinstance(target, str)
-                        and re.search(pattern, target) is not None
-                )
-
-            # 未支持的运算符，直接返回 False
-            logger.warning(f"JSONLogic 未支持的运算符 '{op}'")
-            return False
-
-        return eval_expr(expr)
-
     @staticmethod
     def _create_json_logic_condition(edge: Edge, from_agent_spec: Optional[AgentNode]) -> Callable[[GraphState], bool]:
-        """使用 JSONLogic 表达式创建条件函数"""
+        """使用 JSONLogic 表达式创建条件函数（表达式在构建时编译为闭包）"""
+        evaluate = compile_json_logic(edge.json_logic)
 
         def condition(state: GraphState) -> bool:
             node_result = state.results.get(edge.from_node)
@@ -429,7 +385,7 @@ class DynamicGraphBuilder:
                 return False
 
             try:
-                decision = bool(DynamicGraphBuilder._apply_json_logic(edge.json_logic, output))
+                decision = bool(evaluate(output))
                 if decision:
                     logger.debug(
                         f"JSONLogic 命中，from='{edge.from_node}' -> to='{edge.to_node}', expr={edge.json_logic}"
@@ -452,56 +408,8 @@ class DynamicGraphBuilder:
             logger.warning(f"未知逻辑运算符 '{edge.logic}'，使用 'and' 代替")
             logic = "and"
 
-        def eval_rule(rule: ConditionRule, output: Dict[str, Any]) -> bool:
-            left = output.get(rule.field)
-            right = rule.value
-            op = (rule.op or "").lower()
-
-            handlers: Dict[str, Callable[[Any, Any], bool]] = {
-                "==": lambda l, r: l == r,
-                "eq": lambda l, r: l == r,
-                "!=": lambda l, r: l != r,
-                "neq": lambda l, r: l != r,
-                ">": lambda l, r: l is not None and r is not None and l > r,
-                "gt": lambda l, r: l is not None and r is not None and l > r,
-                ">=": lambda l, r: l is not None and r is not None and l >= r,
-                "gte": lambda l, r: l is not None and r is not None and l >= r,
-                "<": lambda l, r: l is not None and r is not None and l < r,
-                "lt": lambda l, r: l is not None and r is not None and l < r,
-                "<=": lambda l, r: l is not None and r is not None and l <= r,
-                "lte": lambda l, r: l is not None and r is not None and l <= r,
-                "in": lambda l, r: r is not None and l in r,
-                "not_in": lambda l, r: r is None or l not in r,
-                "contains": lambda l, r: l is not None and r in l,
-                "not_contains": lambda l, r: l is None or r not in l,
-                "startswith": lambda l, r: isinstance(l, str) and isinstance(r, str) and l.startswith(r),
-                "endswith": lambda l, r: isinstance(l, str) and isinstance(r, str) and l.endswith(r),
-                "regex": lambda l, r: isinstance(l, str) and isinstance(r, str) and re.search(r, l) is not None,
-                "regex_not": lambda l, r: isinstance(l, str) and isinstance(r, str) and re.search(r, l) is None,
-                "between": lambda l, r: (
-                        l is not None
-                        and isinstance(r, (list, tuple))
-                        and len(r) == 2
-                        and r[0] <= l <= r[1]
-                ),
-                "is_true": lambda l, _: bool(l) is True,
-                "is_false": lambda l, _: bool(l) is False,
-                "exists": lambda l, _: l is not None,
-                "not_exists": lambda l, _: l is None,
-            }
-
-            try:
-                handler = handlers.get(op)
-                if not handler:
-                    logger.warning(f"不支持的比较运算符 '{rule.op}'")
-                    return False
-                return handler(left, right)
-            except Exception as exc:
-                logger.warning(
-                    f"规则计算失败：field={rule.field}, op={rule.op}, value={rule.value}, left={left}",
-                    exc_info=exc
-                )
-                return False
+        # 规则在构建时编译为闭包（运算符与正则只解析一次）
+        evaluate = compile_rules(edge.rules or [], logic)
 
         def condition(state: GraphState) -> bool:
             node_result = state.results.get(edge.from_node)
@@ -533,16 +441,11 @@ class DynamicGraphBuilder:
                 )
                 return False
 
-            rules = edge.rules or []
-            if not rules:
-                return True
-
-            results = [eval_rule(rule, output) for rule in rules]
-            decision = any(results) if logic == "or" else all(results)
+            decision = evaluate(output)
 
-            if decision:
+            if decision and edge.rules:
                 logger.debug(
-                    f"规则命中，from='{edge.from_node}' -> to='{edge.to_node}', logic={logic}, rules={rules}"
+                    f"规则命中，from='{edge.from_node}' -> to='{edge.to_node}', logic={logic}, rules={edge.rules}"
                 )
 
             return decision
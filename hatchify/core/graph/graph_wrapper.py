@@ -1,13 +1,55 @@
-from typing import List
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Any, Iterable, Mapping, Tuple, Optional
 
 from loguru import logger
 from strands.agent import AgentResult
-from strands.multiagent.graph import Graph, GraphNode, GraphBuilder
+from strands.multiagent.graph import Graph, GraphNode, GraphBuilder, GraphEdge
 from strands.types.content import ContentBlock
 
 
+@dataclass(frozen=True)
+class GraphAdjacency:
+    """
+    图的只读邻接索引，构建图时计算一次
+
+    - incoming: node_id -> 指向该节点的边
+    - outgoing: node_id -> 从该节点出发的边
+    - node_by_executor: id(executor) -> GraphNode，用于节点执行器反查自身所在的节点
+    """
+    incoming: Mapping[str, Tuple[GraphEdge, ...]]
+    outgoing: Mapping[str, Tuple[GraphEdge, ...]]
+    node_by_executor: Mapping[int, GraphNode]
+
+    @classmethod
+    def build(cls, nodes: Mapping[str, GraphNode], edges: Iterable[GraphEdge]) -> "GraphAdjacency":
+        incoming: dict[str, list[GraphEdge]] = {node_id: [] for node_id in nodes}
+        outgoing: dict[str, list[GraphEdge]] = {node_id: [] for node_id in nodes}
+        for edge in edges:
+            incoming.setdefault(edge.to_node.node_id, []).append(edge)
+            outgoing.setdefault(edge.from_node.node_id, []).append(edge)
+        return cls(
+            incoming=MappingProxyType({node_id: tuple(items) for node_id, items in incoming.items()}),
+            outgoing=MappingProxyType({node_id: tuple(items) for node_id, items in outgoing.items()}),
+            node_by_executor=MappingProxyType({id(node.executor): node for node in nodes.values()}),
+        )
+
+    def incoming_edges(self, node: GraphNode) -> Tuple[GraphEdge, ...]:
+        return self.incoming.get(node.node_id, ())
+
+    def outgoing_edges(self, node: GraphNode) -> Tuple[GraphEdge, ...]:
+        return self.outgoing.get(node.node_id, ())
+
+    def find_node(self, executor: Any) -> Optional[GraphNode]:
+        return self.node_by_executor.get(id(executor))
+
+
 class GraphWrapper(Graph):
 
+    def __init__(self, *args: Any, adjacency: Optional[GraphAdjacency] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.adjacency: GraphAdjacency = adjacency or GraphAdjacency.build(self.nodes, self.edges)
+
     def _build_node_input(self, node: GraphNode) -> list[ContentBlock]:
         """Build input text for a node based on dependency outputs.
 
@@ -27,10 +69,9 @@ class GraphWrapper(Graph):
         """
         # Get satisfied dependencies
         dependency_results = {}
-        for edge in self.edges:
+        for edge in self.adjacency.incoming_edges(node):
             if (
-                    edge.to_node == node
-                    and edge.from_node in self.state.completed_nodes
+                    edge.from_node in self.state.completed_nodes
                     and edge.from_node.node_id in self.state.results
             ):
                 if edge.should_traverse(self.state):
@@ -94,9 +135,12 @@ class GraphBuilderAdapter(GraphBuilder):
         # Validate entry points and check for cycles
         self._validate_graph()
 
+        nodes = self.nodes.copy()
+        edges = self.edges.copy()
         return GraphWrapper(
-            nodes=self.nodes.copy(),
-            edges=self.edges.copy(),
+            nodes=nodes,
+            edges=edges,
+            adjacency=GraphAdjacency.build(nodes, edges),
             entry_points=self.entry_points.copy(),
             max_node_executions=self._max_node_executions,
             execution_timeout=self._execution_timeout,
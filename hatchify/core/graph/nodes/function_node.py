@@ -16,12 +16,15 @@ from strands.hooks import HookProvider, HookRegistry
 from strands.multiagent.base import MultiAgentBase, MultiAgentResult, Status, NodeResult
 from strands.telemetry import get_tracer, EventLoopMetrics
 from strands.tools.decorator import DecoratedFunctionTool
-from strands.types._events import MultiAgentResultEvent, MultiAgentNodeStartEvent, MultiAgentNodeStopEvent
+from strands.types._events import MultiAgentResultEvent, MultiAgentNodeStartEvent, MultiAgentNodeStopEvent, \
+    TypedEvent
 from strands.types.content import ContentBlock, Message
 from strands.types.event_loop import Usage, Metrics
 from strands.types.tools import ToolUse, ToolResult, ToolResultContent
 
+from hatchify.common.domain.entity.function_cache_policy import FunctionCachePolicy
 from hatchify.core.graph.graph_wrapper import GraphWrapper
+from hatchify.core.manager.function_result_cache import FunctionResultCache
 
 _DEFAULT_FUNCTION_ID = "default_function"
 
@@ -31,6 +34,20 @@ class FunctionResult(MultiAgentResult):
     ...
 
 
+class FunctionCacheHitEvent(TypedEvent):
+    """Event emitted when a function node reuses a cached result instead of executing the tool."""
+
+    def __init__(self, node_id: str, tool_name: str, cache_key: str) -> None:
+        super().__init__(
+            {
+                "type": "function_cache_hit",
+                "node_id": node_id,
+                "tool_name": tool_name,
+                "cache_key": cache_key,
+            }
+        )
+
+
 @dataclass
 class FunctionState:
     task: str | list[ContentBlock] = ""
@@ -46,17 +63,22 @@ class FunctionNodeWrapper(MultiAgentBase):
     It handles both streaming and non-streaming execution.
 
     Can get structured outputs from dependency nodes via graph edges to build tool inputs.
+
+    When the tool was registered with a cache policy, results are memoized by tool name,
+    policy version and the canonical hash of the validated input.
     """
 
     def __init__(
             self,
             tool: DecoratedFunctionTool,
             hooks: Optional[list[HookProvider]] = None,
-            _id: str = _DEFAULT_FUNCTION_ID
+            _id: str = _DEFAULT_FUNCTION_ID,
+            cache_policy: Optional[FunctionCachePolicy] = None,
     ) -> None:
         super().__init__()
         self.id = _id
         self.tool = tool
+        self.cache_policy = cache_policy
         self.name = tool.tool_name
         self.state = FunctionState()
         self.tracer = get_tracer()
@@ -185,17 +207,13 @@ class FunctionNodeWrapper(MultiAgentBase):
             raise ValueError("FunctionNodeWrapper must run in a Graph, but source_graph not found")
 
         # Find current node
-        current_node = None
-        for node_id, node in graph.nodes.items():
-            if node.executor == self:
-                current_node = node
-                break
+        current_node = graph.adjacency.find_node(self)
 
         if not current_node:
             raise ValueError(f"Cannot find FunctionNodeWrapper in Graph (id={self.id})")
 
         # Find incoming edges (dependency nodes)
-        incoming_edges = [edge for edge in graph.edges if edge.to_node == current_node]
+        incoming_edges = graph.adjacency.incoming_edges(current_node)
 
         # Validate single dependency
         if len(incoming_edges) == 0:
@@ -258,12 +276,29 @@ class FunctionNodeWrapper(MultiAgentBase):
             )
 
             validated_input = self.tool._metadata.validate_input(tool_input)
-            self.tool._metadata.inject_special_parameters(validated_input, tool_use, invocation_state)
 
-            if inspect.iscoroutinefunction(self.tool._tool_func):
-                result = await self.tool._tool_func(**validated_input)  # transport: ignore
+            # 在注入 agent / ToolContext 等特殊参数之前计算 key，只反映真实输入
+            cache_key = None
+            if self.cache_policy is not None:
+                cache_key = FunctionResultCache.make_key(self.tool.tool_name, self.cache_policy, validated_input)
+
+            cached_json = await FunctionResultCache.get(cache_key, self.cache_policy) if cache_key else None
+            if cached_json is not None:
+                output_model = self.tool._metadata.type_hints["return"]
+                result = output_model.model_validate_json(cached_json)
+                result_json = cached_json
+                yield FunctionCacheHitEvent(node_id=self.id, tool_name=self.tool.tool_name, cache_key=cache_key)
             else:
-                result = await asyncio.to_thread(self.tool._tool_func, **validated_input)  # transport: ignore
+                self.tool._metadata.inject_special_parameters(validated_input, tool_use, invocation_state)
+
+                if inspect.iscoroutinefunction(self.tool._tool_func):
+                    result = await self.tool._tool_func(**validated_input)  # transport: ignore
+                else:
+                    result = await asyncio.to_thread(self.tool._tool_func, **validated_input)  # transport: ignore
+
+                result_json = result.model_dump_json()
+                if cache_key:
+                    await FunctionResultCache.put(cache_key, self.tool.tool_name, self.cache_policy, result_json)
 
             execution_time = round((time.time() - start_time) * 1000)
             node_result = NodeResult(
@@ -272,9 +307,9 @@ class FunctionNodeWrapper(MultiAgentBase):
                     message=Message(
                         role="assistant",
                         content=[
-                            ContentBlock(text=result.model_dump_json(), toolUse=tool_use, toolResult=ToolResult(
+                            ContentBlock(text=result_json, toolUse=tool_use, toolResult=ToolResult(
                                 content=[
-                                    ToolResultContent(json=result.model_dump_json())
+                                    ToolResultContent(json=result_json)
                                 ],
                                 status="success",
                                 toolUseId=tool_use_id,
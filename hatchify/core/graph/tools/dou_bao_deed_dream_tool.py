@@ -7,6 +7,7 @@ from strands import tool
 from strands.tools.decorator import DecoratedFunctionTool
 
 from hatchify.core.factory.tool_factory import ToolRouter
+from hatchify.core.graph.tools.task_poller import TaskPoller
 from hatchify.core.manager.predefined_tool_manager import get_pre_defined_tool_configs
 
 try:
@@ -100,7 +101,8 @@ async def seed_dream_generate_image(
     """
     try:
         # Call DouBao API to generate image
-        images_response: ImagesResponse = lazy_get_seed_dream_client().images.generate(
+        images_response: ImagesResponse = await TaskPoller.run_sync(
+            lazy_get_seed_dream_client().images.generate,
             model=lazy_get_seed_dream_model(),
             prompt=prompt,
             size=size,
@@ -1,6 +1,5 @@
-import time
 from functools import lru_cache
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Tuple
 
 from loguru import logger
 from pydantic import Field, BaseModel
@@ -8,6 +7,7 @@ from strands import tool
 from strands.tools.decorator import DecoratedFunctionTool
 
 from hatchify.core.factory.tool_factory import ToolRouter
+from hatchify.core.graph.tools.task_poller import TaskPoller
 from hatchify.core.manager.predefined_tool_manager import get_pre_defined_tool_configs
 
 try:
@@ -183,7 +183,9 @@ async def seed_dance_generate_video(
             )
 
         # Call DouBao API to generate video
-        create_result = lazy_get_seed_dance_client().content_generation.tasks.create(
+        tasks = lazy_get_seed_dance_client().content_generation.tasks
+        create_result = await TaskPoller.run_sync(
+            tasks.create,
             model=lazy_get_seed_dance_model(),
             content=content
         )
@@ -191,19 +193,12 @@ async def seed_dance_generate_video(
         task_id = create_result.id
         logger.info(f"Video generation task created: {task_id}")
 
-        # Poll for task completion
-        while True:
-            get_result: ContentGenerationTask = lazy_get_seed_dance_client().content_generation.tasks.get(
-                task_id=task_id
-            )
+        def resolve(get_result: ContentGenerationTask) -> Tuple[bool, Dict[str, Any] | None]:
             status = get_result.status
-
             if status == "succeeded":
-                result_content = get_result.content
-                video_url = result_content.video_url
-
+                video_url = get_result.content.video_url
                 logger.info(f"Video generated successfully: {task_id}")
-                return {
+                return True, {
                     "status": "success",
                     "content": [
                         {
@@ -211,14 +206,21 @@ async def seed_dance_generate_video(
                         }
                     ]
                 }
-            elif status == "failed":
+            if status == "failed":
                 logger.error(f"Video generation failed: {get_result.error}")
                 raise ValueError(
                     f"Failed to generate video. Error: {get_result.error}"
                 )
-            else:
-                logger.info(f"Current status: {status}, retrying after 3 seconds...")
-                time.sleep(3)
+            return False, None
+
+        # Poll for task completion
+        return await TaskPoller.wait(
+            f"seed_dance task {task_id}",
+            fetch=lambda: tasks.get(task_id=task_id),
+            resolve=resolve,
+            status=lambda get_result: get_result.status,
+            on_cancel=lambda: tasks.delete(task_id=task_id),
+        )
 
     except Exception as e:
         logger.error(f"Video generation failed: {type(e).__name__}: {e}")
@@ -1,8 +1,9 @@
+import asyncio
 import base64
 import json
 import uuid
 from functools import lru_cache
-from typing import Dict, Any
+from typing import AsyncIterable, AsyncIterator, Dict, Any, Set, Tuple
 
 import httpx
 from loguru import logger
@@ -11,12 +12,15 @@ from strands import tool
 from strands.tools.decorator import DecoratedFunctionTool
 
 from hatchify.common.extensions.ext_storage import storage_client
+from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.factory.tool_factory import ToolRouter
+from hatchify.core.graph.tools.http_client import ToolHttpClientManager
 from hatchify.core.manager.predefined_tool_manager import get_pre_defined_tool_configs
 
 dou_bao_tts_router = ToolRouter[DecoratedFunctionTool]()
 
 pre_defined_tool_configs = get_pre_defined_tool_configs()
+settings = get_hatchify_settings()
 
 
 @lru_cache(maxsize=1)
@@ -35,20 +39,7 @@ def lazy_get_dou_bao_tts_config():
     return config
 
 
-async def _stream_dou_bao_tts_audio(text: str) -> bytes:
-    """
-    Stream audio data from DouBao TTS API.
-
-    Args:
-        text: Text to synthesize into speech
-
-    Returns:
-        bytes: Audio data in MP3 format
-
-    Raises:
-        RuntimeError: If TTS API returns an error or no audio data
-        httpx.HTTPError: If HTTP request fails
-    """
+def _build_dou_bao_tts_request(text: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
     tts_config = lazy_get_dou_bao_tts_config()
 
     headers = {
@@ -80,47 +71,70 @@ async def _stream_dou_bao_tts_audio(text: str) -> bytes:
             },
         },
     }
+    return headers, payload
+
+
+async def _stream_dou_bao_tts_audio(text: str) -> AsyncIterator[bytes]:
+    """
+    Stream decoded audio data from DouBao TTS API.
+
+    Base64 payloads are decoded incrementally; a chunk that does not end on a
+    4-character boundary carries its tail over to the next one.
 
-    audio_buffer = bytearray()
-    transport = httpx.AsyncHTTPTransport(retries=3)
-    timeout = httpx.Timeout(60.0, connect=30.0)
+    Args:
+        text: Text to synthesize into speech
+
+    Yields:
+        bytes: Audio data in MP3 format
+
+    Raises:
+        RuntimeError: If TTS API returns an error
+        httpx.HTTPError: If HTTP request fails
+    """
+    tts_config = lazy_get_dou_bao_tts_config()
+    headers, payload = _build_dou_bao_tts_request(text)
+    client = ToolHttpClientManager.get_client()
+    pending = ""
 
     try:
-        async with httpx.AsyncClient(transport=transport, timeout=timeout) as client:
-            async with client.stream(
-                "POST",
-                tts_config.url,
-                headers=headers,
-                json=payload,
-            ) as response:
-                response.raise_for_status()
-
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-
-                    try:
-                        chunk = json.loads(line)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Failed to decode DouBao TTS chunk: {line}")
-                        continue
-
-                    code = chunk.get("code", 0)
-
-                    if code == 0 and chunk.get("data"):
-                        audio_buffer.extend(base64.b64decode(chunk["data"]))
-                        continue
-
-                    if code == 0 and chunk.get("sentence"):
-                        logger.debug("DouBao TTS sentence metadata received.")
-                        continue
-
-                    if code == 20000000:
-                        break
-
-                    if code != 0:
-                        message = chunk.get("message") or chunk
-                        raise RuntimeError(f"DouBao TTS error {code}: {message}")
+        async with client.stream(
+            "POST",
+            tts_config.url,
+            headers=headers,
+            json=payload,
+        ) as response:
+            response.raise_for_status()
+
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+
+                try:
+                    chunk = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Failed to decode DouBao TTS chunk: {line}")
+                    continue
+
+                code = chunk.get("code", 0)
+
+                if code == 0 and chunk.get("data"):
+                    pending += chunk["data"]
+                    boundary = len(pending) - len(pending) % 4
+                    if boundary:
+                        yield base64.b64decode(pending[:boundary])
+                        pending = pending[boundary:]
+                    continue
+
+                if code == 0 and chunk.get("sentence"):
+                    logger.debug("DouBao TTS sentence metadata received.")
+                    continue
+
+                if code == 20000000:
+                    break
+
+                if code != 0:
+                    message = chunk.get("message") or chunk
+                    raise RuntimeError(f"DouBao TTS error {code}: {message}")
     except httpx.ConnectError as exc:
         logger.error(f"DouBao TTS network connection failed: {exc}")
         raise
@@ -128,10 +142,88 @@ async def _stream_dou_bao_tts_audio(text: str) -> bytes:
         logger.error(f"DouBao TTS request failed: {exc}")
         raise
 
-    if not audio_buffer:
-        raise RuntimeError("DouBao TTS returned no audio data.")
+    if pending:
+        yield base64.b64decode(pending)
+
+
+async def _coalesce_chunks(chunks: AsyncIterable[bytes], size: int) -> AsyncIterator[bytes]:
+    """将较小的音频分块合并为 size 大小后写入存储，减少分片写入次数"""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
 
-    return bytes(audio_buffer)
+class _TTSUpload:
+    """
+    TTS 音频流式写入存储
+
+    内存中只保留一个写入分块；合成失败或没有音频数据时删除已写入的部分对象
+    """
+
+    def __init__(self, text: str, storage_key: str):
+        self.text = text
+        self.storage_key = storage_key
+        self.size = 0
+        self.first_chunk = asyncio.Event()
+
+    async def _audio(self) -> AsyncIterator[bytes]:
+        async for chunk in _stream_dou_bao_tts_audio(text=self.text):
+            if not chunk:
+                continue
+            self.size += len(chunk)
+            self.first_chunk.set()
+            yield chunk
+
+    async def run(self) -> int:
+        try:
+            await storage_client.save_stream(
+                key=self.storage_key,
+                chunks=_coalesce_chunks(self._audio(), settings.tts_stream.write_chunk_size),
+                mimetype="audio/mpeg"
+            )
+            if not self.size:
+                raise RuntimeError("DouBao TTS returned no audio data.")
+        except BaseException:
+            try:
+                await storage_client.delete(self.storage_key)
+            except Exception as e:
+                logger.warning(f"Failed to delete partial TTS audio {self.storage_key}: {type(e).__name__}: {e}")
+            raise
+        return self.size
+
+
+# 渐进模式下仍在上传的任务（保持引用，避免被回收）
+_background_uploads: Set[asyncio.Task] = set()
+
+
+async def _upload_in_background(upload: _TTSUpload) -> None:
+    """后台完成上传，收到第一段音频后返回；在此之前合成失败时抛出异常"""
+    task = asyncio.create_task(upload.run())
+    _background_uploads.add(task)
+    task.add_done_callback(_background_uploads.discard)
+
+    def log_failure(t: asyncio.Task) -> None:
+        if not t.cancelled() and (e := t.exception()) is not None:
+            logger.error(f"TTS background upload failed: {upload.storage_key}: {type(e).__name__}: {e}")
+
+    task.add_done_callback(log_failure)
+
+    first_chunk = asyncio.create_task(upload.first_chunk.wait())
+    try:
+        await asyncio.wait({task, first_chunk}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+    finally:
+        first_chunk.cancel()
+    if task.done():
+        # 第一段音频之前就结束了：抛出失败原因
+        task.result()
 
 
 class DouBaoTTSInputSchema(BaseModel):
@@ -170,16 +262,13 @@ async def dou_bao_text_to_speech(text: str) -> Dict[str, Any]:
         Exception: For other API or storage errors
     """
     try:
-        # Generate audio via DouBao TTS
-        audio_bytes = await _stream_dou_bao_tts_audio(text=text)
-
-        # Store audio in cloud storage
+        # Stream audio from DouBao TTS into cloud storage
         storage_key = f"audio/{uuid.uuid4()}.mp3"
-        await storage_client.save(
-            key=storage_key,
-            data=audio_bytes,
-            mimetype="audio/mpeg"
-        )
+        upload = _TTSUpload(text=text, storage_key=storage_key)
+        if settings.tts_stream.progressive:
+            await _upload_in_background(upload)
+        else:
+            await upload.run()
 
         # Generate pre-signed URL (valid for 7 days)
         url = await storage_client.get_pre_signed_url(
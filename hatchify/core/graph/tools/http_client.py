@@ -0,0 +1,50 @@
+"""
+预定义工具共享的 HTTP 客户端
+
+所有工具复用同一个 httpx 连接池（长连接 + 连接失败重试），超时由各工具按请求传入
+"""
+import importlib.util
+from typing import Optional
+
+import httpx
+
+from hatchify.common.settings.settings import get_hatchify_settings
+
+settings = get_hatchify_settings()
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ToolHttpClientManager:
+    """
+    全局工具 HTTP 客户端（单例模式）
+
+    客户端绑定创建时的事件循环，只应在服务的主事件循环中使用
+    """
+
+    _client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            client_settings = settings.tool_http_client
+            limits = httpx.Limits(
+                max_connections=client_settings.max_connections,
+                max_keepalive_connections=client_settings.max_keepalive_connections,
+                keepalive_expiry=client_settings.keepalive_expiry,
+            )
+            cls._client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    retries=client_settings.retries,
+                    limits=limits,
+                    http2=client_settings.http2 and _HTTP2_AVAILABLE,
+                ),
+                timeout=httpx.Timeout(client_settings.timeout, connect=client_settings.connect_timeout),
+            )
+        return cls._client
+
+    @classmethod
+    async def async_close_all(cls) -> None:
+        client, cls._client = cls._client, None
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,259 @@
+"""
+into_md 转换结果缓存
+
+- 按规范化后的 URL 缓存 Markdown：内存 LRU（条目数 + 字节上限）-> 本地磁盘目录（字节上限）
+- TTL 内直接命中；过期后携带 If-None-Match / If-Modified-Since 重新校验，304 时续期
+- 重新校验失败时返回过期内容（stale-if-error），没有缓存时抛出原始异常
+- 同一 URL 的并发 miss 只请求一次
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Dict, Optional, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import aiofiles
+import aiofiles.os
+from loguru import logger
+
+from hatchify.common.settings.settings import get_hatchify_settings
+
+settings = get_hatchify_settings()
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+@dataclass
+class MarkdownEntry:
+    url: str
+    markdown: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    # 最近一次从服务端确认的时间（epoch 秒），持久化到磁盘后重启仍可判断是否过期
+    validated_at: float
+
+    @property
+    def size(self) -> int:
+        return len(self.markdown.encode("utf-8"))
+
+
+@dataclass
+class FetchResult:
+    """
+    条件请求结果
+
+    not_modified 为 True 时其余字段可为空
+    """
+    not_modified: bool
+    markdown: str = ""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+# (etag, last_modified) -> FetchResult
+Fetcher = Callable[[Optional[str], Optional[str]], Awaitable[FetchResult]]
+
+
+def normalize_url(url: str) -> str:
+    """协议与主机小写、去掉默认端口与片段、查询参数排序，使等价 URL 命中同一缓存"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class MarkdownCache:
+    """全局 into_md 缓存（单例模式）"""
+
+    _memory: "OrderedDict[str, MarkdownEntry]" = OrderedDict()
+    _memory_bytes = 0
+    # 磁盘文件名 -> 大小，按最近使用排序；首次使用时从目录加载
+    _disk: Optional["OrderedDict[str, int]"] = None
+    _disk_bytes = 0
+    _inflight: Dict[str, asyncio.Task] = {}
+    _counters: Dict[str, int] = {"hits": 0, "misses": 0, "revalidated": 0, "refreshed": 0, "stale_served": 0}
+
+    @classmethod
+    async def get(cls, url: str, fetch: Fetcher) -> str:
+        key = normalize_url(url)
+        entry = cls._memory.get(key)
+        if entry is not None and cls._is_fresh(entry):
+            cls._memory.move_to_end(key)
+            cls._counters["hits"] += 1
+            return entry.markdown
+
+        # 加载在独立任务中进行，所有调用方通过 shield 等待：任一调用方被取消不会影响其他调用方
+        task = cls._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(cls._load(key, fetch))
+            cls._inflight[key] = task
+            task.add_done_callback(lambda t: cls._inflight.pop(key, None) if cls._inflight.get(key) is t else None)
+            # 所有调用方都已取消时避免 "exception was never retrieved"
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task)
+
+    @staticmethod
+    def _is_fresh(entry: MarkdownEntry) -> bool:
+        return time.time() - entry.validated_at < settings.into_md_cache.ttl
+
+    @classmethod
+    async def _load(cls, key: str, fetch: Fetcher) -> str:
+        entry = cls._memory.get(key) or await cls._read_disk(key)
+        if entry is not None and cls._is_fresh(entry):
+            cls._counters["hits"] += 1
+            cls._put_memory(key, entry)
+            return entry.markdown
+
+        if entry is None:
+            cls._counters["misses"] += 1
+            result = await fetch(None, None)
+        else:
+            try:
+                result = await fetch(entry.etag, entry.last_modified)
+            except Exception as e:
+                cls._counters["stale_served"] += 1
+                logger.warning(f"into_md revalidation failed, serving stale copy of {key}: {type(e).__name__}: {e}")
+                return entry.markdown
+
+        if result.not_modified and entry is not None:
+            cls._counters["revalidated"] += 1
+            entry.validated_at = time.time()
+        else:
+            if entry is not None:
+                cls._counters["refreshed"] += 1
+            entry = MarkdownEntry(
+                url=key,
+                markdown=result.markdown,
+                etag=result.etag,
+                last_modified=result.last_modified,
+                validated_at=time.time(),
+            )
+        cls._put_memory(key, entry)
+        await cls._write_disk(key, entry)
+        return entry.markdown
+
+    # ---------------- 内存层 ----------------
+
+    @classmethod
+    def _put_memory(cls, key: str, entry: MarkdownEntry) -> None:
+        cache_settings = settings.into_md_cache
+        if entry.size > cache_settings.memory_max_bytes:
+            return
+        cls._drop_memory(key)
+        cls._memory[key] = entry
+        cls._memory_bytes += entry.size
+        while cls._memory and (
+                cls._memory_bytes > cache_settings.memory_max_bytes or len(cls._memory) > cache_settings.max_entries
+        ):
+            _, evicted = cls._memory.popitem(last=False)
+            cls._memory_bytes -= evicted.size
+
+    @classmethod
+    def _drop_memory(cls, key: str) -> None:
+        if (entry := cls._memory.pop(key, None)) is not None:
+            cls._memory_bytes -= entry.size
+
+    # ---------------- 磁盘层 ----------------
+
+    @staticmethod
+    def _disk_path(name: str) -> str:
+        return os.path.join(settings.into_md_cache.disk_dir, f"{name}.json")
+
+    @classmethod
+    def _disk_index(cls) -> "Optional[OrderedDict[str, int]]":
+        disk_dir = settings.into_md_cache.disk_dir
+        if not settings.into_md_cache.disk_max_bytes:
+            return None
+        if cls._disk is None:
+            os.makedirs(disk_dir, exist_ok=True)
+            files = []
+            for entry in os.scandir(disk_dir):
+                if entry.is_file() and entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+            cls._disk = OrderedDict((name, size) for _, name, size in sorted(files))
+            cls._disk_bytes = sum(cls._disk.values())
+        return cls._disk
+
+    @classmethod
+    async def _read_disk(cls, key: str) -> Optional[MarkdownEntry]:
+        index = cls._disk_index()
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        if index is None or name not in index:
+            return None
+        try:
+            async with aiofiles.open(cls._disk_path(name), "r", encoding="utf-8") as f:
+                entry = MarkdownEntry(**json.loads(await f.read()))
+        except (OSError, ValueError, TypeError):
+            await cls._drop_disk(name)
+            return None
+        if entry.url != key:
+            return None
+        index.move_to_end(name)
+        return entry
+
+    @classmethod
+    async def _write_disk(cls, key: str, entry: MarkdownEntry) -> None:
+        index = cls._disk_index()
+        if index is None:
+            return
+        data = json.dumps(asdict(entry), ensure_ascii=False).encode("utf-8")
+        if len(data) > settings.into_md_cache.disk_max_bytes:
+            return
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        try:
+            await cls._drop_disk(name)
+            tmp = os.path.join(settings.into_md_cache.disk_dir, f"{name}.tmp")
+            async with aiofiles.open(tmp, "wb") as f:
+                await f.write(data)
+            await aiofiles.os.replace(tmp, cls._disk_path(name))
+        except OSError as e:
+            logger.warning(f"Failed to write into_md cache for {key}: {type(e).__name__}: {e}")
+            return
+
+        index[name] = len(data)
+        cls._disk_bytes += len(data)
+        while cls._disk_bytes > settings.into_md_cache.disk_max_bytes and index:
+            evicted = next(iter(index))
+            await cls._drop_disk(evicted)
+
+    @classmethod
+    async def _drop_disk(cls, name: str) -> None:
+        if cls._disk is None or (size := cls._disk.pop(name, None)) is None:
+            return
+        cls._disk_bytes -= size
+        try:
+            await aiofiles.os.remove(cls._disk_path(name))
+        except FileNotFoundError:
+            pass
+
+    # ---------------- 失效与统计 ----------------
+
+    @classmethod
+    async def invalidate(cls, url: str) -> None:
+        key = normalize_url(url)
+        cls._drop_memory(key)
+        if cls._disk is not None:
+            await cls._drop_disk(hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        total = cls._counters["hits"] + cls._counters["misses"]
+        return {
+            **cls._counters,
+            "hit_ratio": cls._counters["hits"] / total if total else 0.0,
+            "memory_bytes": cls._memory_bytes,
+            "memory_items": len(cls._memory),
+            "disk_bytes": cls._disk_bytes,
+            "disk_items": len(cls._disk or ()),
+        }
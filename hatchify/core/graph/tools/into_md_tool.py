@@ -1,5 +1,6 @@
+import asyncio
 from functools import lru_cache
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 import httpx
 from loguru import logger
@@ -7,12 +8,16 @@ from pydantic import Field, BaseModel
 from strands import tool
 from strands.tools.decorator import DecoratedFunctionTool
 
+from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.factory.tool_factory import ToolRouter
+from hatchify.core.graph.tools.http_client import ToolHttpClientManager
+from hatchify.core.graph.tools.into_md_cache import FetchResult, MarkdownCache
 from hatchify.core.manager.predefined_tool_manager import get_pre_defined_tool_configs
 
 into_md_router = ToolRouter[DecoratedFunctionTool]()
 
 pre_defined_tool_configs = get_pre_defined_tool_configs()
+settings = get_hatchify_settings()
 
 
 @lru_cache(maxsize=1)
@@ -24,6 +29,58 @@ def lazy_get_into_md_config():
     return config
 
 
+async def _fetch_markdown(url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FetchResult:
+    """通过 into.md 转换网页，携带校验器时发送条件请求"""
+    config = lazy_get_into_md_config()
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = await ToolHttpClientManager.get_client().get(
+        f"{config.base_url}/{url}",
+        headers=headers,
+        timeout=httpx.Timeout(config.timeout, connect=10.0),
+        follow_redirects=True,
+    )
+    if response.status_code == 304:
+        return FetchResult(not_modified=True)
+    response.raise_for_status()
+    return FetchResult(
+        not_modified=False,
+        markdown=response.text,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+async def convert_to_markdown(url: str) -> str:
+    """转换单个网页，启用缓存时先查缓存"""
+    if not settings.into_md_cache.enabled:
+        return (await _fetch_markdown(url)).markdown
+    return await MarkdownCache.get(url, lambda etag, last_modified: _fetch_markdown(url, etag, last_modified))
+
+
+async def convert_many_to_markdown(urls: List[str]) -> List[Dict[str, Any]]:
+    """
+    并发转换多个网页，并发数由 into_md_cache.batch_concurrency 限制
+
+    单个 URL 失败不影响其他 URL，结果按输入顺序返回
+    """
+    semaphore = asyncio.Semaphore(settings.into_md_cache.batch_concurrency)
+
+    async def convert(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"url": url, "status": "success", "markdown": await convert_to_markdown(url)}
+            except Exception as e:
+                logger.error(f"into_md conversion failed for {url}: {type(e).__name__}: {e}")
+                return {"url": url, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    return list(await asyncio.gather(*(convert(url) for url in urls)))
+
+
 class IntoMdInputSchema(BaseModel):
     url: str = Field(
         description=(
@@ -60,16 +117,7 @@ async def into_md(url: str) -> Dict[str, Any]:
         httpx.HTTPError: If HTTP request fails
     """
     try:
-        config = lazy_get_into_md_config()
-        into_md_url = f"{config.base_url}/{url}"
-
-        timeout = httpx.Timeout(config.timeout, connect=10.0)
-
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            response = await client.get(into_md_url)
-            response.raise_for_status()
-
-            markdown_content = response.text
+        markdown_content = await convert_to_markdown(url)
 
         logger.info(f"Successfully converted URL to markdown: {url}")
         return {
@@ -91,4 +139,52 @@ async def into_md(url: str) -> Dict[str, Any]:
         raise e
 
 
+class IntoMdBatchInputSchema(BaseModel):
+    urls: List[str] = Field(
+        description=(
+            "The URLs of the webpages to convert to markdown. "
+            "Each must be a valid HTTP or HTTPS URL."
+        ),
+        min_length=1,
+        max_length=50
+    )
+
+
+@tool(
+    name="into_md_batch",
+    description=(
+        "Converts multiple webpages into LLM-friendly markdown format concurrently. "
+        "Use this tool instead of calling into_md repeatedly when you need to read several webpages. "
+        "Returns one markdown block per URL in input order; failed URLs are reported individually."
+    ),
+    inputSchema=IntoMdBatchInputSchema.model_json_schema()
+)
+async def into_md_batch(urls: List[str]) -> Dict[str, Any]:
+    """
+    Convert multiple webpages to LLM-friendly markdown using into.md service.
+
+    Args:
+        urls: The URLs of the webpages to convert
+
+    Returns:
+        Dict[str, Any]: Response with one content block per URL
+    """
+    results = await convert_many_to_markdown(urls)
+    failed = sum(1 for result in results if result["status"] != "success")
+    logger.info(f"Converted {len(results) - failed}/{len(results)} URLs to markdown")
+    return {
+        "status": "success" if failed < len(results) else "error",
+        "content": [
+            {
+                "text": (
+                    f"# {result['url']}\n\n{result['markdown']}"
+                    if result["status"] == "success"
+                    else f"# {result['url']}\n\nFailed to convert: {result['error']}"
+                )
+            } for result in results
+        ]
+    }
+
+
 into_md_router.register(into_md)
+into_md_router.register(into_md_batch)
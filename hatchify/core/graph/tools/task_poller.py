@@ -0,0 +1,232 @@
+"""
+长耗时生成任务的异步轮询引擎（预定义工具共用）
+
+- 同步 SDK 调用通过有界线程池执行（run_sync），不阻塞事件循环
+- 所有未完成的任务由同一个调度协程统一轮询：按各自的下一次轮询时间排序，到期时并发查询
+- 轮询间隔自适应：状态未变化时按倍数退避到上限，状态变化后回到初始间隔，并加入随机抖动
+- 查询出错时按同样的退避重试，连续失败超过上限才判定失败
+- 等待方被取消或超时时任务从调度中移除，并在后台调用 on_cancel（如取消远端任务）
+"""
+import asyncio
+import functools
+import heapq
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+from hatchify.common.settings.settings import get_hatchify_settings
+
+settings = get_hatchify_settings()
+
+T = TypeVar("T")
+
+
+@dataclass
+class _PollJob:
+    name: str
+    fetch: Callable[[], Any]
+    resolve: Callable[[Any], Tuple[bool, Any]]
+    status: Callable[[Any], Any]
+    future: asyncio.Future
+    interval: float
+    last_status: Any = None
+    errors: int = 0
+    polls: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+
+class TaskPoller:
+    """
+    全局任务轮询器（单例模式）
+
+    调度协程在有任务时按需启动，所有任务完成后自动退出
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _heap: List[Tuple[float, int, _PollJob]] = []
+    _counter = itertools.count()
+    _wakeup: Optional[asyncio.Event] = None
+    _scheduler: Optional[asyncio.Task] = None
+    _inflight: set = set()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=settings.task_poller.max_workers,
+                thread_name_prefix="TaskPoller",
+            )
+        return cls._executor
+
+    @classmethod
+    async def run_sync(cls, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """在线程池中执行同步 SDK 调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cls._get_executor(), functools.partial(func, *args, **kwargs))
+
+    @classmethod
+    async def wait(
+            cls,
+            name: str,
+            fetch: Callable[[], Any],
+            resolve: Callable[[Any], Tuple[bool, Any]],
+            *,
+            status: Callable[[Any], Any] = lambda snapshot: None,
+            timeout: Optional[float] = None,
+            on_cancel: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        轮询直到任务完成
+
+        Args:
+            name: 任务名称（日志）
+            fetch: 同步的查询函数，在线程池中执行，返回任务快照
+            resolve: 根据快照返回 (是否完成, 结果)；抛出异常表示任务失败
+            status: 从快照中取出状态，状态变化时轮询间隔重置为初始值
+            timeout: 超时时间（秒），默认使用 task_poller.timeout
+            on_cancel: 等待被取消或超时时调用的同步函数
+
+        Raises:
+            TimeoutError: 超时
+        """
+        poller_settings = settings.task_poller
+        job = _PollJob(
+            name=name,
+            fetch=fetch,
+            resolve=resolve,
+            status=status,
+            future=asyncio.get_running_loop().create_future(),
+            interval=poller_settings.initial_interval,
+        )
+        cls._schedule(job, poller_settings.initial_interval)
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(job.future), timeout=timeout if timeout is not None else poller_settings.timeout
+            )
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # 调度协程看到 future 已结束后会丢弃该任务
+            if not job.future.done():
+                job.future.cancel()
+            if on_cancel is not None:
+                cls._fire_and_forget(name, on_cancel)
+            raise
+
+    @classmethod
+    def _fire_and_forget(cls, name: str, func: Callable[[], Any]) -> None:
+        async def run() -> None:
+            try:
+                await cls.run_sync(func)
+            except Exception as e:
+                logger.warning(f"Cancel callback for {name} failed: {type(e).__name__}: {e}")
+
+        task = asyncio.create_task(run())
+        cls._inflight.add(task)
+        task.add_done_callback(cls._inflight.discard)
+
+    @classmethod
+    def _schedule(cls, job: _PollJob, delay: float) -> None:
+        jitter = settings.task_poller.jitter
+        delay *= 1 + random.uniform(-jitter, jitter)
+        heapq.heappush(cls._heap, (time.monotonic() + delay, next(cls._counter), job))
+
+        if cls._wakeup is None:
+            cls._wakeup = asyncio.Event()
+        cls._wakeup.set()
+        if cls._scheduler is None or cls._scheduler.done():
+            cls._scheduler = asyncio.create_task(cls._run())
+
+    @classmethod
+    async def _run(cls) -> None:
+        while cls._heap:
+            due_at = cls._heap[0][0]
+            delay = due_at - time.monotonic()
+            if delay > 0:
+                cls._wakeup.clear()
+                try:
+                    # 新任务可能比当前最早的任务更早到期
+                    await asyncio.wait_for(cls._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.monotonic()
+            while cls._heap and cls._heap[0][0] <= now:
+                _, _, job = heapq.heappop(cls._heap)
+                if job.future.done():
+                    continue
+                task = asyncio.create_task(cls._poll(job))
+                cls._inflight.add(task)
+                task.add_done_callback(cls._inflight.discard)
+
+    @classmethod
+    async def _poll(cls, job: _PollJob) -> None:
+        poller_settings = settings.task_poller
+        job.polls += 1
+        try:
+            snapshot = await cls.run_sync(job.fetch)
+        except Exception as e:
+            job.errors += 1
+            if job.errors > poller_settings.max_consecutive_errors:
+                if not job.future.done():
+                    job.future.set_exception(e)
+                return
+            logger.warning(f"Polling {job.name} failed ({job.errors}): {type(e).__name__}: {e}")
+            job.interval = min(job.interval * poller_settings.backoff_factor, poller_settings.max_interval)
+            cls._schedule(job, job.interval)
+            return
+
+        job.errors = 0
+        if job.future.done():
+            return
+        try:
+            done, value = job.resolve(snapshot)
+        except Exception as e:
+            job.future.set_exception(e)
+            return
+        if done:
+            logger.info(
+                f"{job.name} finished after {job.polls} polls in {time.monotonic() - job.started_at:.1f}s"
+            )
+            job.future.set_result(value)
+            return
+
+        current_status = job.status(snapshot)
+        if current_status != job.last_status:
+            job.last_status = current_status
+            job.interval = poller_settings.initial_interval
+        else:
+            job.interval = min(job.interval * poller_settings.backoff_factor, poller_settings.max_interval)
+        cls._schedule(job, job.interval)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        return {
+            "pending": sum(1 for _, _, job in cls._heap if not job.future.done()),
+            "inflight": len(cls._inflight),
+        }
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """取消所有等待中的任务并关闭线程池"""
+        if cls._scheduler is not None:
+            cls._scheduler.cancel()
+            try:
+                await cls._scheduler
+            except asyncio.CancelledError:
+                pass
+            cls._scheduler = None
+        for _, _, job in cls._heap:
+            if not job.future.done():
+                job.future.cancel()
+        cls._heap.clear()
+        for task in list(cls._inflight):
+            task.cancel()
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
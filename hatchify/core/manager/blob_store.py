@@ -0,0 +1,272 @@
+"""
+内容寻址的二进制存储
+
+在 storage_client 之上按 SHA-256 去重：
+- 对象 key 为 blobs/{sha[:2]}/{sha}，内容相同的上传文件、会话媒体只保存一份，已存在时跳过上传
+- 引用记录在 blob_ref 表中（每个 owner 一行，引用计数即行数），执行/会话/Graph 删除时释放
+- 后台 GC 回收没有任何引用且超过宽限期的对象；同一内容的写入与回收在进程内按 sha256 串行，
+  避免 GC 删除对象时恰好有写入重新登记同一内容
+"""
+import asyncio
+import hashlib
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterable, AsyncIterator, Optional, Tuple
+
+import aiofiles.tempfile
+from loguru import logger
+from sqlalchemy import delete, exists, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from hatchify.business.db.session import AsyncSessionLocal
+from hatchify.business.models.blob import BlobTable, BlobRefTable
+from hatchify.common.extensions.ext_storage import storage_client
+from hatchify.common.settings.settings import get_hatchify_settings
+
+settings = get_hatchify_settings()
+
+
+@dataclass(frozen=True)
+class BlobInfo:
+    key: str
+    sha256: str
+    size: int
+
+
+class BlobStore:
+    """
+    全局内容寻址存储（单例模式）
+
+    进程内记录最近确认过的对象与引用，重复写入同一内容时不再访问数据库
+    """
+
+    # sha256 -> 最近一次确认存在并刷新 touched_at 的时间（monotonic）
+    _touched: "OrderedDict[str, float]" = OrderedDict()
+    # (sha256, owner) -> None
+    _refs: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+    # sha256 -> 锁，无人持有时自动释放
+    _locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    _gc_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def blob_key(sha256: str) -> str:
+        return f"blobs/{sha256[:2]}/{sha256}"
+
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value=None) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > settings.blob_store.known_cache_size:
+            cache.popitem(last=False)
+
+    @classmethod
+    def _lock(cls, sha256: str) -> asyncio.Lock:
+        lock = cls._locks.get(sha256)
+        if lock is None:
+            lock = cls._locks[sha256] = asyncio.Lock()
+        return lock
+
+    @classmethod
+    async def _claim(cls, sha256: str) -> bool:
+        """对象已存在时刷新 touched_at 并返回 True，调用方据此跳过上传"""
+        touched = cls._touched.get(sha256)
+        # 距上次刷新不足半个宽限期时，GC 不可能回收它，无需访问数据库
+        if touched is not None and time.monotonic() - touched < settings.blob_store.gc_grace_seconds / 2:
+            return True
+
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                update(BlobTable)
+                .where(BlobTable.sha256 == sha256)
+                .values(touched_at=datetime.now(timezone.utc))
+            )
+            await session.commit()
+        if result.rowcount:
+            cls._remember(cls._touched, sha256, time.monotonic())
+            return True
+        cls._touched.pop(sha256, None)
+        return False
+
+    @classmethod
+    async def _register(cls, sha256: str, key: str, size: int, mimetype: str) -> None:
+        now = datetime.now(timezone.utc)
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(BlobTable).values(
+                    sha256=sha256, key=key, size=size, mime=mimetype, created_at=now, touched_at=now,
+                ))
+                await session.commit()
+        except IntegrityError:
+            # 并发写入了相同内容
+            pass
+        cls._remember(cls._touched, sha256, time.monotonic())
+
+    @classmethod
+    async def put(
+            cls,
+            data: bytes,
+            mimetype: str = 'application/octet-stream',
+            owner: Optional[str] = None,
+            graph_id: Optional[str] = None,
+            sha256: Optional[str] = None,
+    ) -> BlobInfo:
+        """写入内存中的二进制内容，内容已存在时只登记引用"""
+        sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        key = cls.blob_key(sha256)
+        async with cls._lock(sha256):
+            if not await cls._claim(sha256):
+                await storage_client.save(key=key, data=data, mimetype=mimetype)
+                await cls._register(sha256, key, len(data), mimetype)
+        if owner:
+            await cls.add_ref(sha256, owner, graph_id or "")
+        return BlobInfo(key=key, sha256=sha256, size=len(data))
+
+    @classmethod
+    async def put_stream(
+            cls,
+            chunks: AsyncIterable[bytes],
+            mimetype: str = 'application/octet-stream',
+            owner: Optional[str] = None,
+            graph_id: Optional[str] = None,
+            chunk_size: int = 1024 * 1024,
+    ) -> BlobInfo:
+        """
+        流式写入：先边读边计算哈希并缓冲到临时文件（超过 spool_max_memory 落盘），
+        内容已存在时直接丢弃缓冲，否则从缓冲流式上传
+        """
+        digest = hashlib.sha256()
+        size = 0
+        async with aiofiles.tempfile.SpooledTemporaryFile(max_size=settings.blob_store.spool_max_memory) as spool:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                await spool.write(chunk)
+
+            sha256 = digest.hexdigest()
+            key = cls.blob_key(sha256)
+            async with cls._lock(sha256):
+                if not await cls._claim(sha256):
+                    await spool.seek(0)
+
+                    async def replay() -> AsyncIterator[bytes]:
+                        while chunk := await spool.read(chunk_size):
+                            yield chunk
+
+                    await storage_client.save_stream(key=key, chunks=replay(), mimetype=mimetype)
+                    await cls._register(sha256, key, size, mimetype)
+
+        if owner:
+            await cls.add_ref(sha256, owner, graph_id or "")
+        return BlobInfo(key=key, sha256=sha256, size=size)
+
+    @classmethod
+    async def add_ref(cls, sha256: str, owner: str, graph_id: str = "") -> None:
+        """登记引用，同一 (blob, owner) 只记一次"""
+        if (sha256, owner) in cls._refs:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(insert(BlobRefTable).values(
+                    sha256=sha256, owner=owner, graph_id=graph_id, created_at=datetime.now(timezone.utc),
+                ))
+                await session.commit()
+        except IntegrityError:
+            pass
+        cls._remember(cls._refs, (sha256, owner))
+
+    @classmethod
+    async def release(cls, owner: Optional[str] = None, graph_id: Optional[str] = None) -> int:
+        """
+        释放 owner（或某个 Graph 下全部 owner）持有的引用，宽限期从释放时开始计算
+
+        Returns:
+            释放的引用数
+        """
+        if owner is None and graph_id is None:
+            raise ValueError("owner or graph_id is required")
+        condition = BlobRefTable.owner == owner if owner is not None else BlobRefTable.graph_id == graph_id
+
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(BlobTable)
+                .where(BlobTable.sha256.in_(select(BlobRefTable.sha256).where(condition)))
+                .values(touched_at=datetime.now(timezone.utc))
+            )
+            owners = (await session.execute(select(BlobRefTable.owner).where(condition).distinct())).scalars().all()
+            result = await session.execute(delete(BlobRefTable).where(condition))
+            await session.commit()
+
+        released = set(owners)
+        for ref in [ref for ref in cls._refs if ref[1] in released]:
+            del cls._refs[ref]
+        return result.rowcount or 0
+
+    @classmethod
+    async def gc(cls, limit: int = 500) -> int:
+        """
+        回收没有引用且 touched_at 早于宽限期的对象
+
+        逐个对象持有 sha256 锁：先删除数据库记录（删除条件中再次确认无引用），提交成功后立即删除存储中的对象，
+        期间同一内容的写入会等待，随后重新上传并登记，不会被这里删除
+
+        Returns:
+            回收的对象数
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.blob_store.gc_grace_seconds)
+        unreferenced = ~exists().where(BlobRefTable.sha256 == BlobTable.sha256)
+
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(BlobTable.sha256, BlobTable.key)
+                .where(BlobTable.touched_at < cutoff, unreferenced)
+                .limit(limit)
+            )).all()
+
+        removed = 0
+        for sha256, key in rows:
+            async with cls._lock(sha256):
+                async with AsyncSessionLocal() as session:
+                    result = await session.execute(
+                        delete(BlobTable).where(BlobTable.sha256 == sha256, BlobTable.touched_at < cutoff, unreferenced)
+                    )
+                    await session.commit()
+                if not result.rowcount:
+                    continue
+                cls._touched.pop(sha256, None)
+                removed += 1
+                try:
+                    await storage_client.delete(key)
+                except Exception as e:
+                    logger.error(f"Failed to delete blob {key}: {type(e).__name__}: {e}")
+        return removed
+
+    @classmethod
+    async def start(cls) -> None:
+        """启动后台 GC 任务"""
+        if cls._gc_task is None:
+            cls._gc_task = asyncio.create_task(cls._gc_loop())
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        if cls._gc_task is None:
+            return
+        cls._gc_task.cancel()
+        try:
+            await cls._gc_task
+        except asyncio.CancelledError:
+            pass
+        cls._gc_task = None
+
+    @classmethod
+    async def _gc_loop(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.blob_store.gc_interval)
+            try:
+                removed = await cls.gc()
+                if removed:
+                    logger.info(f"Blob GC removed {removed} unreferenced blobs")
+            except Exception as e:
+                logger.error(f"Blob GC failed: {type(e).__name__}: {e}")
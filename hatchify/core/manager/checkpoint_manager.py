@@ -0,0 +1,336 @@
+"""
+Graph 执行检查点
+
+进程在执行中途退出时，已完成节点的结果不再丢失：
+- 提交时保存执行快照（GraphSpec + 输入），每个节点完成后保存其 structured_output
+- 恢复时按快照重建 Graph，把已完成节点的结果写回 GraphState，从前沿节点继续执行
+- strands 自带的 session 恢复会丢失 structured_output，下游节点与条件边都依赖它，因此由这里单独保存
+- 执行成功或 Graph 删除时立即清理；其余（失败、取消）的检查点保留 retention_seconds 供手动恢复，由后台任务回收
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Type
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from strands.agent import AgentResult
+from strands.multiagent.base import NodeResult, Status
+from strands.multiagent.graph import Graph, GraphState
+from strands.telemetry.metrics import EventLoopMetrics
+from strands.types.content import ContentBlock, Message
+from strands.types.event_loop import Metrics, Usage
+
+from hatchify.business.db.session import AsyncSessionLocal
+from hatchify.business.models.checkpoint import ExecutionSnapshotTable, NodeCheckpointTable
+from hatchify.business.models.execution import ExecutionTable
+from hatchify.common.domain.entity.graph_execute_data import GraphExecuteData
+from hatchify.common.domain.entity.graph_spec import GraphSpec
+from hatchify.common.domain.enums.execution_status import ExecutionStatus
+from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.graph.compiled_graph import CompiledGraph
+
+settings = get_hatchify_settings()
+
+
+@dataclass
+class NodeCheckpoint:
+    node_id: str
+    structured_output: Optional[str]
+    text: str
+    execution_time: int
+
+
+@dataclass
+class ExecutionCheckpoint:
+    execution_id: str
+    graph_id: str
+    graph_spec: GraphSpec
+    execute_data: GraphExecuteData
+    # 按完成顺序排列
+    nodes: List[NodeCheckpoint] = field(default_factory=list)
+
+
+class CheckpointManager:
+    """全局执行检查点管理器（单例模式）"""
+
+    _purge_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def save_snapshot(
+            cls,
+            execution_id: str,
+            graph_id: str,
+            graph_spec: GraphSpec,
+            execute_data: GraphExecuteData,
+    ) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                insert(ExecutionSnapshotTable).values(
+                    execution_id=execution_id,
+                    graph_id=graph_id,
+                    graph_spec=graph_spec.model_dump_json(),
+                    input=execute_data.model_dump_json(),
+                    created_at=datetime.now(timezone.utc),
+                )
+            )
+            await session.commit()
+
+    @classmethod
+    async def save_node(cls, execution_id: str, node_id: str, node_result: NodeResult) -> None:
+        """保存已完成节点的输出；失败只记录日志，不影响执行"""
+        agent_results = node_result.get_agent_results()
+        structured_output = next(
+            (r.structured_output for r in reversed(agent_results) if r.structured_output is not None),
+            None,
+        )
+        values = dict(
+            structured_output=structured_output.model_dump_json() if structured_output is not None else None,
+            text=str(agent_results[-1]) if agent_results else "",
+            execution_time=node_result.execution_time,
+        )
+        try:
+            async with AsyncSessionLocal() as session:
+                try:
+                    await session.execute(
+                        insert(NodeCheckpointTable).values(execution_id=execution_id, node_id=node_id, **values)
+                    )
+                    await session.commit()
+                except IntegrityError:
+                    # 节点被再次执行（环）时覆盖输出，保留首次完成的顺序
+                    await session.rollback()
+                    await session.execute(
+                        update(NodeCheckpointTable).where(
+                            NodeCheckpointTable.execution_id == execution_id,
+                            NodeCheckpointTable.node_id == node_id,
+                        ).values(**values)
+                    )
+                    await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to checkpoint node {node_id} of {execution_id}: {type(e).__name__}: {e}")
+
+    @classmethod
+    async def load(cls, execution_id: str) -> Optional[ExecutionCheckpoint]:
+        """没有执行快照时返回 None"""
+        async with AsyncSessionLocal() as session:
+            snapshot = await session.get(ExecutionSnapshotTable, execution_id)
+            if snapshot is None:
+                return None
+            rows = (await session.execute(
+                select(NodeCheckpointTable)
+                .where(NodeCheckpointTable.execution_id == execution_id)
+                .order_by(NodeCheckpointTable.id)
+            )).scalars().all()
+
+        return ExecutionCheckpoint(
+            execution_id=execution_id,
+            graph_id=snapshot.graph_id,
+            graph_spec=GraphSpec.model_validate_json(snapshot.graph_spec),
+            execute_data=GraphExecuteData.model_validate_json(snapshot.input),
+            nodes=[
+                NodeCheckpoint(
+                    node_id=row.node_id,
+                    structured_output=row.structured_output,
+                    text=row.text,
+                    execution_time=row.execution_time,
+                )
+                for row in rows
+            ],
+        )
+
+    @classmethod
+    async def delete(cls, execution_id: str) -> None:
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    delete(NodeCheckpointTable).where(NodeCheckpointTable.execution_id == execution_id)
+                )
+                await session.execute(
+                    delete(ExecutionSnapshotTable).where(ExecutionSnapshotTable.execution_id == execution_id)
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to delete checkpoints of {execution_id}: {type(e).__name__}: {e}")
+
+    @classmethod
+    async def delete_by_graph(cls, graph_id: str) -> int:
+        """
+        删除某个 Graph 下全部执行的检查点（Graph 删除后输入文件已释放，快照无法再恢复）
+
+        Returns:
+            删除的执行快照数
+        """
+        async with AsyncSessionLocal() as session:
+            execution_ids = select(ExecutionSnapshotTable.execution_id).where(
+                ExecutionSnapshotTable.graph_id == graph_id
+            )
+            await session.execute(
+                delete(NodeCheckpointTable).where(NodeCheckpointTable.execution_id.in_(execution_ids))
+            )
+            result = await session.execute(
+                delete(ExecutionSnapshotTable).where(ExecutionSnapshotTable.graph_id == graph_id)
+            )
+            await session.commit()
+        return result.rowcount or 0
+
+    @classmethod
+    async def purge_expired(cls, limit: int = 500) -> int:
+        """
+        回收超过 retention_seconds 且执行不在 RUNNING / PENDING 状态（失败、取消或执行记录已删除）的检查点
+
+        Returns:
+            删除的执行快照数
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.execution_recovery.retention_seconds)
+        active = select(ExecutionTable.id).where(
+            ExecutionTable.status.in_([ExecutionStatus.RUNNING, ExecutionStatus.PENDING])
+        )
+        async with AsyncSessionLocal() as session:
+            expired = (await session.execute(
+                select(ExecutionSnapshotTable.execution_id)
+                .where(
+                    ExecutionSnapshotTable.created_at < cutoff,
+                    ExecutionSnapshotTable.execution_id.not_in(active),
+                )
+                .limit(limit)
+            )).scalars().all()
+            if not expired:
+                return 0
+            await session.execute(delete(NodeCheckpointTable).where(NodeCheckpointTable.execution_id.in_(expired)))
+            await session.execute(
+                delete(ExecutionSnapshotTable).where(ExecutionSnapshotTable.execution_id.in_(expired))
+            )
+            await session.commit()
+        return len(expired)
+
+    @classmethod
+    async def start(cls) -> None:
+        """启动后台回收任务（启动时先回收一次）"""
+        if cls._purge_task is None:
+            cls._purge_task = asyncio.create_task(cls._purge_loop())
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        if cls._purge_task is None:
+            return
+        cls._purge_task.cancel()
+        try:
+            await cls._purge_task
+        except asyncio.CancelledError:
+            pass
+        cls._purge_task = None
+
+    @classmethod
+    async def _purge_loop(cls) -> None:
+        while True:
+            try:
+                removed = await cls.purge_expired()
+                if removed:
+                    logger.info(f"Purged checkpoints of {removed} expired executions")
+            except Exception as e:
+                logger.error(f"Checkpoint purge failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(settings.execution_recovery.purge_interval)
+
+    @staticmethod
+    def _output_models(compiled_graph: CompiledGraph) -> Dict[str, Type[BaseModel]]:
+        output_models: Dict[str, Type[BaseModel]] = {
+            node.name: node.structured_output_model
+            for node in compiled_graph.agents
+            if node.structured_output_model is not None
+        }
+        for node in compiled_graph.functions:
+            output_models[node.name] = node.tool._metadata.type_hints["return"]
+        return output_models
+
+    @classmethod
+    def restore(
+            cls,
+            graph: Graph,
+            compiled_graph: CompiledGraph,
+            checkpoint: ExecutionCheckpoint,
+            task: List[ContentBlock],
+    ) -> List[str]:
+        """
+        将检查点写回刚创建的 Graph 实例，下一次 stream_async 从前沿节点继续执行
+
+        前沿节点：未完成、且至少有一条来自已完成节点并满足条件的入边；没有已完成节点时为入口节点。
+        环中已完成、需要再次执行的节点不会被重新调度。
+
+        Returns:
+            前沿节点 ID 列表，为空表示所有可达节点都已完成
+        """
+        output_models = cls._output_models(compiled_graph)
+        results: Dict[str, NodeResult] = {}
+        for node in checkpoint.nodes:
+            if node.node_id not in graph.nodes:
+                continue
+            output_model = output_models.get(node.node_id)
+            structured_output = None
+            if output_model is not None and node.structured_output is not None:
+                structured_output = output_model.model_validate_json(node.structured_output)
+            results[node.node_id] = NodeResult(
+                result=AgentResult(
+                    stop_reason="end_turn",
+                    message=Message(
+                        role="assistant",
+                        content=[ContentBlock(text=node.structured_output or node.text)],
+                    ),
+                    metrics=EventLoopMetrics(),
+                    state=Status.COMPLETED.value,
+                    structured_output=structured_output,
+                ),
+                execution_time=node.execution_time,
+                status=Status.COMPLETED,
+                accumulated_usage=Usage(inputTokens=0, outputTokens=0, totalTokens=0),
+                accumulated_metrics=Metrics(latencyMs=node.execution_time),
+                execution_count=1,
+            )
+
+        state = GraphState(
+            status=Status.EXECUTING,
+            task=task,
+            total_nodes=len(graph.nodes),
+            edges=[(edge.from_node, edge.to_node) for edge in graph.edges],
+            entry_points=list(graph.entry_points),
+            start_time=time.time(),
+        )
+        state.results = results
+        for node_id in results:
+            graph_node = graph.nodes[node_id]
+            graph_node.execution_status = Status.COMPLETED
+            state.completed_nodes.add(graph_node)
+            state.execution_order.append(graph_node)
+        # 覆盖 SessionManager 在 Graph 初始化时可能恢复的状态
+        for node_id, graph_node in graph.nodes.items():
+            if node_id not in results:
+                graph_node.reset_executor_state()
+        graph.state = state
+
+        if results:
+            frontier = []
+            for node_id in graph.nodes:
+                if node_id in results:
+                    continue
+                for edge in compiled_graph.edges:
+                    if edge.to_node != node_id or edge.from_node not in results:
+                        continue
+                    try:
+                        traverse = edge.condition is None or edge.condition(state)
+                    except Exception as e:
+                        logger.warning(
+                            f"Edge {edge.from_node} -> {edge.to_node} condition failed on resume: "
+                            f"{type(e).__name__}: {e}"
+                        )
+                        traverse = False
+                    if traverse:
+                        frontier.append(node_id)
+                        break
+        else:
+            frontier = [node.node_id for node in graph.entry_points]
+
+        graph._resume_next_nodes = [graph.nodes[node_id] for node_id in frontier]
+        graph._resume_from_session = True
+        return frontier
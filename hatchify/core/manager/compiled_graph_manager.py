@@ -0,0 +1,102 @@
+"""
+CompiledGraph 缓存管理器
+
+按 GraphSpec 内容哈希 + 工具/函数/模型注册表指纹缓存编译后的 Graph 模板：
+- 同一个 Graph 的多次 webhook 调用只编译一次（工具校验、LLM Model、条件闭包）
+- 每次执行通过 DynamicGraphBuilder.instantiate() 获取带有新状态的 Graph 实例
+- LRU 淘汰，容量由 settings.graph_cache.max_size 控制
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any
+
+from loguru import logger
+
+from hatchify.common.domain.entity.graph_spec import GraphSpec
+from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.graph.compiled_graph import CompiledGraph
+from hatchify.core.graph.dynamic_graph_builder import DynamicGraphBuilder
+from hatchify.core.manager.model_card_manager import model_card_manager
+
+settings = get_hatchify_settings()
+
+
+class CompiledGraphManager:
+    """
+    全局 CompiledGraph LRU 缓存（单例模式）
+    """
+
+    _cache: "OrderedDict[str, CompiledGraph]" = OrderedDict()
+    _lock = threading.Lock()
+    _hits: int = 0
+    _misses: int = 0
+
+    @staticmethod
+    def make_key(builder: DynamicGraphBuilder, graph_spec: GraphSpec) -> str:
+        """计算缓存键：GraphSpec 规范化 JSON + 注册表指纹"""
+        spec_json = json.dumps(
+            graph_spec.model_dump(mode="json"),
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        registry_fingerprint = (
+            f"{id(builder.tool_router)}:{builder.tool_router.version}|"
+            f"{id(builder.function_router)}:{builder.function_router.version}|"
+            f"{model_card_manager.fingerprint}"
+        )
+        return hashlib.sha256(f"{spec_json}#{registry_fingerprint}".encode("utf-8")).hexdigest()
+
+    @classmethod
+    def get_or_compile(cls, builder: DynamicGraphBuilder, graph_spec: GraphSpec) -> CompiledGraph:
+        """获取缓存的 CompiledGraph，不存在则使用 builder 编译并写入缓存"""
+        if not settings.graph_cache.enabled:
+            return builder.compile_graph(graph_spec)
+
+        key = cls.make_key(builder, graph_spec)
+        with cls._lock:
+            compiled_graph = cls._cache.get(key)
+            if compiled_graph is not None:
+                cls._cache.move_to_end(key)
+                cls._hits += 1
+                return compiled_graph
+            cls._misses += 1
+
+        # 编译在锁外进行，并发 miss 时最多重复编译一次，结果等价
+        compiled_graph = builder.compile_graph(graph_spec)
+
+        with cls._lock:
+            cls._cache[key] = compiled_graph
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > settings.graph_cache.max_size:
+                evicted_key, _ = cls._cache.popitem(last=False)
+                logger.debug(f"Evicted compiled graph: {evicted_key}")
+
+        logger.debug(f"Compiled graph cached: {graph_spec.name} ({key})")
+        return compiled_graph
+
+    @classmethod
+    def build_graph(cls, builder: DynamicGraphBuilder, graph_spec: GraphSpec) -> Any:
+        """使用缓存构建一次执行使用的 Graph 实例"""
+        return builder.instantiate(cls.get_or_compile(builder, graph_spec))
+
+    @classmethod
+    def clear(cls):
+        """清空缓存"""
+        with cls._lock:
+            count = len(cls._cache)
+            cls._cache.clear()
+            logger.warning(f"Cleared all {count} compiled graphs")
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """缓存统计信息"""
+        with cls._lock:
+            return {
+                "size": len(cls._cache),
+                "max_size": settings.graph_cache.max_size,
+                "hits": cls._hits,
+                "misses": cls._misses,
+            }
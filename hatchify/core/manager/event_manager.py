@@ -2,17 +2,66 @@
 事件存储模块，用于支持 SSE 断线重连
 """
 import asyncio
+from collections.abc import Sequence
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator, Union
 
 from loguru import logger
 
 from hatchify.common.domain.event.base_event import StreamEvent
+from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.manager.event_store_backend import EventStoreBackend, MemoryEventStoreBackend
+
+settings = get_hatchify_settings()
+
+
+class EventView(Sequence):
+    """
+    EventStore 的只读零拷贝视图
+
+    创建时固定 [start, stop) 区间，之后追加的事件不会出现在视图中
+    （实时事件由订阅者通道推送，避免重放与实时重复）
+    """
+    __slots__ = ("_events", "_start", "_stop")
+
+    def __init__(self, events: List[StreamEvent], start: int, stop: int):
+        self._events = events
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return max(0, self._stop - self._start)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[StreamEvent, 'EventView']:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("EventView does not support extended slices")
+            return EventView(self._events, self._start + start, self._start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EventView index out of range")
+        return self._events[self._start + index]
+
+    def __iter__(self) -> Iterator[StreamEvent]:
+        events = self._events
+        for i in range(self._start, self._stop):
+            yield events[i]
 
 
 class EventStore:
     _stores: Dict[str, 'EventStore'] = {}
     _lock = asyncio.Lock()
+    # source_id -> 进行中的后端加载任务
+    _loading: Dict[str, asyncio.Task] = {}
+
+    # 持久化后端与后台压缩任务，由 start() / shutdown() 在应用生命周期中管理
+    _backend: EventStoreBackend = MemoryEventStoreBackend()
+    _compaction_task: Optional[asyncio.Task] = None
+    # 所有 EventStore 在内存中常驻的事件总数与 SSE 帧字节数
+    _resident_events: int = 0
+    _resident_bytes: int = 0
 
     def __init__(self, source_id: str, ttl_seconds: int = 900):
         """
@@ -24,14 +73,78 @@ class EventStore:
         """
         self.source_id = source_id
         self.events: List[StreamEvent] = []
+        # event.id -> 序号（即在 events 中的下标，单调递增）
+        self._index: Dict[str, int] = {}
         self.created_at = datetime.now()
         self.ttl_seconds = ttl_seconds
         self._completed = False
+        # 事件已溢出到后端、内存中只保留元数据
+        self._spilled = False
+        self.resident_bytes = 0
+        # 是否计入全局常驻统计（从 _stores 移除后不再计入）
+        self._tracked = True
 
     @classmethod
-    async def get_or_create(cls, source_id: str, ttl_seconds: int = 900) -> 'EventStore':
+    async def start(cls, backend: EventStoreBackend) -> None:
+        """设置持久化后端并启动 TTL 压缩任务"""
+        cls._backend = backend
+        await backend.start()
+        if cls._compaction_task is None:
+            cls._compaction_task = asyncio.create_task(cls._compaction_loop())
+        logger.info(f"EventStore started with {type(backend).__name__}")
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """停止压缩任务并写入后端缓冲区中的剩余事件"""
+        if cls._compaction_task:
+            cls._compaction_task.cancel()
+            try:
+                await cls._compaction_task
+            except asyncio.CancelledError:
+                pass
+            cls._compaction_task = None
+        await cls._backend.close()
+
+    @classmethod
+    async def _compaction_loop(cls) -> None:
+        event_store_settings = settings.event_store
+        while True:
+            await asyncio.sleep(event_store_settings.compaction_interval)
+            try:
+                await cls.cleanup_expired()
+                removed = await cls._backend.compact(event_store_settings.ttl_seconds)
+                if removed:
+                    logger.info(f"Compacted {removed} persisted stream events")
+            except Exception as e:
+                logger.error(f"EventStore compaction failed: {type(e).__name__}: {e}")
+
+    @classmethod
+    async def _load_from_backend(cls, source_id: str, ttl_seconds: int) -> Optional['EventStore']:
+        """从持久化后端恢复事件存储（重启后或由其他 worker 产生的执行）"""
+        events = await cls._backend.load(source_id)
+        if events is None:
+            return None
+        store = EventStore(source_id, ttl_seconds)
+        store._restore(events)
+        logger.debug(f"Restored EventStore for graph: {source_id} ({len(events)} events)")
+        return store
+
+    @classmethod
+    def _enforce_memory_cap(cls) -> None:
+        """常驻事件超过上限时，按创建顺序将已完成的执行溢出到持久化后端"""
+        max_memory_events = settings.event_store.max_memory_events
+        if cls._resident_events <= max_memory_events or not cls._backend.durable:
+            return
+        for store in cls._stores.values():
+            if cls._resident_events <= max_memory_events:
+                break
+            if store._completed and not store._spilled:
+                store._spill()
+
+    @classmethod
+    async def create(cls, source_id: str, ttl_seconds: int = 900) -> 'EventStore':
         """
-        获取或创建事件存储（线程安全）
+        为新提交的执行创建事件存储（execution_id 刚生成，后端中不会有历史，跳过后端查询）
 
         Args:
             source_id: 图执行 ID
@@ -41,10 +154,63 @@ class EventStore:
             EventStore 实例
         """
         async with cls._lock:
-            if source_id not in cls._stores:
+            store = cls._stores.get(source_id)
+            if store is None:
                 logger.debug(f"Creating new EventStore for graph: {source_id}")
-                cls._stores[source_id] = EventStore(source_id, ttl_seconds)
-            return cls._stores[source_id]
+                store = cls._stores[source_id] = EventStore(source_id, ttl_seconds)
+            return store
+
+    @classmethod
+    async def _lookup(cls, source_id: str, ttl_seconds: int) -> Optional['EventStore']:
+        """
+        查找事件存储，内存中没有时从后端加载
+
+        后端查询在全局锁外进行，同一 source_id 的并发查询共用一个加载任务
+        """
+        async with cls._lock:
+            store = cls._stores.get(source_id)
+            if store is not None:
+                return store
+            task = cls._loading.get(source_id)
+            if task is None:
+                task = cls._loading[source_id] = asyncio.create_task(cls._load_from_backend(source_id, ttl_seconds))
+
+        try:
+            loaded = await asyncio.shield(task)
+        except Exception:
+            async with cls._lock:
+                if cls._loading.get(source_id) is task:
+                    cls._loading.pop(source_id)
+            raise
+
+        async with cls._lock:
+            # 第一个返回的等待者负责登记；加载期间被 delete() 移除时不再登记
+            current = cls._loading.get(source_id) is task
+            if current:
+                cls._loading.pop(source_id)
+            store = cls._stores.get(source_id)
+            if store is None and loaded is not None and current:
+                store = cls._stores[source_id] = loaded
+            elif loaded is not None and loaded is not store:
+                loaded._release()
+            return store
+
+    @classmethod
+    async def get_or_create(cls, source_id: str, ttl_seconds: int = 900) -> 'EventStore':
+        """
+        获取或创建事件存储（协程安全）
+
+        Args:
+            source_id: 图执行 ID
+            ttl_seconds: 过期时间（秒）
+
+        Returns:
+            EventStore 实例
+        """
+        store = await cls._lookup(source_id, ttl_seconds)
+        if store is None:
+            store = await cls.create(source_id, ttl_seconds)
+        return store
 
     @classmethod
     async def get(cls, source_id: str) -> Optional['EventStore']:
@@ -57,8 +223,10 @@ class EventStore:
         Returns:
             EventStore 实例，如果不存在返回 None
         """
-        async with cls._lock:
-            return cls._stores.get(source_id)
+        store = await cls._lookup(source_id, settings.event_store.ttl_seconds)
+        if store is not None:
+            await store.ensure_loaded()
+        return store
 
     @classmethod
     async def delete(cls, source_id: str) -> bool:
@@ -72,8 +240,11 @@ class EventStore:
             是否删除成功
         """
         async with cls._lock:
-            if source_id in cls._stores:
-                del cls._stores[source_id]
+            cls._loading.pop(source_id, None)
+            store = cls._stores.pop(source_id, None)
+            await cls._backend.delete(source_id)
+            if store is not None:
+                store._release()
                 logger.info(f"Deleted EventStore for graph: {source_id}")
                 return True
             return False
@@ -81,9 +252,9 @@ class EventStore:
     @classmethod
     async def cleanup_expired(cls):
         """
-        清理过期的事件存储
+        清理内存中过期的事件存储（持久化的事件由后端 compact() 按 TTL 清理）
 
-        建议在定时任务中调用
+        由 TTL 压缩任务定时调用，只清理已完成的执行，运行中的执行不受 TTL 影响
         """
         async with cls._lock:
             now = datetime.now()
@@ -91,15 +262,40 @@ class EventStore:
 
             for gid, store in cls._stores.items():
                 age = now - store.created_at
-                if age > timedelta(seconds=store.ttl_seconds):
+                if store._completed and age > timedelta(seconds=store.ttl_seconds):
                     expired.append(gid)
 
             for gid in expired:
-                del cls._stores[gid]
+                cls._stores.pop(gid)._release()
 
             if expired:
                 logger.info(f"Cleaned up {len(expired)} expired EventStores: {expired}")
 
+    @classmethod
+    async def evict(cls, source_id: str) -> bool:
+        """
+        从内存中移除事件存储，不删除持久化后端中的事件
+
+        持久化后端下之后仍可通过 get() 从后端恢复，用于回收已完成执行占用的内存
+        """
+        async with cls._lock:
+            store = cls._stores.pop(source_id, None)
+            if store is None:
+                return False
+            store._release()
+            logger.debug(f"Evicted EventStore for graph: {source_id}")
+            return True
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """内存占用统计"""
+        return {
+            "stores": len(cls._stores),
+            "resident_events": cls._resident_events,
+            "resident_bytes": cls._resident_bytes,
+            "backend_dropped": getattr(cls._backend, "dropped", 0),
+        }
+
     @classmethod
     async def get_all_source_ids(cls) -> List[str]:
         """获取所有活跃的 source_id"""
@@ -113,43 +309,92 @@ class EventStore:
         Args:
             event: 图事件
         """
+        seq = len(self.events)
+        self._index[event.id] = seq
         self.events.append(event)
+        EventStore._backend.append(self.source_id, seq, event)
+        frame_size = len(event._sse_frame or b"")
+        self.resident_bytes += frame_size
+        if self._tracked:
+            EventStore._resident_events += 1
+            EventStore._resident_bytes += frame_size
 
         # 检查是否完成
         if event.type == "done":
             self._completed = True
             logger.debug(f"EventStore marked as completed for graph: {self.source_id}")
-
-    def get_after(self, last_event_id: Optional[str]) -> List[StreamEvent]:
+            EventStore._enforce_memory_cap()
+
+    def _restore(self, events: List[StreamEvent]) -> None:
+        """用后端加载的事件重建内存状态"""
+        self._replace_events(events)
+        self._completed = bool(events) and events[-1].type == "done"
+        self._spilled = False
+
+    def _spill(self) -> None:
+        """释放内存中的事件，下次访问时由 ensure_loaded() 从后端恢复"""
+        self._replace_events([])
+        self._spilled = True
+        logger.debug(f"Spilled EventStore for graph: {self.source_id}")
+
+    def _replace_events(self, events: List[StreamEvent]) -> None:
+        """替换内存中的事件并同步常驻统计"""
+        resident_bytes = sum(len(event._sse_frame or b"") for event in events)
+        if self._tracked:
+            EventStore._resident_events += len(events) - len(self.events)
+            EventStore._resident_bytes += resident_bytes - self.resident_bytes
+        self.events = events
+        self.resident_bytes = resident_bytes
+        self._index = {event.id: seq for seq, event in enumerate(events)}
+
+    def _release(self) -> None:
+        """从全局常驻统计中移除（存储已不在 _stores 中）"""
+        if self._tracked:
+            EventStore._resident_events -= len(self.events)
+            EventStore._resident_bytes -= self.resident_bytes
+            self._tracked = False
+
+    async def ensure_loaded(self) -> None:
+        """确保事件在内存中（已溢出的执行从后端重新加载）"""
+        if not self._spilled:
+            return
+        events = await EventStore._backend.load(self.source_id)
+        self._restore(events or [])
+
+    def get_sequence(self, event_id: str) -> Optional[int]:
+        """获取事件的序号，不存在返回 None"""
+        return self._index.get(event_id)
+
+    def get_after(self, last_event_id: Optional[str]) -> EventView:
         """
-        获取指定事件 ID 之后的所有事件
+        获取指定事件 ID 之后的所有事件（O(1) 定位，零拷贝视图）
 
         Args:
             last_event_id: 上次收到的事件 ID（客户端提供）
 
         Returns:
-            事件列表
+            事件视图
         """
+        total = len(self.events)
         if not last_event_id:
             # 没有提供 ID，返回所有事件
-            logger.debug(f"Returning all {len(self.events)} events (no last_event_id)")
-            return self.events.copy()
+            logger.debug(f"Returning all {total} events (no last_event_id)")
+            return EventView(self.events, 0, total)
 
         # 查找事件位置
-        for i, event in enumerate(self.events):
-            if event.id == last_event_id:
-                # 返回该事件之后的所有事件
-                remaining = self.events[i + 1:]
-                logger.debug(f"Found last_event_id at index {i}, returning {len(remaining)} events")
-                return remaining
+        index = self._index.get(last_event_id)
+        if index is not None:
+            # 返回该事件之后的所有事件
+            logger.debug(f"Found last_event_id at index {index}, returning {total - index - 1} events")
+            return EventView(self.events, index + 1, total)
 
         # ID 未找到，可能是太旧或无效，返回所有事件
-        logger.warning(f"last_event_id '{last_event_id}' not found, returning all {len(self.events)} events")
-        return self.events.copy()
+        logger.warning(f"last_event_id '{last_event_id}' not found, returning all {total} events")
+        return EventView(self.events, 0, total)
 
-    def get_all(self) -> List[StreamEvent]:
-        """获取所有事件"""
-        return self.events.copy()
+    def get_all(self) -> EventView:
+        """获取所有事件（零拷贝视图）"""
+        return EventView(self.events, 0, len(self.events))
 
     def is_completed(self) -> bool:
         """检查流是否已完成"""
@@ -169,7 +414,8 @@ class EventStore:
 
     def clear(self) -> None:
         """清空所有事件"""
-        self.events.clear()
+        # 替换而不是原地清空，已发出的 EventView 不受影响
+        self._replace_events([])
         self._completed = False
         logger.debug(f"Cleared EventStore for graph: {self.source_id}")
 
@@ -178,5 +424,6 @@ class EventStore:
             f"EventStore(source_id={self.source_id}, "
             f"events={len(self.events)}, "
             f"completed={self._completed}, "
+            f"spilled={self._spilled}, "
             f"age={datetime.now() - self.created_at})"
         )
@@ -0,0 +1,209 @@
+"""
+EventStore 持久化后端
+
+- MemoryEventStoreBackend: 不做持久化，事件只保存在进程内存中（默认）
+- SqlEventStoreBackend: 基于现有 SQLAlchemy engine 的追加日志，批量写入，
+  进程重启或请求落到其他 worker 时可从数据库恢复事件历史
+"""
+import abc
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import delete, func, insert, select
+
+from hatchify.business.db.session import AsyncSessionLocal
+from hatchify.business.models.stream_event import StreamEventTable
+from hatchify.common.domain.event.base_event import StreamEvent
+
+
+class EventStoreBackend(metaclass=abc.ABCMeta):
+    """EventStore 后端接口"""
+
+    # 是否持久化：只有持久化后端才允许将内存中的事件溢出
+    durable: bool = False
+
+    async def start(self) -> None:
+        """启动后台任务"""
+
+    async def close(self) -> None:
+        """停止后台任务并写入剩余事件"""
+
+    @abc.abstractmethod
+    def append(self, source_id: str, seq: int, event: StreamEvent) -> None:
+        """追加事件（同步、不阻塞事件循环，由后端自行缓冲）"""
+        ...
+
+    @abc.abstractmethod
+    async def load(self, source_id: str) -> Optional[List[StreamEvent]]:
+        """按序号加载事件，不存在返回 None"""
+        ...
+
+    @abc.abstractmethod
+    async def delete(self, source_id: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    async def compact(self, ttl_seconds: int) -> int:
+        """删除最后一个事件早于 ttl 的执行，返回删除的事件数"""
+        ...
+
+
+class MemoryEventStoreBackend(EventStoreBackend):
+    """纯内存后端，保持 EventStore 原有行为"""
+
+    def append(self, source_id: str, seq: int, event: StreamEvent) -> None:
+        pass
+
+    async def load(self, source_id: str) -> Optional[List[StreamEvent]]:
+        return None
+
+    async def delete(self, source_id: str) -> None:
+        pass
+
+    async def compact(self, ttl_seconds: int) -> int:
+        return 0
+
+
+class SqlEventStoreBackend(EventStoreBackend):
+    """
+    SQL 追加日志后端
+
+    append() 只写入内存缓冲区，后台任务在 flush_interval 到期或缓冲达到 flush_batch_size 时
+    以单条批量 INSERT 写入数据库，事件产生路径上没有数据库往返
+    """
+
+    durable = True
+
+    def __init__(self, flush_interval: float = 0.2, flush_batch_size: int = 256, max_buffer_events: int = 50_000):
+        self.flush_interval = flush_interval
+        self.flush_batch_size = flush_batch_size
+        self.max_buffer_events = max_buffer_events
+        self._buffer: List[Dict[str, Any]] = []
+        # 数据库不可用期间因缓冲区超限丢弃的事件数
+        self.dropped = 0
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+
+    async def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("SqlEventStoreBackend started")
+
+    async def close(self) -> None:
+        self._running = False
+        if self._wakeup:
+            self._wakeup.set()
+        if self._flush_task:
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+        logger.info("SqlEventStoreBackend closed")
+
+    def append(self, source_id: str, seq: int, event: StreamEvent) -> None:
+        self._buffer.append({
+            "source_id": source_id,
+            "seq": seq,
+            "event_id": event.id,
+            "type": event.type,
+            "frame": (event._sse_frame or b"").decode("utf-8"),
+            "created_at": datetime.now(timezone.utc),
+        })
+        self._trim()
+        if len(self._buffer) >= self.flush_batch_size and self._wakeup:
+            self._wakeup.set()
+
+    def _trim(self) -> None:
+        """数据库持续不可用时缓冲区只保留最新的 max_buffer_events 条，丢弃最旧的事件"""
+        overflow = len(self._buffer) - self.max_buffer_events
+        if overflow <= 0:
+            return
+        del self._buffer[:overflow]
+        self.dropped += overflow
+
+    async def _flush_loop(self) -> None:
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"EventStore flush failed: {type(e).__name__}: {e}")
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(StreamEventTable), rows)
+                    await session.commit()
+            except Exception:
+                # 写入失败时放回缓冲区，下一轮重试（超出上限时丢弃最旧的事件）
+                self._buffer[:0] = rows
+                dropped = self.dropped
+                self._trim()
+                if self.dropped > dropped or len(self._buffer) >= self.max_buffer_events:
+                    logger.warning(
+                        f"EventStore buffer is full ({self.max_buffer_events} events), "
+                        f"{self.dropped} oldest events dropped in total"
+                    )
+                raise
+            logger.debug(f"Flushed {len(rows)} stream events")
+
+    async def load(self, source_id: str) -> Optional[List[StreamEvent]]:
+        # 缓冲区中有该执行的事件或正在写入时先等待写入完成，保证读取到完整历史
+        if self._flush_lock.locked() or any(row["source_id"] == source_id for row in self._buffer):
+            await self.flush()
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(StreamEventTable.event_id, StreamEventTable.type, StreamEventTable.frame)
+                .where(StreamEventTable.source_id == source_id)
+                .order_by(StreamEventTable.seq)
+            )
+            rows = result.all()
+
+        if not rows:
+            return None
+
+        events: List[StreamEvent] = []
+        for event_id, event_type, frame in rows:
+            # 历史事件只用于重放，直接复用已编码的 SSE 帧
+            event = StreamEvent.model_construct(id=event_id, type=event_type, data=None)
+            event._sse_frame = frame.encode("utf-8")
+            events.append(event)
+        return events
+
+    async def delete(self, source_id: str) -> None:
+        await self.flush()
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(StreamEventTable).where(StreamEventTable.source_id == source_id))
+            await session.commit()
+
+    async def compact(self, ttl_seconds: int) -> int:
+        await self.flush()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl_seconds)
+        expired_sources = (
+            select(StreamEventTable.source_id)
+            .group_by(StreamEventTable.source_id)
+            .having(func.max(StreamEventTable.created_at) < cutoff)
+        )
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(StreamEventTable).where(StreamEventTable.source_id.in_(expired_sources))
+            )
+            await session.commit()
+        return result.rowcount or 0
@@ -0,0 +1,166 @@
+"""
+Graph 执行恢复
+
+- resume: 按执行快照重建 Graph，恢复已完成节点，从前沿节点继续执行（沿用原 execution_id 与 SSE 流地址）
+- sweep_orphaned: 启动时处理上次进程遗留的 RUNNING / PENDING 执行，可恢复的按配置自动恢复，其余标记为 FAILED
+"""
+from datetime import datetime
+from typing import Dict, List, Set
+
+from loguru import logger
+from sqlalchemy import select, update
+
+from hatchify.business.db.session import AsyncSessionLocal
+from hatchify.business.models.execution import ExecutionTable
+from hatchify.common.domain.enums.execution_status import ExecutionStatus
+from hatchify.common.domain.enums.execution_type import ExecutionType
+from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.factory.session_manager_factory import create_session_manager
+from hatchify.core.graph.dynamic_graph_builder import DynamicGraphBuilder
+from hatchify.core.graph.hooks.graph_state_hook import GraphStateHook
+from hatchify.core.manager.checkpoint_manager import CheckpointManager
+from hatchify.core.manager.compiled_graph_manager import CompiledGraphManager
+from hatchify.core.manager.event_manager import EventStore
+from hatchify.core.manager.function_manager import function_router
+from hatchify.core.manager.stream_manager import StreamManager
+from hatchify.core.manager.tool_manager import tool_factory
+from hatchify.core.stream_handler.event_listener.execution_tracker_listener import ExecutionTrackerListener
+from hatchify.core.stream_handler.graph_executor import GraphExecutor
+
+settings = get_hatchify_settings()
+
+
+class ExecutionRecoveryManager:
+    """全局执行恢复管理器（单例模式）"""
+
+    # 正在恢复（已认领、尚未注册 handler 或尚未开始执行）的 execution_id
+    _resuming: Set[str] = set()
+
+    @classmethod
+    async def resume(cls, execution_id: str) -> List[str]:
+        """
+        从检查点恢复执行
+
+        同一执行的并发恢复只有先认领的一方继续，其余在产生任何副作用（清空事件、重置状态）之前被拒绝
+
+        Returns:
+            本次继续执行的前沿节点 ID 列表
+
+        Raises:
+            ValueError: 执行不存在、不可恢复、仍在运行或正在被恢复
+        """
+        # 检查与登记之间没有 await，同一事件循环上是原子的
+        if execution_id in cls._resuming:
+            raise ValueError(f"Execution '{execution_id}' is already being resumed")
+        cls._resuming.add(execution_id)
+        try:
+            return await cls._resume(execution_id)
+        finally:
+            cls._resuming.discard(execution_id)
+
+    @classmethod
+    async def _resume(cls, execution_id: str) -> List[str]:
+        async with AsyncSessionLocal() as session:
+            execution = await session.get(ExecutionTable, execution_id)
+        if execution is None:
+            raise ValueError(f"Execution '{execution_id}' not found")
+        if execution.type != ExecutionType.WEBHOOK:
+            raise ValueError(f"Only webhook executions can be resumed, got {execution.type.value}")
+        if execution.status == ExecutionStatus.COMPLETED:
+            raise ValueError(f"Execution '{execution_id}' is already completed")
+
+        handler = await StreamManager.get(execution_id)
+        if handler is not None:
+            if handler.stream_task is not None and not handler.stream_task.done():
+                raise ValueError(f"Execution '{execution_id}' is still running")
+            await StreamManager.delete(execution_id)
+
+        checkpoint = await CheckpointManager.load(execution_id)
+        if checkpoint is None:
+            raise ValueError(f"Execution '{execution_id}' has no checkpoint")
+
+        builder = DynamicGraphBuilder(
+            tool_router=tool_factory,
+            function_router=function_router,
+            hooks=[GraphStateHook()],
+            session_manager=create_session_manager(graph_id=checkpoint.graph_id, session_id=execution_id),
+        )
+        compiled_graph = CompiledGraphManager.get_or_compile(builder, checkpoint.graph_spec)
+        graph = builder.instantiate(compiled_graph)
+
+        executor = GraphExecutor(
+            graph_id=execution_id,
+            graph=graph,
+            graph_spec=checkpoint.graph_spec,
+            listeners=[ExecutionTrackerListener()],
+            checkpoint=True,
+        )
+
+        # 重新开始的流只包含恢复后的事件，避免重连的客户端读到上一次的终止事件
+        await EventStore.delete(execution_id)
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(ExecutionTable)
+                .where(ExecutionTable.id == execution_id)
+                .values(status=ExecutionStatus.PENDING, error=None, completed_at=None)
+            )
+            await session.commit()
+
+        frontier: List[str] = []
+
+        def restore(messages):
+            frontier.extend(CheckpointManager.restore(graph, compiled_graph, checkpoint, messages))
+
+        await StreamManager.create(execution_id, executor)
+        try:
+            await executor.resume_task(checkpoint.execute_data, restore)
+        except Exception:
+            await StreamManager.delete(execution_id)
+            raise
+        logger.info(
+            f"Resumed execution {execution_id}: {len(checkpoint.nodes)} nodes restored, frontier={frontier}"
+        )
+        return frontier
+
+    @classmethod
+    async def sweep_orphaned(cls) -> Dict[str, int]:
+        """
+        处理进程重启前遗留的 RUNNING / PENDING 执行
+
+        多 worker 部署时无法区分其他 worker 正在执行的任务，只应在单个实例上运行
+        """
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(
+                select(ExecutionTable.id, ExecutionTable.type).where(
+                    ExecutionTable.status.in_([ExecutionStatus.RUNNING, ExecutionStatus.PENDING])
+                )
+            )).all()
+
+        resumed = 0
+        failed_ids: List[str] = []
+        for execution_id, execution_type in rows:
+            if settings.execution_recovery.auto_resume and execution_type == ExecutionType.WEBHOOK:
+                try:
+                    await cls.resume(execution_id)
+                    resumed += 1
+                    continue
+                except Exception as e:
+                    logger.warning(f"Failed to resume execution {execution_id}: {type(e).__name__}: {e}")
+            failed_ids.append(execution_id)
+
+        if failed_ids:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(ExecutionTable)
+                    .where(ExecutionTable.id.in_(failed_ids))
+                    .values(
+                        status=ExecutionStatus.FAILED,
+                        error="Interrupted by server restart",
+                        completed_at=datetime.now(),
+                    )
+                )
+                await session.commit()
+
+        if rows:
+            logger.info(f"Swept {len(rows)} orphaned executions: {resumed} resumed, {len(failed_ids)} marked failed")
+        return {"orphaned": len(rows), "resumed": resumed, "failed": len(failed_ids)}
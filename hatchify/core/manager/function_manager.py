@@ -8,4 +8,7 @@ from hatchify.core.graph.functions.echo_function import echo_function
 # FunctionNodeWrapper 依赖 DecoratedFunctionTool 的特性（如 input_model）
 function_router = ToolRouter[DecoratedFunctionTool]()
 
+# 确定性且开销较大的 Function 可以声明结果缓存，相同输入直接复用结果：
+# function_router.register(my_function, cache=FunctionCachePolicy(version="1", ttl=3600, persistent=True))
+
 function_router.register(echo_function)
@@ -0,0 +1,148 @@
+"""
+Function 节点结果缓存
+
+确定性的 Function 在 function_router 注册时声明缓存策略后，相同输入不再重复执行：
+- key 为 (工具名, 策略版本, 校验后输入的规范化 JSON) 的 SHA-256，修改函数逻辑时递增版本即可使旧结果失效
+- 内存 LRU（条目数 + 字节上限）-> 可选的数据库持久层（跨进程、重启后仍可命中）
+- 缓存的是输出模型的 JSON，命中时由输出模型重新校验
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+from pydantic_core import PydanticSerializationError, to_jsonable_python
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from hatchify.business.db.session import AsyncSessionLocal
+from hatchify.business.models.function_result import FunctionResultTable
+from hatchify.common.domain.entity.function_cache_policy import FunctionCachePolicy
+from hatchify.common.settings.settings import get_hatchify_settings
+
+settings = get_hatchify_settings()
+
+
+class FunctionResultCache:
+    """全局 Function 结果缓存（单例模式）"""
+
+    # key -> (结果 JSON, 过期时间（monotonic），None 表示永不过期)
+    _memory: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+    _memory_bytes = 0
+    _counters: Dict[str, int] = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "uncacheable": 0}
+
+    @classmethod
+    def make_key(cls, tool_name: str, policy: FunctionCachePolicy, validated_input: Dict[str, Any]) -> Optional[str]:
+        """输入无法规范化为 JSON 时返回 None，该次执行不使用缓存"""
+        try:
+            canonical = json.dumps(
+                [tool_name, policy.version, to_jsonable_python(validated_input, bytes_mode="base64")],
+                sort_keys=True,
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        except (PydanticSerializationError, TypeError, ValueError) as e:
+            cls._counters["uncacheable"] += 1
+            logger.debug(f"Input of function {tool_name} is not cacheable: {type(e).__name__}: {e}")
+            return None
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @classmethod
+    async def get(cls, key: str, policy: FunctionCachePolicy) -> Optional[str]:
+        if (cached := cls._memory.get(key)) is not None:
+            result, expires_at = cached
+            if expires_at is None or time.monotonic() < expires_at:
+                cls._memory.move_to_end(key)
+                cls._counters["memory_hits"] += 1
+                return result
+            cls._drop_memory(key)
+
+        if policy.persistent and settings.function_cache.persistent:
+            try:
+                async with AsyncSessionLocal() as session:
+                    row = (await session.execute(
+                        select(FunctionResultTable.result, FunctionResultTable.expires_at).where(
+                            FunctionResultTable.key == key,
+                            or_(
+                                FunctionResultTable.expires_at.is_(None),
+                                FunctionResultTable.expires_at > datetime.now(timezone.utc),
+                            ),
+                        )
+                    )).first()
+            except Exception as e:
+                logger.warning(f"Failed to read function result cache: {type(e).__name__}: {e}")
+                row = None
+            if row is not None:
+                cls._counters["persistent_hits"] += 1
+                ttl = None
+                if row.expires_at is not None:
+                    expires_at = row.expires_at if row.expires_at.tzinfo else row.expires_at.replace(tzinfo=timezone.utc)
+                    ttl = (expires_at - datetime.now(timezone.utc)).total_seconds()
+                cls._put_memory(key, row.result, ttl)
+                return row.result
+
+        cls._counters["misses"] += 1
+        return None
+
+    @classmethod
+    async def put(cls, key: str, tool_name: str, policy: FunctionCachePolicy, result: str) -> None:
+        cls._put_memory(key, result, policy.ttl)
+        if not (policy.persistent and settings.function_cache.persistent):
+            return
+
+        now = datetime.now(timezone.utc)
+        values = dict(
+            tool_name=tool_name,
+            version=policy.version,
+            result=result,
+            created_at=now,
+            expires_at=now + timedelta(seconds=policy.ttl) if policy.ttl is not None else None,
+        )
+        try:
+            async with AsyncSessionLocal() as session:
+                try:
+                    await session.execute(insert(FunctionResultTable).values(key=key, **values))
+                    await session.commit()
+                except IntegrityError:
+                    # 并发写入或已过期的旧记录
+                    await session.rollback()
+                    await session.execute(
+                        update(FunctionResultTable).where(FunctionResultTable.key == key).values(**values)
+                    )
+                    await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to write function result cache: {type(e).__name__}: {e}")
+
+    @classmethod
+    def _put_memory(cls, key: str, result: str, ttl: Optional[float]) -> None:
+        cache_settings = settings.function_cache
+        size = len(result)
+        if size > cache_settings.memory_max_bytes:
+            return
+        cls._drop_memory(key)
+        cls._memory[key] = (result, time.monotonic() + ttl if ttl is not None else None)
+        cls._memory_bytes += size
+        while cls._memory and (
+                cls._memory_bytes > cache_settings.memory_max_bytes or len(cls._memory) > cache_settings.max_entries
+        ):
+            _, (evicted, _) = cls._memory.popitem(last=False)
+            cls._memory_bytes -= len(evicted)
+
+    @classmethod
+    def _drop_memory(cls, key: str) -> None:
+        if (cached := cls._memory.pop(key, None)) is not None:
+            cls._memory_bytes -= len(cached[0])
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        hits = cls._counters["memory_hits"] + cls._counters["persistent_hits"]
+        total = hits + cls._counters["misses"]
+        return {
+            **cls._counters,
+            "hit_ratio": hits / total if total else 0.0,
+            "memory_bytes": cls._memory_bytes,
+            "memory_items": len(cls._memory),
+        }
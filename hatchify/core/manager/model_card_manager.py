@@ -7,7 +7,9 @@
 # @Software: PyCharm
 from __future__ import annotations
 
+import hashlib
 import tomllib
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -32,6 +34,11 @@ class ModelCardManager(BaseModel):
                 f"default_provider '{self.default_provider}' is not enabled"
             )
 
+    @cached_property
+    def fingerprint(self) -> str:
+        """模型注册表内容哈希（用于缓存键）"""
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()
+
     def find_model(self, model_id: str, provider_id: Optional[str] = None) -> ModelCard:
         """严格查找模型：只在指定的 provider 中查找，找不到直接抛异常"""
         if provider_id is None:
@@ -4,15 +4,20 @@ GraphExecutor 管理器
 用于管理多个 GraphExecutor 实例，支持：
 - 创建和注册 executor
 - 通过 graph_id 获取 executor
-- 清理完成的 executor
+- 清理完成的 executor（后台回收任务按 TTL 与常驻上限回收）
 """
 import asyncio
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Any, List
 
 from loguru import logger
 
+from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.manager.event_manager import EventStore
 from hatchify.core.stream_handler.stream_handler import BaseStreamHandler
 
+settings = get_hatchify_settings()
+
 
 class StreamManager:
     """
@@ -25,6 +30,10 @@ class StreamManager:
     _executors: Dict[str, BaseStreamHandler] = {}
     _lock = asyncio.Lock()
 
+    # 后台回收任务与统计
+    _reaper_task: Optional[asyncio.Task] = None
+    _evicted_total: int = 0
+
     @classmethod
     async def create(
             cls,
@@ -89,3 +98,108 @@ class StreamManager:
             count = len(cls._executors)
             cls._executors.clear()
             logger.warning(f"Cleared all {count} stream handlers")
+
+    @classmethod
+    async def start_reaper(cls) -> None:
+        """启动后台回收任务"""
+        if not settings.stream_reaper.enabled or cls._reaper_task is not None:
+            return
+        cls._reaper_task = asyncio.create_task(cls._reaper_loop())
+        logger.info("Stream handler reaper started")
+
+    @classmethod
+    async def stop_reaper(cls) -> None:
+        """停止后台回收任务"""
+        if cls._reaper_task is None:
+            return
+        cls._reaper_task.cancel()
+        try:
+            await cls._reaper_task
+        except asyncio.CancelledError:
+            pass
+        cls._reaper_task = None
+
+    @classmethod
+    async def _reaper_loop(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.stream_reaper.interval)
+            try:
+                await cls.reap()
+            except Exception as e:
+                logger.error(f"Stream handler reaper failed: {type(e).__name__}: {e}")
+
+    @classmethod
+    async def reap(cls) -> List[str]:
+        """
+        回收 handler 及其 EventStore：
+        1. 完成超过 completed_ttl 且没有 SSE 订阅者的 handler
+        2. 创建超过 idle_ttl 仍未开始执行的 handler
+        3. 常驻数量超过 max_resident 时，按完成时间从早到晚回收已完成的 handler
+
+        运行中的 handler 永远不会被回收
+
+        Returns:
+            被回收的 task_id 列表
+        """
+        reaper_settings = settings.stream_reaper
+        now = time.monotonic()
+
+        async with cls._lock:
+            evicted: List[str] = []
+            finished: List[tuple[float, str]] = []
+            for task_id, handler in cls._executors.items():
+                if handler.completed_at is None:
+                    if handler.stream_task is None and now - handler.created_at > reaper_settings.idle_ttl:
+                        evicted.append(task_id)
+                    continue
+                if handler.broadcaster.subscriber_count:
+                    continue
+                if now - handler.completed_at > reaper_settings.completed_ttl:
+                    evicted.append(task_id)
+                else:
+                    finished.append((handler.completed_at, task_id))
+
+            overflow = len(cls._executors) - len(evicted) - reaper_settings.max_resident
+            if overflow > 0:
+                finished.sort()
+                evicted.extend(task_id for _, task_id in finished[:overflow])
+
+            for task_id in evicted:
+                del cls._executors[task_id]
+            cls._evicted_total += len(evicted)
+
+        # 只回收内存，持久化后端中的事件由 EventStore 的 TTL 压缩任务清理
+        for task_id in evicted:
+            await EventStore.evict(task_id)
+
+        if evicted:
+            logger.info(f"Reaped {len(evicted)} stream handlers, resident: {len(cls._executors)}")
+        return evicted
+
+    @classmethod
+    async def stats(cls) -> Dict[str, Any]:
+        """常驻 handler 与事件存储的内存统计"""
+        async with cls._lock:
+            handlers = list(cls._executors.values())
+        running = sum(1 for handler in handlers if handler.completed_at is None)
+
+        listeners: Dict[str, Dict[str, Any]] = {}
+        for handler in handlers:
+            for item in handler.listener_stats():
+                total = listeners.setdefault(
+                    item["listener"], {"pending": 0, "dispatched": 0, "dropped": 0, "failed": 0, "max_lag": 0.0}
+                )
+                for key in ("pending", "dispatched", "dropped", "failed"):
+                    total[key] += item[key]
+                total["max_lag"] = max(total["max_lag"], item["max_lag"])
+
+        return {
+            "resident": len(handlers),
+            "running": running,
+            "completed": len(handlers) - running,
+            "subscribers": sum(handler.broadcaster.subscriber_count for handler in handlers),
+            "evicted_total": cls._evicted_total,
+            "max_resident": settings.stream_reaper.max_resident,
+            "event_store": EventStore.stats(),
+            "listeners": listeners,
+        }
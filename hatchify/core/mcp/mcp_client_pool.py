@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from strands.tools.mcp import MCPClient
+from strands.tools.mcp.mcp_types import MCPToolResult
+
+from hatchify.common.domain.entity.mcp_card import MCPServerCard
+from hatchify.core.factory.mcp_transport_factory import MCPTransportFactory
+
+
+@dataclass
+class _PooledClient:
+    client: MCPClient
+    in_flight: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class MCPClientPool:
+    """单个 MCP 服务器的长连接池
+
+    - 连接（stdio 子进程 / HTTP 会话）在首次调用时创建，之后被同一服务器的所有工具复用
+    - MCPClient 本身支持并发调用，选择在途请求最少的连接；全部繁忙且未达上限时扩容
+    - 空闲超过 pool_idle_timeout 的连接被回收
+    - 空闲超过 pool_health_check_interval 的连接在复用前检查会话是否存活
+    - 调用过程中连接异常时丢弃该连接并使用新连接重试一次
+    """
+
+    def __init__(self, server: MCPServerCard):
+        self.server = server
+        self._transport_factory = MCPTransportFactory.create_transport_factory(server)
+        self._entries: List[_PooledClient] = []
+        self._pending: int = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _create_client(self) -> MCPClient:
+        mcp_client_kwargs: Dict[str, Any] = {}
+        if self.server.startup_timeout:
+            mcp_client_kwargs["startup_timeout"] = self.server.startup_timeout
+        client = MCPClient(self._transport_factory, **mcp_client_kwargs)
+        client.start()
+        logger.info(f"MCP pool '{self.server.name}': opened connection")
+        return client
+
+    @staticmethod
+    def _stop_client(client: MCPClient) -> None:
+        try:
+            client.stop(None, None, None)
+        except Exception as e:
+            logger.warning(f"Failed to stop MCP client: {type(e).__name__}: {e}")
+
+    @staticmethod
+    def _is_healthy(client: MCPClient) -> bool:
+        is_session_active = getattr(client, "_is_session_active", None)
+        if is_session_active is None:
+            return True
+        try:
+            return bool(is_session_active())
+        except Exception:
+            return False
+
+    def _reserve(self) -> tuple[Optional[_PooledClient], List[MCPClient]]:
+        """在锁内选择可复用的连接，返回 (连接或 None 表示需要新建, 需要关闭的连接)"""
+        now = time.monotonic()
+        to_stop: List[MCPClient] = []
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"MCP client pool '{self.server.name}' is closed")
+
+            alive: List[_PooledClient] = []
+            for entry in self._entries:
+                if entry.in_flight == 0:
+                    idle = now - entry.last_used
+                    if 0 < self.server.pool_idle_timeout < idle:
+                        to_stop.append(entry.client)
+                        continue
+                    if idle > self.server.pool_health_check_interval and not self._is_healthy(entry.client):
+                        logger.warning(f"MCP pool '{self.server.name}': dropped unhealthy connection")
+                        to_stop.append(entry.client)
+                        continue
+                alive.append(entry)
+            self._entries = alive
+
+            best = min(self._entries, key=lambda e: e.in_flight, default=None)
+            capacity = len(self._entries) + self._pending
+            if best is None or (best.in_flight > 0 and capacity < self.server.pool_size):
+                self._pending += 1
+                return None, to_stop
+
+            best.in_flight += 1
+            return best, to_stop
+
+    def _register(self, client: Optional[MCPClient]) -> Optional[_PooledClient]:
+        with self._lock:
+            self._pending -= 1
+            if client is None:
+                return None
+            if self._closed:
+                return None
+            entry = _PooledClient(client=client, in_flight=1)
+            self._entries.append(entry)
+            return entry
+
+    def _release(self, entry: _PooledClient) -> None:
+        with self._lock:
+            entry.in_flight -= 1
+            entry.last_used = time.monotonic()
+
+    def _discard(self, entry: _PooledClient) -> bool:
+        with self._lock:
+            if entry not in self._entries:
+                return False
+            self._entries.remove(entry)
+        return True
+
+    def acquire(self) -> _PooledClient:
+        entry, to_stop = self._reserve()
+        for client in to_stop:
+            self._stop_client(client)
+        if entry is not None:
+            return entry
+
+        client = None
+        try:
+            client = self._create_client()
+        finally:
+            entry = self._register(client)
+        if entry is None:
+            self._stop_client(client)
+            raise RuntimeError(f"MCP client pool '{self.server.name}' is closed")
+        return entry
+
+    async def acquire_async(self) -> _PooledClient:
+        entry, to_stop = self._reserve()
+        for client in to_stop:
+            await asyncio.to_thread(self._stop_client, client)
+        if entry is not None:
+            return entry
+
+        client = None
+        try:
+            client = await asyncio.to_thread(self._create_client)
+        finally:
+            entry = self._register(client)
+        if entry is None:
+            await asyncio.to_thread(self._stop_client, client)
+            raise RuntimeError(f"MCP client pool '{self.server.name}' is closed")
+        return entry
+
+    async def call_tool_async(self, tool_use_id: str, name: str, arguments: Dict[str, Any]) -> MCPToolResult:
+        for attempt in range(2):
+            entry = await self.acquire_async()
+            try:
+                return await entry.client.call_tool_async(
+                    tool_use_id=tool_use_id,
+                    name=name,
+                    arguments=arguments,
+                )
+            except Exception as e:
+                if self._discard(entry):
+                    await asyncio.to_thread(self._stop_client, entry.client)
+                if attempt:
+                    raise
+                logger.warning(
+                    f"MCP pool '{self.server.name}': call '{name}' failed ({type(e).__name__}: {e}), reconnecting"
+                )
+            finally:
+                self._release(entry)
+        raise RuntimeError("unreachable")
+
+    def call_tool_sync(self, tool_use_id: str, name: str, arguments: Dict[str, Any]) -> MCPToolResult:
+        for attempt in range(2):
+            entry = self.acquire()
+            try:
+                return entry.client.call_tool_sync(
+                    tool_use_id=tool_use_id,
+                    name=name,
+                    arguments=arguments,
+                )
+            except Exception as e:
+                if self._discard(entry):
+                    self._stop_client(entry.client)
+                if attempt:
+                    raise
+                logger.warning(
+                    f"MCP pool '{self.server.name}': call '{name}' failed ({type(e).__name__}: {e}), reconnecting"
+                )
+            finally:
+                self._release(entry)
+        raise RuntimeError("unreachable")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            entries, self._entries = self._entries, []
+        for entry in entries:
+            self._stop_client(entry.client)
+        if entries:
+            logger.info(f"MCP pool '{self.server.name}': closed {len(entries)} connections")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.server.pool_size,
+                "in_flight": sum(entry.in_flight for entry in self._entries),
+            }
+
+
+class MCPClientPoolManager:
+    """
+    全局 MCP 连接池管理器（单例模式）
+
+    按 MCPServerCard.name 维护连接池，同一服务器的所有 MCPToolWrapper 共享
+    """
+
+    _pools: Dict[str, MCPClientPool] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls, server: MCPServerCard) -> MCPClientPool:
+        with cls._lock:
+            pool = cls._pools.get(server.name)
+            if pool is None:
+                pool = MCPClientPool(server)
+                cls._pools[server.name] = pool
+            return pool
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            pools, cls._pools = list(cls._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    @classmethod
+    async def async_close_all(cls) -> None:
+        await asyncio.to_thread(cls.close_all)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, int]]:
+        with cls._lock:
+            pools = dict(cls._pools)
+        return {name: pool.stats() for name, pool in pools.items()}
@@ -2,13 +2,12 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
-from strands.tools.mcp import MCPClient
 from strands.tools.mcp.mcp_types import MCPToolResult
 from strands.types._events import ToolResultEvent
 from strands.types.tools import AgentTool, ToolContext, ToolSpec, ToolUse, ToolGenerator
 
 from hatchify.common.domain.entity.mcp_card import MCPServerCard
-from hatchify.core.factory.mcp_transport_factory import MCPTransportFactory
+from hatchify.core.mcp.mcp_client_pool import MCPClientPool, MCPClientPoolManager
 
 
 class MCPToolWrapper(AgentTool):
@@ -24,9 +23,6 @@ class MCPToolWrapper(AgentTool):
         self._tool_name = tool_name
         self._tool_spec = tool_spec
 
-        self._transport_factory = MCPTransportFactory.create_transport_factory(
-            server_config
-        )
         self.mark_dynamic()
 
     @property
@@ -41,15 +37,18 @@ class MCPToolWrapper(AgentTool):
     def tool_type(self) -> str:
         return "function"
 
+    @property
+    def _pool(self) -> MCPClientPool:
+        # 连接池按服务器共享，不挂在实例上（ToolRouter 加前缀时会 deepcopy 工具）
+        return MCPClientPoolManager.get_pool(self._server_config)
+
     async def stream(self, tool_use: ToolUse, invocation_state: Dict[str, Any], **kwargs: Any) -> ToolGenerator:
-        mcp_client = MCPClient(self._transport_factory)
-        with mcp_client:
-            result = await mcp_client.call_tool_async(
-                tool_use_id=tool_use["toolUseId"],
-                name=self._tool_name,
-                arguments=tool_use["input"],
-            )
-            yield ToolResultEvent(result)
+        result = await self._pool.call_tool_async(
+            tool_use_id=tool_use["toolUseId"],
+            name=self._tool_name,
+            arguments=tool_use["input"],
+        )
+        yield ToolResultEvent(result)
 
     def __call__(
             self,
@@ -57,11 +56,8 @@ class MCPToolWrapper(AgentTool):
             arguments: Dict[str, Any],
             tool_context: ToolContext | None = None,
     ) -> MCPToolResult:
-        mcp_client = MCPClient(self._transport_factory)
-        with mcp_client:
-            result = mcp_client.call_tool_sync(
-                tool_use_id=tool_use_id,
-                name=self._tool_name,
-                arguments=arguments,
-            )
-            return result
+        return self._pool.call_tool_sync(
+            tool_use_id=tool_use_id,
+            name=self._tool_name,
+            arguments=arguments,
+        )
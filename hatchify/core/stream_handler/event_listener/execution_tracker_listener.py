@@ -1,15 +1,19 @@
+import asyncio
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any, List, FrozenSet
 
 from loguru import logger
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update, bindparam
 
 from hatchify.business.db.session import AsyncSessionLocal
 from hatchify.business.models.execution import ExecutionTable
 from hatchify.common.domain.enums.execution_status import ExecutionStatus
-from hatchify.common.domain.event.base_event import StreamEvent, StartEvent, DoneEvent, ErrorEvent
+from hatchify.common.domain.event.base_event import StreamEvent, DoneEvent, ErrorEvent
+from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.stream_handler.event_listener.event_listener import EventListener
 
+settings = get_hatchify_settings()
+
 
 class ExecutionTrackerListener(EventListener):
     """
@@ -23,15 +27,24 @@ class ExecutionTrackerListener(EventListener):
     - DoneEvent(cancel) -> status = CANCELLED, completed_at = now
     - DoneEvent(error) -> status = FAILED, completed_at = now
     - ErrorEvent -> 记录 error 字段
+
+    写入采用 write-behind 方式：on_event 只把字段变更合并进进程级缓冲区（同一执行的多次变更合并为一条），
+    后台任务按 flush_interval 或缓冲达到 flush_batch_size 时以批量 UPDATE 写入数据库，事件管道不等待数据库
     """
 
+    # 进程级缓冲区：execution_id -> 待写入的字段
+    _pending: Dict[str, Dict[str, Any]] = {}
+    _flush_lock: Optional[asyncio.Lock] = None
+    _wakeup: Optional[asyncio.Event] = None
+    _flush_task: Optional[asyncio.Task] = None
+
     @property
     def name(self) -> str:
         return "ExecutionTrackerListener"
 
     async def on_event(self, execution_id: str, event: StreamEvent):
         """
-        事件回调 - 根据事件类型更新执行状态
+        事件回调 - 根据事件类型合并待更新的执行状态
 
         Args:
             execution_id: 执行ID
@@ -40,76 +53,103 @@ class ExecutionTrackerListener(EventListener):
         try:
             match event.type:
                 case "start":
-                    await self._handle_start(execution_id, event.data)
+                    self._enqueue(execution_id, status=ExecutionStatus.RUNNING, started_at=datetime.now())
                 case "done":
-                    await self._handle_done(execution_id, event.data)
+                    self._enqueue(execution_id, **self._done_fields(event.data))
                 case "error":
-                    await self._handle_error(execution_id, event.data)
+                    self._enqueue(execution_id, **self._error_fields(event.data))
                 case _:
                     ...
         except Exception as e:
             logger.error(f"ExecutionTrackerListener failed for {execution_id}: {type(e).__name__}: {e}")
 
-    async def _handle_start(self, execution_id: str, event_data: StartEvent):
-        """处理 StartEvent: 更新为 RUNNING"""
-        async with AsyncSessionLocal() as session:
-            await self._update_execution(
-                session,
-                execution_id,
-                status=ExecutionStatus.RUNNING,
-                started_at=datetime.now()
-            )
-
-    async def _handle_done(self, execution_id: str, event_data: DoneEvent):
-        """处理 DoneEvent: 根据 reason 更新为终态"""
+    @staticmethod
+    def _done_fields(event_data: DoneEvent) -> Dict[str, Any]:
+        """DoneEvent: 根据 reason 更新为终态"""
         status_map = {
             "completed": ExecutionStatus.COMPLETED,
             "cancel": ExecutionStatus.CANCELLED,
             "error": ExecutionStatus.FAILED,
         }
-        status = status_map.get(event_data.reason, ExecutionStatus.FAILED)
-
-        async with AsyncSessionLocal() as session:
-            await self._update_execution(
-                session,
-                execution_id,
-                status=status,
-                completed_at=datetime.now()
-            )
-
-    async def _handle_error(self, execution_id: str, event_data: ErrorEvent):
-        """处理 ErrorEvent: 记录错误信息"""
-        async with AsyncSessionLocal() as session:
-            await self._update_execution(
-                session,
-                execution_id,
-                error=event_data.reason
-            )
+        return {
+            "status": status_map.get(event_data.reason, ExecutionStatus.FAILED),
+            "completed_at": datetime.now(),
+        }
 
     @staticmethod
-    async def _update_execution(
-            session: AsyncSession,
-            execution_id: str,
-            status: Optional[ExecutionStatus] = None,
-            error: Optional[str] = None,
-            started_at: Optional[datetime] = None,
-            completed_at: Optional[datetime] = None,
-    ):
-        """更新执行记录"""
-        result = await session.get(ExecutionTable, execution_id)
-        if not result:
-            logger.warning(f"Execution {execution_id} not found in database")
-            return
-
-        # 只更新提供的字段
-        if status is not None:
-            result.status = status
-        if error is not None:
-            result.error = error
-        if started_at is not None:
-            result.started_at = started_at
-        if completed_at is not None:
-            result.completed_at = completed_at
-
-        await session.commit()
-        logger.debug(f"Execution {execution_id} updated: status={status}")
+    def _error_fields(event_data: ErrorEvent) -> Dict[str, Any]:
+        """ErrorEvent: 记录错误信息"""
+        return {"error": event_data.reason}
+
+    @classmethod
+    def _enqueue(cls, execution_id: str, **fields: Any) -> None:
+        """合并字段变更，同一执行后到的变更覆盖先到的（事件按顺序到达）"""
+        cls._pending.setdefault(execution_id, {}).update(fields)
+        cls._ensure_flusher()
+        if len(cls._pending) >= settings.execution_tracker.flush_batch_size:
+            cls._wakeup.set()
+
+    @classmethod
+    def _ensure_flusher(cls) -> None:
+        if cls._flush_task is None or cls._flush_task.done():
+            cls._flush_lock = cls._flush_lock or asyncio.Lock()
+            cls._wakeup = asyncio.Event()
+            cls._flush_task = asyncio.create_task(cls._flush_loop())
+
+    @classmethod
+    async def _flush_loop(cls) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=settings.execution_tracker.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            cls._wakeup.clear()
+            try:
+                await cls.flush()
+            except Exception as e:
+                logger.error(f"ExecutionTrackerListener flush failed: {type(e).__name__}: {e}")
+
+    @classmethod
+    async def flush(cls) -> None:
+        """将缓冲区中的变更写入数据库，字段组合相同的执行共用一条批量 UPDATE"""
+        cls._flush_lock = cls._flush_lock or asyncio.Lock()
+        async with cls._flush_lock:
+            if not cls._pending:
+                return
+            pending, cls._pending = cls._pending, {}
+
+            groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = {}
+            for execution_id, fields in pending.items():
+                # 绑定参数名不能与列名相同，统一加 "_" 前缀
+                groups.setdefault(frozenset(fields), []).append(
+                    {"_id": execution_id, **{f"_{key}": value for key, value in fields.items()}}
+                )
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    for keys, rows in groups.items():
+                        stmt = (
+                            update(ExecutionTable.__table__)
+                            .where(ExecutionTable.__table__.c.id == bindparam("_id"))
+                            .values({key: bindparam(f"_{key}") for key in keys})
+                        )
+                        await session.execute(stmt, rows)
+                    await session.commit()
+            except Exception:
+                # 写入失败时合并回缓冲区（保留更新的变更），下一轮重试
+                for execution_id, fields in pending.items():
+                    cls._pending[execution_id] = {**fields, **cls._pending.get(execution_id, {})}
+                raise
+            logger.debug(f"Execution tracker flushed {len(pending)} executions")
+
+    @classmethod
+    async def shutdown(cls) -> None:
+        """停止后台任务并写入剩余变更"""
+        if cls._flush_task is not None:
+            cls._flush_task.cancel()
+            try:
+                await cls._flush_task
+            except asyncio.CancelledError:
+                pass
+            cls._flush_task = None
+        await cls.flush()
@@ -0,0 +1,128 @@
+"""
+监听器异步分发模块，每个监听器拥有独立的有界队列与消费任务，慢监听器不影响事件推送延迟
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Literal, Optional, Tuple, Any
+
+from loguru import logger
+
+from hatchify.common.domain.event.base_event import StreamEvent
+from hatchify.core.stream_handler.event_listener.event_listener import EventListener
+
+ListenerDispatchMode = Literal["inline", "queued"]
+ListenerBackpressure = Literal["block", "drop_oldest", "drop_newest"]
+
+
+class ListenerDispatcher:
+    """
+    单个监听器的事件分发器
+
+    - 事件按到达顺序由唯一的消费任务依次交给监听器，保证单个监听器内的顺序
+    - 队列满时按 policy 处理：
+      - block: 等待队列有空位（emit_event 会被阻塞）
+      - drop_oldest: 丢弃最旧的事件
+      - drop_newest: 丢弃当前事件
+    - close() 后消费任务处理完剩余事件再退出
+    """
+
+    def __init__(
+            self,
+            listener: EventListener,
+            source_id: str,
+            maxsize: int = 1024,
+            policy: ListenerBackpressure = "block",
+    ):
+        self.listener = listener
+        self.source_id = source_id
+        self.maxsize = maxsize
+        self.policy = policy
+        self.closed = False
+
+        self.dispatched = 0
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+        # (事件, 入队时间)
+        self._queue: Deque[Tuple[StreamEvent, float]] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def dispatch(self, event: StreamEvent) -> None:
+        if self.closed:
+            return
+
+        if len(self._queue) >= self.maxsize:
+            match self.policy:
+                case "drop_newest":
+                    self.dropped += 1
+                    return
+                case "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                case _:
+                    while len(self._queue) >= self.maxsize and not self.closed:
+                        self._not_full.clear()
+                        await self._not_full.wait()
+
+        self._queue.append((event, time.monotonic()))
+        self.dispatched += 1
+        self._not_empty.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            while not self._queue:
+                if self.closed:
+                    return
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+            event, enqueued_at = self._queue.popleft()
+            self._not_full.set()
+
+            self.last_lag = time.monotonic() - enqueued_at
+            self.max_lag = max(self.max_lag, self.last_lag)
+            try:
+                await self.listener.on_event(self.source_id, event)
+            except Exception as e:
+                # 监听器失败不应影响主流程
+                self.failed += 1
+                logger.error(f"Listener {self.listener.name} failed for {self.source_id}: {type(e).__name__}: {e}")
+            self.processed += 1
+
+    def close(self) -> None:
+        """不再接收新事件，消费任务处理完剩余事件后退出"""
+        self.closed = True
+        self._not_empty.set()
+        self._not_full.set()
+        if self.dropped:
+            logger.warning(f"Listener {self.listener.name} dropped {self.dropped} events for {self.source_id}")
+
+    async def join(self) -> None:
+        """等待剩余事件处理完成"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "listener": self.listener.name,
+            "pending": self.pending,
+            "dispatched": self.dispatched,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
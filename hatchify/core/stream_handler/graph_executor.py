@@ -1,23 +1,28 @@
+import asyncio
 import json
 import mimetypes
-from typing import Dict, Any, List, get_args, Optional, Union
+from typing import Dict, Any, List, get_args, Optional, Union, Tuple, Callable
 
 from strands.agent import AgentResult
-from strands.multiagent.base import NodeResult, MultiAgentResult
+from strands.multiagent.base import NodeResult, MultiAgentResult, Status
 from strands.types.content import ContentBlock
 from strands.types.media import DocumentFormat, ImageFormat, VideoFormat, DocumentContent, DocumentSource, ImageContent, \
     ImageSource, VideoContent, VideoSource
 
-from hatchify.common.domain.entity.graph_execute_data import GraphExecuteData
+from hatchify.common.domain.entity.graph_execute_data import GraphExecuteData, FileData
 from hatchify.common.domain.entity.graph_spec import GraphSpec
 from hatchify.common.domain.event.base_event import StreamEvent
-from hatchify.common.domain.event.execute_event import NodeStartEvent, NodeStopEvent, NodeHandoffEvent, ResultEvent
+from hatchify.common.domain.event.execute_event import NodeStartEvent, NodeStopEvent, NodeHandoffEvent, ResultEvent, \
+    NodeCacheHitEvent
 from hatchify.common.extensions.ext_storage import storage_client
+from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.graph.graph_wrapper import GraphWrapper
+from hatchify.core.manager.checkpoint_manager import CheckpointManager
 from hatchify.core.stream_handler.event_listener.event_listener import EventListener
 
 from hatchify.core.stream_handler.stream_handler import BaseStreamHandler
 
+settings = get_hatchify_settings()
 document_formats = get_args(DocumentFormat)
 image_formats = get_args(ImageFormat)
 video_formats = get_args(VideoFormat)
@@ -31,6 +36,7 @@ class GraphExecutor(BaseStreamHandler):
             graph: GraphWrapper,
             graph_spec: GraphSpec,
             listeners: Optional[List[EventListener]] = None,
+            checkpoint: bool = False,
     ):
         super().__init__(
             source_id=graph_id,
@@ -38,58 +44,105 @@ class GraphExecutor(BaseStreamHandler):
         )
         self.graph = graph
         self.graph_spec = graph_spec
+        # 开启时每个节点完成后写入检查点（需要先保存执行快照），执行成功后清理
+        self.checkpoint = checkpoint
 
     @staticmethod
+    def _resolve_file_ext(sub_file: FileData) -> str:
+        ext_with_dot: Optional[str] = mimetypes.guess_extension(sub_file.mime)
+        if ext_with_dot is None:
+            raise RuntimeError(f"Unsupported file format: {sub_file.name}")
+        ext = ext_with_dot.split(".")[-1]
+        if ext not in document_formats and ext not in image_formats and ext not in video_formats:
+            raise TypeError(f"Unsupported file format: {ext}")
+        return ext
+
+    @staticmethod
+    async def prefetch_files(keys: List[str]) -> Dict[str, bytes]:
+        """
+        并发加载输入文件
+
+        - 先并发获取文件大小，总量超过 max_bytes_per_execution 时在读取任何内容之前失败
+        - 再以 concurrency 为上限并发读取，相同 key 只读取一次
+        """
+        prefetch_settings = settings.file_prefetch
+        unique_keys = list(dict.fromkeys(keys))
+        semaphore = asyncio.Semaphore(prefetch_settings.concurrency)
+
+        async def content_length(key: str) -> int:
+            async with semaphore:
+                metadata = await storage_client.stat(key)
+                return metadata.content_length
+
+        async def load(key: str) -> Tuple[str, bytes]:
+            async with semaphore:
+                return key, await storage_client.load(key)
+
+        sizes = await asyncio.gather(*(content_length(key) for key in unique_keys))
+        total = sum(sizes)
+        if total > prefetch_settings.max_bytes_per_execution:
+            raise ValueError(
+                f"Input files total {total} bytes, exceeding the per-execution limit of "
+                f"{prefetch_settings.max_bytes_per_execution} bytes"
+            )
+
+        return dict(await asyncio.gather(*(load(key) for key in unique_keys)))
+
+    @classmethod
     async def build_messages(
+            cls,
             task: GraphExecuteData,
     ) -> List[ContentBlock]:
         messages: List[ContentBlock] = []
-        for field, sub_files in task.files.items():
-            for index, sub_file in enumerate(sub_files):
-
-                ext_with_dot: Optional[str] = mimetypes.guess_extension(sub_file.mime)
-                if ext_with_dot is None:
-                    raise RuntimeError(f"Unsupported file format: {sub_file.name}")
-                ext = ext_with_dot.split(".")[-1]
-                bytes_data: bytes = await storage_client.load(sub_file.key)
-
-                if ext in document_formats:
-                    messages.append(
-                        ContentBlock(
-                            text=f"User’s Document data. {sub_file.name}",
-                            document=DocumentContent(
-                                format=ext,  # type: ignore
-                                name=sub_file.name,
-                                source=DocumentSource(bytes=bytes_data)
-
-                            ),
-                            source_key=sub_file.key  # type: ignore 自定义额外字段，用于配合重写后的 FileSessionManager
-                        )
+
+        # 先校验所有文件格式，再并发加载，避免出现部分读取后才发现格式不支持
+        sub_files: List[Tuple[FileData, str]] = [
+            (sub_file, cls._resolve_file_ext(sub_file))
+            for files in task.files.values()
+            for sub_file in files
+        ]
+        contents = await cls.prefetch_files([sub_file.key for sub_file, _ in sub_files])
+
+        for sub_file, ext in sub_files:
+            bytes_data: bytes = contents[sub_file.key]
+
+            if ext in document_formats:
+                messages.append(
+                    ContentBlock(
+                        text=f"User’s Document data. {sub_file.name}",
+                        document=DocumentContent(
+                            format=ext,  # type: ignore
+                            name=sub_file.name,
+                            source=DocumentSource(bytes=bytes_data)
+
+                        ),
+                        source_key=sub_file.key  # type: ignore 自定义额外字段，用于配合重写后的 FileSessionManager
                     )
-                elif ext in image_formats:
-                    messages.append(
-                        ContentBlock(
-                            text=f"User’s Image data. {sub_file.name}",
-                            image=ImageContent(
-                                format=ext,  # type: ignore
-                                source=ImageSource(bytes=bytes_data)
-                            ),
-                            source_key=sub_file.key  # type: ignore 自定义额外字段，用于配合重写后的 FileSessionManager
-                        )
+                )
+            elif ext in image_formats:
+                messages.append(
+                    ContentBlock(
+                        text=f"User’s Image data. {sub_file.name}",
+                        image=ImageContent(
+                            format=ext,  # type: ignore
+                            source=ImageSource(bytes=bytes_data)
+                        ),
+                        source_key=sub_file.key  # type: ignore 自定义额外字段，用于配合重写后的 FileSessionManager
                     )
-                elif ext in video_formats:
-                    messages.append(
-                        ContentBlock(
-                            text=f"User’s video data. {sub_file.name}",
-                            video=VideoContent(
-                                format=ext,  # type: ignore
-                                source=VideoSource(bytes=bytes_data)
-                            ),
-                            source_key=sub_file.key  # type: ignore 自定义额外字段，用于配合重写后的 FileSessionManager
-                        )
+                )
+            elif ext in video_formats:
+                messages.append(
+                    ContentBlock(
+                        text=f"User’s video data. {sub_file.name}",
+                        video=VideoContent(
+                            format=ext,  # type: ignore
+                            source=VideoSource(bytes=bytes_data)
+                        ),
+                        source_key=sub_file.key  # type: ignore 自定义额外字段，用于配合重写后的 FileSessionManager
                     )
-                else:
-                    raise TypeError(f"Unsupported file format: {ext}")
+                )
+            else:
+                raise TypeError(f"Unsupported file format: {ext}")
         if task.jsons:
             messages.append(
                 ContentBlock(text=f"User’s input: {json.dumps(task.jsons, indent=2, ensure_ascii=False)})")
@@ -99,6 +152,18 @@ class GraphExecutor(BaseStreamHandler):
     async def handle_stream_event(self, event: Dict[str, Any]):
         event_type = event.get("type")
         if event_type in ["multiagent_node_stream"]:
+            node_event = event.get("event") or {}
+            if node_event.get("type") == "function_cache_hit":
+                await self.emit_event(
+                    StreamEvent(
+                        type="node_cache_hit",
+                        data=NodeCacheHitEvent(
+                            node_id=node_event.get("node_id"),
+                            tool_name=node_event.get("tool_name"),
+                            cache_key=node_event.get("cache_key"),
+                        )
+                    )
+                )
             return
         match event_type:
             case "multiagent_node_start":
@@ -112,6 +177,8 @@ class GraphExecutor(BaseStreamHandler):
                 )
             case "multiagent_node_stop":
                 node_result: NodeResult = event.get("node_result")
+                if self.checkpoint and node_result.status == Status.COMPLETED:
+                    await CheckpointManager.save_node(self.source_id, event.get("node_id"), node_result)
                 result = node_result.result
                 if isinstance(result, AgentResult):
                     await self.emit_event(
@@ -138,6 +205,8 @@ class GraphExecutor(BaseStreamHandler):
                 result_dict: Dict[str, Union[str, Dict[str, Any]]] = {}
                 output_required = self.graph_spec.output_schema.get("required")
                 multi_agent_result: MultiAgentResult = event.get("result")
+                if self.checkpoint and multi_agent_result.status == Status.COMPLETED:
+                    await CheckpointManager.delete(self.source_id)
                 for node_id, node_result in multi_agent_result.results.items():
                     if node_id not in output_required:
                         continue
@@ -168,6 +237,19 @@ class GraphExecutor(BaseStreamHandler):
         async_generator = self.graph.stream_async(messages, invocation_state, **kwargs)
         await self.run_streamed(async_generator)
 
+    async def resume_task(
+            self,
+            task: GraphExecuteData,
+            restore: Callable[[List[ContentBlock]], Any],
+            invocation_state: Dict[str, Any] | None = None,
+            **kwargs: Any
+    ):
+        """从检查点继续执行：restore 在开始流式执行前以重建的输入消息恢复 Graph 状态"""
+        messages = await self.build_messages(task)
+        restore(messages)
+        async_generator = self.graph.stream_async(messages, invocation_state, **kwargs)
+        await self.run_streamed(async_generator)
+
     async def invoke_async(
             self,
             task: GraphExecuteData,
@@ -0,0 +1,152 @@
+"""
+流事件广播模块，支持多个 SSE 客户端同时订阅同一个执行
+"""
+import asyncio
+from collections import deque
+from typing import Callable, Deque, List, Literal, Optional, Tuple
+
+from loguru import logger
+
+from hatchify.common.domain.event.base_event import StreamEvent
+
+SlowConsumerPolicy = Literal["drop", "coalesce", "disconnect"]
+
+# (事件, 已编码的 SSE 帧)
+StreamFrame = Tuple[StreamEvent, bytes]
+
+
+class StreamSubscriber:
+    """
+    单个订阅者，持有有界环形缓冲区
+
+    缓冲区满时按 policy 处理慢消费者：
+    - drop: 丢弃最旧的事件
+    - coalesce: 将连续的 delta 事件合并为一条，无法合并时丢弃最旧的事件
+    - disconnect: 断开该订阅者（客户端可通过 Last-Event-ID 重连并从 EventStore 补齐）
+    """
+
+    def __init__(
+            self,
+            maxsize: int,
+            policy: SlowConsumerPolicy,
+            formatter: Callable[[StreamEvent], bytes],
+    ):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.buffer: Deque[StreamFrame] = deque()
+        self.closed = False
+        self.overflowed = False
+        self.dropped = 0
+        self.coalesced = 0
+        self._formatter = formatter
+        self._wakeup = asyncio.Event()
+
+    def push(self, frame: StreamFrame) -> None:
+        if self.closed:
+            return
+
+        if len(self.buffer) >= self.maxsize:
+            match self.policy:
+                case "disconnect":
+                    self.overflowed = True
+                    self.close()
+                    return
+                case "coalesce" if self._coalesce(frame):
+                    self._wakeup.set()
+                    return
+                case _:
+                    self.buffer.popleft()
+                    self.dropped += 1
+
+        self.buffer.append(frame)
+        self._wakeup.set()
+
+    def _coalesce(self, frame: StreamFrame) -> bool:
+        """将新的 delta 合并到缓冲区末尾的 delta，合并后事件沿用新事件的 ID"""
+        event, _ = frame
+        if event.type != "delta" or not self.buffer:
+            return False
+
+        last_event, _ = self.buffer[-1]
+        if last_event.type != "delta":
+            return False
+
+        last_content = getattr(last_event.data, "content", None)
+        content = getattr(event.data, "content", None)
+        if not isinstance(last_content, str) or not isinstance(content, str):
+            return False
+
+        merged = StreamEvent(
+            id=event.id,
+            type=event.type,
+            data=event.data.model_copy(update={"content": last_content + content}),
+        )
+        self.buffer[-1] = (merged, self._formatter(merged))
+        self.coalesced += 1
+        return True
+
+    async def get(self) -> Optional[StreamFrame]:
+        """获取下一条事件，订阅者关闭且缓冲区为空时返回 None"""
+        while not self.buffer:
+            if self.closed:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return self.buffer.popleft()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+
+class StreamBroadcaster:
+    """
+    事件广播中心
+
+    每个事件只编码一次，编码结果被推送到所有订阅者的缓冲区
+    """
+
+    def __init__(
+            self,
+            source_id: str,
+            formatter: Callable[[StreamEvent], bytes],
+            buffer_size: int = 1024,
+            policy: SlowConsumerPolicy = "coalesce",
+    ):
+        self.source_id = source_id
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self._formatter = formatter
+        self._subscribers: List[StreamSubscriber] = []
+
+    def subscribe(self) -> StreamSubscriber:
+        subscriber = StreamSubscriber(self.buffer_size, self.policy, self._formatter)
+        self._subscribers.append(subscriber)
+        logger.debug(f"Subscriber added for {self.source_id}, total: {len(self._subscribers)}")
+        return subscriber
+
+    def unsubscribe(self, subscriber: StreamSubscriber) -> None:
+        subscriber.close()
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+            if subscriber.dropped or subscriber.coalesced or subscriber.overflowed:
+                logger.info(
+                    f"Subscriber removed for {self.source_id}: dropped={subscriber.dropped}, "
+                    f"coalesced={subscriber.coalesced}, overflowed={subscriber.overflowed}"
+                )
+
+    def publish(self, event: StreamEvent) -> None:
+        if not self._subscribers:
+            return
+        frame = (event, self._formatter(event))
+        for subscriber in self._subscribers:
+            subscriber.push(frame)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def close(self) -> None:
+        for subscriber in self._subscribers:
+            subscriber.close()
+        self._subscribers.clear()
@@ -1,14 +1,20 @@
 import abc
 import asyncio
 import time
-from typing import Optional, Literal, AsyncIterator, Any, List
+from typing import Optional, Literal, AsyncIterator, Any, List, Dict
 
 from loguru import logger
 
 from hatchify.common.domain.event.base_event import StreamEvent, PingEvent, DoneEvent, ErrorEvent, StartEvent, \
     CancelEvent
+from hatchify.common.settings.settings import get_hatchify_settings
 from hatchify.core.manager.event_manager import EventStore
 from hatchify.core.stream_handler.event_listener.event_listener import EventListener
+from hatchify.core.stream_handler.event_listener.listener_dispatcher import ListenerDispatcher, \
+    ListenerDispatchMode, ListenerBackpressure
+from hatchify.core.stream_handler.stream_broadcaster import StreamBroadcaster, StreamSubscriber, SlowConsumerPolicy
+
+settings = get_hatchify_settings()
 
 
 class BaseStreamHandler(metaclass=abc.ABCMeta):
@@ -19,6 +25,10 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
             enable_reconnect: bool = True,
             event_ttl: int = 3600,
             listeners: Optional[List[EventListener]] = None,
+            subscriber_buffer_size: int = 1024,
+            slow_consumer_policy: SlowConsumerPolicy = "coalesce",
+            listener_dispatch_mode: Optional[ListenerDispatchMode] = None,
+            listener_backpressure: Optional[ListenerBackpressure] = None,
     ):
         self.source_id: str = source_id
         self.ping_task: Optional[asyncio.Task] = None
@@ -26,19 +36,43 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
         self.ping_running = False
         self.enable_reconnect = enable_reconnect
         self.stream_task: Optional[asyncio.Task] = None
-        self.stream_queue: asyncio.Queue[StreamEvent] = asyncio.Queue()
+        self.broadcaster = StreamBroadcaster(
+            source_id=source_id,
+            formatter=self.format_sse,
+            buffer_size=subscriber_buffer_size,
+            policy=slow_consumer_policy,
+        )
         self.event_ttl = event_ttl
         self.event_store: Optional[EventStore] = None
         self.stored_exception: Optional[Exception] = None
 
         self.listeners: List[EventListener] = listeners or []
 
+        # queued 模式下每个监听器拥有独立的有界队列与消费任务，emit_event 不等待监听器执行
+        dispatch_settings = settings.listener_dispatch
+        self.listener_dispatch_mode: ListenerDispatchMode = listener_dispatch_mode or dispatch_settings.mode
+        self.listener_dispatchers: List[ListenerDispatcher] = []
+        if self.listener_dispatch_mode == "queued":
+            self.listener_dispatchers = [
+                ListenerDispatcher(
+                    listener,
+                    source_id=source_id,
+                    maxsize=dispatch_settings.queue_size,
+                    policy=listener_backpressure or dispatch_settings.backpressure,
+                )
+                for listener in self.listeners
+            ]
+
+        # 生命周期时间戳（time.monotonic），供 StreamManager 回收已完成的 handler
+        self.created_at: float = time.monotonic()
+        self.completed_at: Optional[float] = None
+
     async def ping_loop(self):
         try:
             while self.ping_running:
                 await asyncio.sleep(self.ping_interval)
                 if self.ping_running:
-                    await self.stream_queue.put(
+                    self.broadcaster.publish(
                         StreamEvent(
                             type="ping",
                             data=PingEvent(
@@ -92,15 +126,26 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
     async def emit_event(self, event: StreamEvent):
         """
         统一的事件发送方法：
-        1. 发送到 stream_queue 供实时客户端消费
-        2. 写入 EventStore 供重连客户端读取（独立于客户端连接状态）
-        3. 触发所有注册的监听器
+        1. 写入 EventStore 供重连客户端读取（独立于客户端连接状态）
+        2. 广播给所有实时订阅者（与写入 EventStore 之间没有 await，保证新订阅者历史+实时事件不重不漏）
+        3. 触发所有注册的监听器（queued 模式下只入队，由监听器各自的消费任务处理）
         """
-        await self.stream_queue.put(event)
         if self.enable_reconnect and self.event_store:
+            # 写入前完成编码，历史重放直接复用同一份 SSE 帧
+            self.format_sse(event)
             self.event_store.append(event)
+        self.broadcaster.publish(event)
+        if event.type == "done":
+            self.completed_at = time.monotonic()
 
         # 触发所有监听器
+        if self.listener_dispatchers:
+            for dispatcher in self.listener_dispatchers:
+                await dispatcher.dispatch(event)
+                if event.type == "done":
+                    dispatcher.close()
+            return
+
         for listener in self.listeners:
             try:
                 await listener.on_event(self.source_id, event)
@@ -108,43 +153,54 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
                 # 监听器失败不应影响主流程
                 logger.error(f"Listener {listener.name} failed for {self.source_id}: {type(e).__name__}: {e}")
 
+    def listener_stats(self) -> List[Dict[str, Any]]:
+        """queued 模式下各监听器的队列积压、延迟与丢弃统计"""
+        return [dispatcher.stats() for dispatcher in self.listener_dispatchers]
+
     @staticmethod
-    def format_sse(event: StreamEvent) -> str:
-        return "\n".join([
-            f"id: {event.id}",
-            f"event: {event.type}",
-            f"data: {event.data.model_dump_json(exclude_none=True)}",
-            "",
-            ""
-        ])
-
-    async def stream_events(self):
-        is_complete: bool = False
+    def format_sse(event: StreamEvent) -> bytes:
+        """编码 SSE 帧，每个事件只编码一次，结果缓存在事件上"""
+        if event._sse_frame is None:
+            event._sse_frame = "\n".join([
+                f"id: {event.id}",
+                f"event: {event.type}",
+                f"data: {event.data.model_dump_json(exclude_none=True)}",
+                "",
+                ""
+            ]).encode("utf-8")
+        return event._sse_frame
+
+    async def stream_events(self, subscriber: StreamSubscriber):
         try:
             while True:
-                if is_complete and self.stream_queue.empty():
-                    break
-
                 try:
-                    event = await self.stream_queue.get()
+                    frame = await subscriber.get()
                 except asyncio.CancelledError:
                     break
 
-                yield event
-                self.stream_queue.task_done()
+                if frame is None:
+                    if subscriber.overflowed:
+                        logger.warning(f"Slow SSE consumer disconnected: {self.source_id}")
+                    break
+
+                yield frame
 
+                event, _ = frame
                 if isinstance(event.data, DoneEvent):
-                    is_complete = True
+                    break
 
         finally:
             if self.stored_exception:
                 raise self.stored_exception
 
     async def worker(self, last_event_id: Optional[str] = None):
+        subscriber: Optional[StreamSubscriber] = None
         try:
             # 第一优先级：检查任务是否已完成
             if self.event_store and self.event_store.is_completed():
                 logger.info(f"Task {self.source_id} already completed, returning historical events with done")
+                # 已完成的执行可能已溢出到持久化后端
+                await self.event_store.ensure_loaded()
 
                 # 根据是否有 last_event_id 决定返回哪些历史事件
                 if last_event_id:
@@ -164,27 +220,33 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
                 # 任务已完成，直接退出，不启动 ping
                 return
 
-            # 第二优先级：重连模式（任务未完成，但客户端断线重连）
-            if last_event_id and self.event_store:
-                logger.info(f"Reconnect to running task with last_event_id: {last_event_id}")
+            # 先订阅再读取历史：两步之间没有 await，不会遗漏或重复事件
+            subscriber = self.broadcaster.subscribe()
 
-                historical_events = self.event_store.get_after(last_event_id)
+            if self.event_store:
+                if last_event_id:
+                    # 第二优先级：重连模式（任务未完成，但客户端断线重连）
+                    logger.info(f"Reconnect to running task with last_event_id: {last_event_id}")
+                    historical_events = self.event_store.get_after(last_event_id)
 
-                # 如果没有新事件，返回完整历史让客户端重建UI状态
-                if not historical_events:
-                    logger.info(f"No new events after {last_event_id}, returning full history for UI reconstruction")
+                    # 如果没有新事件，返回完整历史让客户端重建UI状态
+                    if not historical_events:
+                        logger.info(f"No new events after {last_event_id}, returning full history for UI reconstruction")
+                        historical_events = self.event_store.get_all()
+                else:
+                    # 新订阅者：补齐订阅前已发出的事件
                     historical_events = self.event_store.get_all()
 
                 # 先推送历史事件
                 for event in historical_events:
                     yield self.format_sse(event)
 
-                logger.info(f"Historical events sent, switching to real-time queue")
+                logger.info(f"Historical events sent, switching to real-time subscription")
 
             # 任务未完成，启动实时流式推送
             await self.start_ping()
-            async for event in self.stream_events():
-                yield self.format_sse(event)
+            async for _, frame in self.stream_events(subscriber):
+                yield frame
 
         except asyncio.CancelledError as e:
             # 客户端断开连接（如刷新页面）是正常的，不应该取消后台任务
@@ -193,7 +255,11 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
         except Exception as e:
             logger.exception(f"{type(e).__name__}: {e}")
         finally:
-            await self.stop_ping()
+            if subscriber:
+                self.broadcaster.unsubscribe(subscriber)
+            # 仍有其他订阅者时保持 ping
+            if not self.broadcaster.subscriber_count:
+                await self.stop_ping()
             # 注意：不再取消 stream_task，让后台任务继续执行
             # 这样刷新页面后可以重新连接到仍在执行的任务
 
@@ -296,7 +362,8 @@ class BaseStreamHandler(metaclass=abc.ABCMeta):
         try:
             # 提前创建 EventStore，确保 emit_event() 时可用
             if self.enable_reconnect:
-                self.event_store = await EventStore.get_or_create(
+                # source_id 均为新生成的 execution_id（恢复执行前会先删除旧的事件），不需要查询后端
+                self.event_store = await EventStore.create(
                     self.source_id,
                     ttl_seconds=self.event_ttl
                 )
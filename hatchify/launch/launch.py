@@ -31,8 +31,20 @@ from hatchify.common.domain.enums.storage_type import StorageType
 from hatchify.common.domain.result.result import Result
 from hatchify.common.extensions.ext_storage import init_storage
 from hatchify.common.settings.settings import get_hatchify_settings
+from hatchify.core.factory.event_store_backend_factory import create_event_store_backend
+from hatchify.core.factory.llm_factory import LLMClientPoolManager
+from hatchify.core.factory.session_manager_factory import AsyncFileSessionManager, BinarySafeFileSessionManager
+from hatchify.core.graph.tools.http_client import ToolHttpClientManager
+from hatchify.core.graph.tools.task_poller import TaskPoller
+from hatchify.core.manager.blob_store import BlobStore
+from hatchify.core.manager.checkpoint_manager import CheckpointManager
+from hatchify.core.manager.event_manager import EventStore
+from hatchify.core.manager.execution_recovery_manager import ExecutionRecoveryManager
+from hatchify.core.manager.stream_manager import StreamManager
 from hatchify.core.manager.tool_manager import async_load_mcp_server, async_load_strands_tools, \
     async_load_pre_defined_tools
+from hatchify.core.mcp.mcp_client_pool import MCPClientPoolManager
+from hatchify.core.stream_handler.event_listener.execution_tracker_listener import ExecutionTrackerListener
 
 hatchify_settings = get_hatchify_settings()
 
@@ -41,16 +53,33 @@ async def initialize_extensions():
     litellm.modify_params = True
 
     await init_db()
+    await EventStore.start(create_event_store_backend())
+    await StreamManager.start_reaper()
+    await BlobStore.start()
     await asyncio.gather(
         async_load_mcp_server(),
         async_load_strands_tools(),
         async_load_pre_defined_tools(),
         init_storage(),
     )
+    # 依赖已加载的工具与存储
+    if hatchify_settings.execution_recovery.sweep_on_startup:
+        await ExecutionRecoveryManager.sweep_orphaned()
+    await CheckpointManager.start()
 
 
 async def close_extensions():
-    ...
+    await StreamManager.stop_reaper()
+    await MCPClientPoolManager.async_close_all()
+    await ExecutionTrackerListener.shutdown()
+    await EventStore.shutdown()
+    await AsyncFileSessionManager.flush_all()
+    await BinarySafeFileSessionManager.flush_all()
+    await BlobStore.shutdown()
+    await CheckpointManager.shutdown()
+    await LLMClientPoolManager.async_close_all()
+    await TaskPoller.shutdown()
+    await ToolHttpClientManager.async_close_all()
 
 
 @asynccontextmanager
@@ -1,16 +1,54 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Type, Union
 
 from pydantic import BaseModel
 from pydantic import Field
 from pydantic import create_model
 
+_MODEL_CACHE_MAX_SIZE = 1024
+
+_model_cache: "OrderedDict[str, Type[BaseModel]]" = OrderedDict()
+_model_cache_lock = threading.RLock()
+_model_cache_hits = 0
+_model_cache_misses = 0
+
+
+def _canonical_hash(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_model_cache_info() -> Dict[str, int]:
+    """返回 JSON Schema -> Pydantic 模型缓存的命中统计"""
+    with _model_cache_lock:
+        return {
+            "hits": _model_cache_hits,
+            "misses": _model_cache_misses,
+            "size": len(_model_cache),
+            "max_size": _MODEL_CACHE_MAX_SIZE,
+        }
+
+
+def clear_model_cache() -> None:
+    """清空模型缓存与统计"""
+    global _model_cache_hits, _model_cache_misses
+    with _model_cache_lock:
+        _model_cache.clear()
+        _model_cache_hits = 0
+        _model_cache_misses = 0
+
 
 def jsonschema_to_pydantic(
         schema: dict, definitions: dict = None
 ) -> Type[BaseModel]:
-    title = schema.get("title", "DynamicModel")
-    description = schema.get("description", None)
+    """将 JSON Schema 转换为 Pydantic 模型（进程级缓存）
 
+    以 schema 与 $defs 的规范化哈希作为缓存键，相同 schema 复用同一个模型类；
+    $ref / 嵌套 object 生成的子模型同样走缓存，因此被多个父模型共享。
+    """
     if definitions is None:
         if "$defs" in schema:
             definitions = schema["$defs"]
@@ -19,11 +57,42 @@ def jsonschema_to_pydantic(
         else:
             definitions = {}
 
+    return _cached_jsonschema_to_pydantic(schema, definitions, _canonical_hash(definitions))
+
+
+def _cached_jsonschema_to_pydantic(
+        schema: dict, definitions: dict, definitions_hash: str
+) -> Type[BaseModel]:
+    global _model_cache_hits, _model_cache_misses
+
+    key = f"{_canonical_hash(schema)}:{definitions_hash}"
+    with _model_cache_lock:
+        model = _model_cache.get(key)
+        if model is not None:
+            _model_cache.move_to_end(key)
+            _model_cache_hits += 1
+            return model
+        _model_cache_misses += 1
+
+        model = _build_model(schema, definitions, definitions_hash)
+
+        _model_cache[key] = model
+        while len(_model_cache) > _MODEL_CACHE_MAX_SIZE:
+            _model_cache.popitem(last=False)
+        return model
+
+
+def _build_model(
+        schema: dict, definitions: dict, definitions_hash: str
+) -> Type[BaseModel]:
+    title = schema.get("title", "DynamicModel")
+    description = schema.get("description", None)
+
     def convert_type(_prop: dict) -> Any:
         if "$ref" in _prop:
             ref_path = _prop["$ref"].split("/")
             ref = definitions[ref_path[-1]]
-            return jsonschema_to_pydantic(ref, definitions)
+            return _cached_jsonschema_to_pydantic(ref, definitions, definitions_hash)
 
         if "type" in _prop:
             type_mapping = {
@@ -42,7 +111,7 @@ def jsonschema_to_pydantic(
                 return List[convert_type(_prop.get("items", {}))]
             elif type_ == "object":
                 if "properties" in _prop:
-                    return jsonschema_to_pydantic(_prop, definitions)
+                    return _cached_jsonschema_to_pydantic(_prop, definitions, definitions_hash)
                 else:
                     return Dict[str, Any]
             else:
@@ -51,7 +120,7 @@ def jsonschema_to_pydantic(
         elif "allOf" in _prop:
             combined_fields = {}
             for sub_schema in _prop["allOf"]:
-                _model = jsonschema_to_pydantic(sub_schema, definitions)
+                _model = _cached_jsonschema_to_pydantic(sub_schema, definitions, definitions_hash)
                 combined_fields.update(_model.__annotations__)
             return create_model("CombinedModel", **combined_fields)
 